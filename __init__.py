@@ -1,3 +1,10 @@
-from .agent import root_agent
-
 __all__ = ["root_agent"]
+
+
+def __getattr__(name):
+    # Lazy: importing the package must not pull in the ADK stack or build any agents
+    if name == "root_agent":
+        from .agent import get_root_agent
+
+        return get_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,45 +1,26 @@
 """
 Conversational multi-agent orchestrator that uses specialized sub-agents as tools.
+
+The root agent is a workflow_agent.HiringWorkflowAgent: it runs the obvious workflow steps in
+code and hands free-form or ambiguous messages to the LLM orchestrator built here.
 """
 
-from google.adk.agents import LlmAgent
-from google.adk.tools import AgentTool, FunctionTool
-
-# Import the simplified sub-agents (no template variables)
-from .tools_agents import (
-    rubric_builder,
-    resume_reviewer,
-    github_validator, 
-    github_reviewer,
-    verdict_synthesizer,
-)
-import os
-from dotenv import load_dotenv
-load_dotenv()
-MODEL_NAME = os.getenv("MODEL_NAME")
-
-# Create AgentTools that wrap the sub-agents
-rubric_tool = AgentTool(agent=rubric_builder)
-resume_eval_tool = AgentTool(agent=resume_reviewer)
-github_validate_tool = FunctionTool(func=github_validator)
-github_eval_tool = AgentTool(agent=github_reviewer)
-verdict_tool = AgentTool(agent=verdict_synthesizer)
-
-root_agent = LlmAgent(
-    name="ConversationalHiringOrchestrator",
-    model=MODEL_NAME,
-    description=(
-        "An interactive hiring assistant that orchestrates specialized sub-agents "
-        "to evaluate candidates step-by-step through conversation."
-    ),
-    tools=[
-        rubric_tool,
-        resume_eval_tool,
-        github_validate_tool,
-        github_eval_tool,
-        verdict_tool,
-    ],
-    instruction="""
+import threading
+
+from . import cassette, compaction, config, prefetch, profiling, prompts, workflow
+from .recording import record_validation
+from .reevaluate import rescore_candidates
+from .tools_agents import get_agent, github_validator, model_callbacks
+
+ORCHESTRATOR_INSTRUCTION = """
+## WORKFLOW ENGINE:
+
+A workflow engine runs the routine steps (rubric, resume evaluation, GitHub validation and analysis,
+summary, verdict) on its own; its messages are in the conversation history. You are called for
+questions, help/status requests, changes of plan and input it could not classify.
+Current workflow phase: {workflow_phase?}
+Use the phase and the history to pick up from where the workflow is - do not repeat completed steps.
+
 You are an expert technical hiring orchestrator and assistant with access to a team of specialized 
 evaluation agents. You're professional, thorough, and user-friendly.
 
@@ -61,6 +42,7 @@ Think of yourself as a hiring coordinator who manages a team of specialists.
 3. **github_validator** - Function that validates if GitHub account exists (requires username parameter)
 4. **GitHubReviewer** - Analyzes GitHub profile
 5. **VerdictSynthesizer** - Provides final HIRE/NO HIRE decision
+6. **rescore_candidates** - Function that re-scores earlier candidates after the rubric changed (only the affected criteria)
 
 These are specialized tools you can call. When you call them, explain what you're doing to the user first.
 Most tools have access to the conversation history and can reference previous messages. The github_validator function requires you to pass the username as a parameter.
@@ -142,6 +124,14 @@ Most tools have access to the conversation history and can reference previous me
   * **Present the complete verdict**
   * Say: "This concludes the evaluation. Would you like to evaluate another candidate, or do you have questions about this assessment?"
 
+### UPDATED JOB DESCRIPTION (after candidates were evaluated)
+- If the user changes or tweaks the JD after one or more candidates have been evaluated:
+  * Say: "Got it - regenerating the rubric for the updated JD..."
+  * **Call RubricBuilder tool** with the updated JD
+  * Then **call rescore_candidates** - it re-scores ONLY the criteria affected by the change for every earlier candidate, keeps all other scores, and returns updated totals and rankings
+  * **Do NOT re-run ResumeReviewer** for earlier candidates
+  * Present the changed criteria, old → new totals and the updated ranking
+
 ## CRITICAL RULES FOR SUCCESS:
 
 1. **AUTOMATIC CONTINUATION**
@@ -200,6 +190,7 @@ When calling tools:
 - For **GitHubValidator**: MUST pass the GitHub URL/username as the `username` parameter when calling. Example: github_validator(username="github.com/johndoe") or github_validator(username="johndoe")
 - For **GitHubReviewer**: Only call after validation passes
 - For **VerdictSynthesizer**: Ensure at least resume evaluation is complete
+- For **rescore_candidates**: Only call after RubricBuilder produced a new rubric for an updated JD
 
 Tools have access to the full conversation history, so they can reference previous messages.
 
@@ -323,5 +314,79 @@ If user asks "status" or "where are we?":
 - Always explain WHICH tool you're calling and WHY
 - Present tool outputs verbatim (don't paraphrase or summarize)
 - Keep the conversation flowing naturally while maintaining structure
-""",
-)
\ No newline at end of file
+"""
+
+
+def build_orchestrator():
+    from google.adk.agents import LlmAgent
+    from google.adk.tools import AgentTool, FunctionTool
+
+    # Create AgentTools that wrap the sub-agents
+    rubric_tool = AgentTool(agent=get_agent("rubric_builder"))
+    resume_eval_tool = AgentTool(agent=get_agent("resume_reviewer"))
+    github_validate_tool = FunctionTool(func=github_validator)
+    github_eval_tool = AgentTool(agent=get_agent("github_reviewer"))
+    verdict_tool = AgentTool(agent=get_agent("verdict_synthesizer"))
+    rescore_tool = FunctionTool(func=rescore_candidates)
+
+    return LlmAgent(
+        name="ConversationalHiringOrchestrator",
+        model=config.model_name(),
+        # Earlier candidates are collapsed to structured records before each model call
+        **model_callbacks(before=[compaction.compact_history]),
+        description=(
+            "An interactive hiring assistant that orchestrates specialized sub-agents "
+            "to evaluate candidates step-by-step through conversation."
+        ),
+        tools=[
+            rubric_tool,
+            resume_eval_tool,
+            github_validate_tool,
+            github_eval_tool,
+            verdict_tool,
+            rescore_tool,
+        ],
+        before_tool_callback=profiling.before_tool_callback,
+        after_tool_callback=[record_validation, workflow.track_tool_step, profiling.after_tool_callback],
+        # Only the sections for the session's current phase, pre-rendered by prompts.prerender()
+        instruction=prompts.orchestrator_instruction,
+        # Keep the next message routed to the workflow engine rather than back to this agent
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+    )
+
+
+def build_root_agent():
+    from .workflow_agent import HiringWorkflowAgent
+
+    prompts.prerender()
+    return HiringWorkflowAgent(
+        name="HiringWorkflow",
+        description="Runs the hiring evaluation workflow, delegating open-ended conversation to the orchestrator.",
+        sub_agents=[build_orchestrator()],
+        # Start GitHub lookups as soon as a message names an account; record turns for replay;
+        # profile the turn when the session (or PROFILING) asks for it
+        before_agent_callback=[
+            profiling.before_agent_callback, prefetch.before_agent_callback, cassette.before_agent_callback,
+        ],
+        after_agent_callback=profiling.after_agent_callback,
+    )
+
+
+_root_agent = None
+_root_agent_lock = threading.Lock()
+
+
+def get_root_agent():
+    global _root_agent
+    with _root_agent_lock:
+        if _root_agent is None:
+            _root_agent = build_root_agent()
+        return _root_agent
+
+
+def __getattr__(name):
+    # `root_agent` is what `adk web` looks up; build it only when it is first requested
+    if name == "root_agent":
+        return get_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
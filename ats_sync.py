@@ -0,0 +1,370 @@
+"""
+Incremental applicant sync from an applicant-tracking system (ATS) into the screening service.
+
+A source is polled for applications changed since a cursor stored in the result store, in batches
+of ATS_BATCH_SIZE, so a poll with nothing new costs one request however large the applicant pool
+is. Sources:
+- file:path/to/applications.jsonl - an append-only JSONL change feed (an updated application is
+  appended again); the cursor is the byte offset, so a poll reads only what was appended since.
+- http(s)://host/applications - GET ?cursor=...&limit=N answering {"applications": [...],
+  "next_cursor": "...", "has_more": true|false} (ATS_API_TOKEN is sent as a bearer token). `serve`
+  runs a stand-in that serves a feed file this way.
+
+Each application is a JSON object with "application_id", "resume" (text), and optionally
+"candidate_id", "requisition_id" (else --requisition / ATS_REQUISITION_ID) and "github_username".
+Lines or entries that are not such an object are counted as invalid and skipped. New applications
+and ones whose resume changed are staged as pending; an application from a candidate id, or with a
+content hash, already seen for the same requisition (the same candidate applying twice) is kept as a
+duplicate and not screened again. Pending applications are queued as screening jobs (resume review,
+github_validator, GitHub review and verdict; see service.py) under their ATS candidate id as the
+queue has room.
+
+The cursor only moves after a batch is staged, and applications that were queued but never
+finished are staged again on start-up, so a restart neither skips nor re-screens applications.
+Applications of a requisition over its hard budget (see metering.py) wait as pending; a job that
+pauses on the budget stays queued - a single run returns without waiting for it, while --watch
+resumes it once the budget is raised.
+
+    python -m hiring_agent_adk.ats_sync run --source file:applications.jsonl --requisition req-1234abcd
+    python -m hiring_agent_adk.ats_sync run --source http://127.0.0.1:8766/applications --watch
+    python -m hiring_agent_adk.ats_sync status
+    python -m hiring_agent_adk.ats_sync serve applications.jsonl --port 8766
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from . import backpressure, config, metering
+from .store import get_store
+
+PENDING, QUEUED, DONE, FAILED, DUPLICATE = "pending", "queued", "done", "failed", "duplicate"
+
+
+def content_hash(resume: str, github_username: str = None) -> str:
+    normalised = " ".join(resume.split())
+    return hashlib.sha256(f"{normalised}\0{(github_username or '').lower()}".encode("utf-8")).hexdigest()
+
+
+def normalise(raw: dict, default_requisition: str = None):
+    """The fields the sync uses from an ATS application, or None when it has no id or resume."""
+    if not isinstance(raw, dict):
+        return None
+    application_id = str(raw.get("application_id") or raw.get("id") or "")
+    resume = raw.get("resume") or raw.get("resume_text") or ""
+    requisition_id = raw.get("requisition_id") or default_requisition
+    if not application_id or not resume.strip() or not requisition_id:
+        return None
+    return {
+        "application_id": application_id,
+        "candidate_id": str(raw.get("candidate_id") or application_id),
+        "requisition_id": requisition_id,
+        "resume": resume,
+        "github_username": raw.get("github_username"),
+        "content_hash": content_hash(resume, raw.get("github_username")),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+
+class FileSource:
+    """Append-only JSONL change feed; the cursor is a byte offset."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = "file:" + os.path.abspath(path)
+
+    def fetch(self, cursor: str, limit: int) -> tuple:
+        """(raw applications, next cursor, more available)"""
+        offset = int(cursor or 0)
+        if not os.path.exists(self.path):
+            return [], str(offset), False
+        if os.path.getsize(self.path) < offset:
+            offset = 0  # the feed was rotated; already-seen applications are recognised by their hash
+        applications = []
+        with open(self.path, "rb") as handle:
+            handle.seek(offset)
+            while len(applications) < limit:
+                line = handle.readline()
+                if not line.endswith(b"\n"):
+                    break  # end of feed, or a line still being written
+                offset += len(line)
+                if line.strip():
+                    try:
+                        applications.append(json.loads(line))
+                    except ValueError:
+                        applications.append(None)  # counted as invalid, so the feed doesn't stall on it
+        return applications, str(offset), len(applications) == limit
+
+
+class HttpSource:
+    """Cursor-paginated HTTP endpoint (see the module docstring), behind the "ats" back-pressure backend."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.name = url
+        self._session = None
+
+    def fetch(self, cursor: str, limit: int) -> tuple:
+        import requests
+
+        if self._session is None:
+            self._session = requests.Session()
+        headers = {"Accept": "application/json"}
+        if config.getenv("ATS_API_TOKEN"):
+            headers["Authorization"] = f"Bearer {config.getenv('ATS_API_TOKEN')}"
+        response = backpressure.get_backend("ats").call(
+            lambda: self._session.get(self.url, params={"cursor": cursor or "", "limit": limit}, headers=headers, timeout=30),
+            failed=lambda r: r.status_code == 429 or r.status_code >= 500,
+            retry_exceptions=(requests.exceptions.Timeout, requests.exceptions.ConnectionError),
+        )
+        response.raise_for_status()
+        body = response.json()
+        applications = body.get("applications") or []
+        return applications, body.get("next_cursor", cursor), bool(body.get("has_more")) and bool(applications)
+
+
+def source_from_uri(uri: str):
+    if uri.startswith(("http://", "https://")):
+        return HttpSource(uri)
+    return FileSource(uri[len("file:"):] if uri.startswith("file:") else uri)
+
+
+# ---------------------------------------------------------------------------
+# Sync
+# ---------------------------------------------------------------------------
+
+
+class Syncer:
+    """Stages changed applications from one source and feeds them to a ScreeningService."""
+
+    def __init__(self, source, requisition_id: str = None, batch_size: int = None, team: str = None):
+        self.source = source
+        self.requisition_id = requisition_id or config.getenv("ATS_REQUISITION_ID")
+        self.batch_size = batch_size or int(config.getenv("ATS_BATCH_SIZE", 100))
+        self.team = team or config.getenv("ATS_TEAM")
+        self.stats = {"polls": 0, "requests": 0, "fetched": 0, "new": 0, "updated": 0, "unchanged": 0,
+                      "duplicates": 0, "invalid": 0, "queued": 0, "done": 0, "failed": 0, "paused": 0, "errors": 0}
+        self._watches = set()
+
+    def recover(self) -> int:
+        """Stages again the applications queued before a restart (their in-memory jobs are gone)."""
+        return get_store().reset_ats_status(self.source.name, QUEUED, PENDING)
+
+    def poll(self) -> dict:
+        """Fetches every change since the stored cursor, batch by batch; returns this poll's counts."""
+        store = get_store()
+        counts = {key: 0 for key in ("requests", "fetched", "new", "updated", "unchanged", "duplicates", "invalid")}
+        cursor = store.ats_cursor(self.source.name)
+        while True:
+            applications, cursor_after, more = self.source.fetch(cursor, self.batch_size)
+            counts["requests"] += 1
+            counts["fetched"] += len(applications)
+            for raw in applications:
+                counts[self._stage(raw)] += 1
+            # Only after the batch is staged, so a crash re-reads it rather than losing it
+            if cursor_after != cursor:
+                store.set_ats_cursor(self.source.name, cursor_after)
+            cursor = cursor_after
+            if not more:
+                break
+        self.stats["polls"] += 1
+        for key, value in counts.items():
+            self.stats[key] += value
+        return counts
+
+    def _stage(self, raw: dict) -> str:
+        application = normalise(raw, self.requisition_id)
+        if application is None:
+            return "invalid"
+        store = get_store()
+        known = store.ats_application(self.source.name, application["application_id"])
+        if known and known["content_hash"] == application["content_hash"]:
+            return "unchanged"
+        if store.ats_seen(self.source.name, application):
+            store.put_ats_application(self.source.name, application, DUPLICATE)
+            return "duplicates"
+        store.put_ats_application(self.source.name, application, PENDING)
+        return "updated" if known else "new"
+
+    def dispatch(self, service, wait_paused: bool = False) -> int:
+        """
+        Queues pending applications, oldest first, until the screening queue is full; returns how many.
+        With `wait_paused`, a job that pauses on its budget is still watched until it finishes.
+        """
+        from .service import QueueFull
+
+        store = get_store()
+        queued = 0
+        levels = {}
+        for application in store.ats_applications(self.source.name, PENDING):
+            requisition_id = application["requisition_id"]
+            if store.rubric(requisition_id) is None:
+                continue  # screened once the requisition has a rubric
+            if requisition_id not in levels:
+                levels[requisition_id] = metering.level(requisition_id)
+            if levels[requisition_id] == metering.HARD:
+                continue  # screened once the budget is raised
+            params = {
+                "text": application["resume"],
+                "github_username": application["github_username"],
+                "candidate_id": application["candidate_id"],
+            }
+            try:
+                job = service.submit("candidate", application["requisition_id"], params, self.team)
+            except (QueueFull, backpressure.BackendUnavailable):
+                break
+            store.set_ats_status(self.source.name, application["application_id"], QUEUED,
+                                 application["content_hash"], job_id=job.id)
+            task = asyncio.create_task(self._watch(job, application, wait_paused))
+            self._watches.add(task)
+            task.add_done_callback(self._watches.discard)
+            queued += 1
+        self.stats["queued"] += queued
+        return queued
+
+    async def _watch(self, job, application, wait_paused: bool):
+        async for event in job.stream(heartbeat=60):
+            if event and event[0] == "paused" and not wait_paused:
+                # Left queued: staged again on the next start, and dispatched once the budget allows
+                self.stats["paused"] += 1
+                return
+        status = DONE if job.status == "done" else FAILED
+        self.stats[status] += 1
+        # A newer version of the application staged meanwhile stays pending
+        get_store().set_ats_status(self.source.name, application["application_id"], status,
+                                   application["content_hash"], job_id=job.id, error=job.error)
+
+    async def run(self, service, once: bool = False, interval: float = None):
+        """Polls and dispatches every `interval` seconds (ATS_POLL_SECONDS); with `once`, until caught up."""
+        interval = interval if interval is not None else float(config.getenv("ATS_POLL_SECONDS", 60))
+        self.recover()
+        while True:
+            try:
+                await asyncio.to_thread(self.poll)
+            except Exception as error:
+                if once:
+                    raise
+                # The source is down or returned garbage; the cursor hasn't moved, so the next poll retries
+                self.stats["errors"] += 1
+                self.stats["last_error"] = f"{type(error).__name__}: {error}"
+            if not once:
+                # Budgets are raised from outside this process (metering set-budget); pick up the change
+                for requisition_id in list(service.paused):
+                    service.resume(requisition_id)
+            self.dispatch(service, wait_paused=not once)
+            if once:
+                while self._watches:
+                    await asyncio.wait(self._watches, return_when=asyncio.FIRST_COMPLETED)
+                    self.dispatch(service)
+                return self.stats
+            await asyncio.sleep(interval)
+
+
+# ---------------------------------------------------------------------------
+# Stand-in ATS endpoint
+# ---------------------------------------------------------------------------
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        cursor = query.get("cursor", [""])[0]
+        limit = int(query.get("limit", ["100"])[0])
+        self.server.requests += 1
+        applications, next_cursor, more = self.server.feed.fetch(cursor, limit)
+        payload = json.dumps({"applications": applications, "next_cursor": next_cursor, "has_more": more}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class FakeATSServer(ThreadingHTTPServer):
+    """Serves a JSONL feed file through the HTTP cursor protocol. Use as a context manager or start()/stop()."""
+
+    daemon_threads = True
+
+    def __init__(self, feed_path: str, host="127.0.0.1", port=0):
+        super().__init__((host, port), _FeedHandler)
+        self.feed = FileSource(feed_path)
+        self.requests = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/applications"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="fake-ats", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+async def _run(args) -> dict:
+    from .service import ScreeningService
+
+    service = ScreeningService()
+    await service.start()
+    try:
+        syncer = Syncer(source_from_uri(args.source), args.requisition, args.batch_size, args.team)
+        return await syncer.run(service, once=not args.watch, interval=args.interval)
+    finally:
+        await service.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Sync new and updated applications from an ATS into screening.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run = subparsers.add_parser("run", help="poll the source and screen what changed")
+    run.add_argument("--source", default=config.getenv("ATS_SOURCE"), help="file:feed.jsonl or an http(s) URL")
+    run.add_argument("--requisition", help="requisition for applications that don't name one")
+    run.add_argument("--team", help="scheduler team for the screening jobs")
+    run.add_argument("--batch-size", type=int)
+    run.add_argument("--watch", action="store_true", help="keep polling every --interval seconds")
+    run.add_argument("--interval", type=float)
+    subparsers.add_parser("status", help="cursors and application counts by status")
+    serve = subparsers.add_parser("serve", help="serve a JSONL feed as a stand-in HTTP ATS")
+    serve.add_argument("feed")
+    serve.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if not args.source:
+            parser.error("--source (or ATS_SOURCE) is required")
+        print(json.dumps(asyncio.run(_run(args)), indent=2))
+    elif args.command == "status":
+        print(json.dumps(get_store().ats_status(), indent=2))
+    else:
+        server = FakeATSServer(args.feed, port=args.port)
+        print(f"Stand-in ATS serving {args.feed} on {server.url} (Ctrl-C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
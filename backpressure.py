@@ -0,0 +1,404 @@
+"""
+Back-pressure for the backends the hiring agents depend on (Gemini and the GitHub REST API).
+
+Each backend gets an AIMD concurrency limiter and a circuit breaker:
+- The limiter grows the allowed number of in-flight calls slowly while calls succeed and halves it
+  when a call fails or its latency spikes well above the running baseline.
+- The breaker opens after consecutive failures so callers fail fast instead of piling onto a
+  backend that is down, then lets a single probe through once the cool-down has elapsed.
+
+`backend_states()` returns a JSON-friendly snapshot of every backend for dashboards.
+"""
+
+import random
+import threading
+import time
+
+from . import config
+
+
+class BackendUnavailable(RuntimeError):
+    """Raised when a backend's circuit is open or no concurrency slot frees up in time."""
+
+    def __init__(self, backend: str, reason: str, retry_after: float = 0.0):
+        super().__init__(f"{backend} unavailable: {reason}")
+        self.backend = backend
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AIMDLimiter:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    The limit grows by roughly one slot per "window" of successful calls and is multiplied by
+    `decrease_factor` on an error or a latency spike (latency > `latency_spike` x EWMA baseline).
+    """
+
+    def __init__(self, initial_limit=8, min_limit=1, max_limit=64,
+                 decrease_factor=0.5, latency_spike=2.0, smoothing=0.1):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_spike = latency_spike
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.baseline_latency = None
+        self.successes = 0
+        self.failures = 0
+        self.rejections = 0
+        self._cond = threading.Condition()
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self, timeout=None) -> bool:
+        """Blocks until a slot is free or `timeout` seconds elapse."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.rejections += 1
+                    return False
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    async def acquire_async(self, timeout=None, poll_interval=0.01) -> bool:
+        """Event-loop friendly variant of `acquire` (polls instead of blocking the loop)."""
+        import asyncio
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_acquire():
+            if deadline is not None and time.monotonic() >= deadline:
+                with self._cond:
+                    self.rejections += 1
+                return False
+            await asyncio.sleep(poll_interval)
+        return True
+
+    def release(self, latency: float, ok):
+        """Returns a slot and adapts the limit from the call's outcome (`ok=None` skips adapting)."""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            if ok is None:
+                self._cond.notify_all()
+                return
+            spiked = (
+                ok and self.baseline_latency is not None
+                and latency > self.latency_spike * self.baseline_latency
+            )
+            if ok:
+                self.successes += 1
+                if self.baseline_latency is None:
+                    self.baseline_latency = latency
+                else:
+                    self.baseline_latency += self.smoothing * (latency - self.baseline_latency)
+            else:
+                self.failures += 1
+
+            if not ok or spiked:
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "baseline_latency_ms": (
+                    round(self.baseline_latency * 1000, 1) if self.baseline_latency is not None else None
+                ),
+                "successes": self.successes,
+                "failures": self.failures,
+                "rejections": self.rejections,
+            }
+
+
+class CircuitBreaker:
+    """Closed → open after `failure_threshold` consecutive failures → half-open after `reset_timeout`."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            # Half-open: let exactly one probe through
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def cancel_probe(self):
+        """Forgets an admitted call that ended without telling us anything about backend health."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+            }
+
+
+class Backend:
+    """A limiter + breaker pair with jittered retries for one downstream service."""
+
+    def __init__(self, name, limiter, breaker, max_attempts=3, backoff_base=0.5,
+                 backoff_cap=8.0, acquire_timeout=15.0):
+        self.name = name
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.acquire_timeout = acquire_timeout
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (0-based) retry attempt."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def admit(self):
+        """Checks the breaker and takes a limiter slot, raising BackendUnavailable otherwise."""
+        if not self.breaker.allow():
+            raise BackendUnavailable(self.name, "circuit open", self.breaker.retry_after())
+        try:
+            acquired = self.limiter.acquire(timeout=self.acquire_timeout)
+        except BaseException:
+            self.breaker.cancel_probe()
+            raise
+        if not acquired:
+            # A half-open probe that never ran must not keep the breaker refusing every call
+            self.breaker.cancel_probe()
+            raise BackendUnavailable(self.name, "concurrency limit reached")
+
+    async def admit_async(self):
+        if not self.breaker.allow():
+            raise BackendUnavailable(self.name, "circuit open", self.breaker.retry_after())
+        try:
+            acquired = await self.limiter.acquire_async(timeout=self.acquire_timeout)
+        except BaseException:  # cancelled while waiting for a slot
+            self.breaker.cancel_probe()
+            raise
+        if not acquired:
+            self.breaker.cancel_probe()
+            raise BackendUnavailable(self.name, "concurrency limit reached")
+
+    def abandon(self, latency: float):
+        """Returns the slot of an admitted call that ended without an outcome (e.g. cancelled)."""
+        self.limiter.release(latency, ok=None)
+        self.breaker.cancel_probe()
+
+    def record(self, latency: float, ok: bool):
+        self.limiter.release(latency, ok)
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def call(self, fn, *, failed=None, retry_exceptions=()):
+        """
+        Runs `fn()` under the limiter and breaker, retrying failures with jittered backoff.
+
+        Args:
+            fn: Zero-argument callable performing the request
+            failed: Optional predicate on the result marking it as a backend failure (e.g. HTTP 503)
+            retry_exceptions: Exception types that count as failures and are retried
+
+        Returns:
+            The result of the last attempt. A result that still fails `failed` after the final
+            attempt is returned as-is so callers can report it; exceptions are re-raised.
+        """
+        for attempt in range(self.max_attempts):
+            self.admit()
+            start = time.monotonic()
+            try:
+                result = fn()
+            except retry_exceptions:
+                self.record(time.monotonic() - start, ok=False)
+                if attempt == self.max_attempts - 1:
+                    raise
+            except BaseException:
+                # Not a backend signal (programming error, cancellation) - don't punish the backend
+                self.abandon(time.monotonic() - start)
+                raise
+            else:
+                ok = not (failed and failed(result))
+                self.record(time.monotonic() - start, ok=ok)
+                if ok or attempt == self.max_attempts - 1:
+                    return result
+            time.sleep(self.backoff(attempt))
+
+    def snapshot(self) -> dict:
+        return {"name": self.name, **self.limiter.snapshot(), "circuit": self.breaker.snapshot()}
+
+
+# Defaults per backend; each can be overridden with <NAME>_MAX_CONCURRENCY etc. in .env
+_DEFAULTS = {
+    "gemini": {"initial": 8, "max": 32, "failure_threshold": 5, "reset_timeout": 30.0},
+    "github": {"initial": 8, "max": 64, "failure_threshold": 5, "reset_timeout": 60.0},
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name: str) -> Backend:
+    """Returns the process-wide Backend for `name`, creating it from env/defaults on first use."""
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            defaults = _DEFAULTS.get(name, _DEFAULTS["github"])
+            prefix = name.upper()
+            initial = int(config.getenv(f"{prefix}_INITIAL_CONCURRENCY", defaults["initial"]))
+            backend = Backend(
+                name,
+                AIMDLimiter(
+                    initial_limit=initial,
+                    max_limit=int(config.getenv(f"{prefix}_MAX_CONCURRENCY", defaults["max"])),
+                ),
+                CircuitBreaker(
+                    failure_threshold=int(config.getenv(f"{prefix}_FAILURE_THRESHOLD", defaults["failure_threshold"])),
+                    reset_timeout=float(config.getenv(f"{prefix}_CIRCUIT_RESET_SECONDS", defaults["reset_timeout"])),
+                ),
+                max_attempts=int(config.getenv(f"{prefix}_MAX_ATTEMPTS", 3)),
+            )
+            _backends[name] = backend
+        return backend
+
+
+def backend_states() -> dict:
+    """Snapshot of every backend's limiter and circuit state, keyed by backend name."""
+    with _backends_lock:
+        backends = list(_backends.values())
+    return {backend.name: backend.snapshot() for backend in backends}
+
+
+# ---------------------------------------------------------------------------
+# ADK model callbacks - guard every LlmAgent's Gemini calls with the "gemini" backend
+# ---------------------------------------------------------------------------
+
+# Model error codes that signal provider trouble (as opposed to e.g. safety blocks)
+_MODEL_FAILURE_CODES = {"429", "500", "502", "503", "504", "RESOURCE_EXHAUSTED", "UNAVAILABLE", "INTERNAL"}
+
+# (invocation_id, agent_name) -> (start time,) of the in-flight model call
+_model_calls = {}
+
+
+def _call_key(callback_context):
+    return (callback_context.invocation_id, callback_context.agent_name)
+
+
+def _unavailable_response(error: BackendUnavailable):
+    from google.adk.models import LlmResponse
+    from google.genai import types
+
+    message = (
+        "⚠️ The language model is temporarily unavailable (too many failures or requests). "
+        f"Please try again in {max(1, round(error.retry_after))} seconds."
+    )
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=message)]),
+        error_code="UNAVAILABLE",
+        error_message=str(error),
+    )
+
+
+async def before_model_callback(callback_context, llm_request):
+    """Fails fast while the Gemini circuit is open and waits for a concurrency slot otherwise."""
+    backend = get_backend("gemini")
+    try:
+        await backend.admit_async()
+    except BackendUnavailable as e:
+        return _unavailable_response(e)
+    key, entry = _call_key(callback_context), (time.monotonic(),)
+    _model_calls[key] = entry
+    on_abandoned(lambda: _abandon_call(key, entry))
+    return None
+
+
+def on_abandoned(release):
+    """
+    Runs `release` when the current task ends. A model call cancelled mid-flight gets neither its
+    after- nor its error callback, so whatever its before-callback took would otherwise leak;
+    `release` must be a no-op once those callbacks have run.
+    """
+    import asyncio
+
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        task.add_done_callback(lambda _task: release())
+
+
+def _abandon_call(key, entry):
+    if _model_calls.get(key) is entry:
+        del _model_calls[key]
+        get_backend("gemini").abandon(time.monotonic() - entry[0])
+
+
+def after_model_callback(callback_context, llm_response):
+    entry = _model_calls.pop(_call_key(callback_context), None)
+    if entry is not None:
+        ok = str(llm_response.error_code or "") not in _MODEL_FAILURE_CODES
+        get_backend("gemini").record(time.monotonic() - entry[0], ok=ok)
+    return None
+
+
+def on_model_error_callback(callback_context, llm_request, error):
+    entry = _model_calls.pop(_call_key(callback_context), None)
+    if entry is not None:
+        get_backend("gemini").record(time.monotonic() - entry[0], ok=False)
+    return None
@@ -0,0 +1,413 @@
+"""
+Offline bulk inference through the provider's asynchronous batch API.
+
+Overnight re-screens don't need interactive latency, so instead of one synchronous LlmAgent call
+per candidate, the ResumeReviewer / GitHubReviewer requests for a whole requisition are written to
+a JSONL batch file (one GenerateContentRequest per line, keyed "<stage>:<candidate_id>") and
+submitted as one batch job. The job is polled until it finishes, then its result file is streamed
+line by line into the result store. Batch jobs are subject to the provider's batch quotas only,
+not the per-minute request limits the interactive agents are throttled by. Requisitions over their
+hard token budget are refused at submission, and each result's token usage is metered on import.
+
+Backends:
+- "gemini": the Gemini Batch API (google-genai `client.batches`), using GOOGLE_API_KEY
+- "local": a file-based stand-in that completes jobs after a configurable delay with synthetic,
+  deterministic evaluations (or a custom responder) - for tests and dry runs
+
+    python -m hiring_agent_adk.batch_inference run req-123 --stage resume --stage github
+    python -m hiring_agent_adk.batch_inference submit req-123 --resumes new/*.txt
+    python -m hiring_agent_adk.batch_inference poll <job-name> --wait
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import time
+import uuid
+
+from . import config, metering, rubrics
+from .store import get_store
+
+STAGES = ("resume", "github")
+TERMINAL_STATES = ("succeeded", "failed", "cancelled", "expired")
+
+
+def _instruction(stage: str) -> str:
+    from . import tools_agents
+
+    if stage == "resume":
+        return tools_agents.RESUME_REVIEWER_INSTRUCTION
+    # Batch requests carry no tools, so GitHubReviewer must not be told to sample repositories itself
+    return tools_agents.GITHUB_REVIEWER_INSTRUCTION.replace(tools_agents.SAMPLE_REPOSITORIES_STEP, "")
+
+
+def jobs_dir() -> str:
+    return config.getenv("BATCH_JOBS_DIR", "batch_jobs")
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class GeminiBatchBackend:
+    """Gemini Batch API: upload the JSONL file, create a batch job, download the result file."""
+
+    name = "gemini"
+
+    def __init__(self, model: str = None):
+        self.model = model or config.model_name()
+        self._client = None
+
+    def client(self):
+        if self._client is None:
+            from google import genai
+
+            self._client = genai.Client()
+        return self._client
+
+    def submit(self, path: str, display_name: str) -> str:
+        from google.genai import types
+
+        uploaded = self.client().files.upload(
+            file=path, config=types.UploadFileConfig(display_name=display_name, mime_type="jsonl")
+        )
+        job = self.client().batches.create(
+            model=self.model, src=uploaded.name, config=types.CreateBatchJobConfig(display_name=display_name)
+        )
+        return job.name
+
+    def status(self, job_name: str) -> str:
+        state = self.client().batches.get(name=job_name).state.name.removeprefix("JOB_STATE_").lower()
+        if state in ("queued", "pending", "unspecified", "paused"):
+            return "pending"
+        if state in ("running", "updating", "cancelling"):
+            return "running"
+        return "succeeded" if state == "partially_succeeded" else state
+
+    def download(self, job_name: str, destination: str) -> str:
+        job = self.client().batches.get(name=job_name)
+        with open(destination, "wb") as f:
+            f.write(self.client().files.download(file=job.dest.file_name))
+        return destination
+
+
+def synthetic_response(key: str, request: dict) -> str:
+    """Deterministic evaluation of a batch request, scored against the rubric in its prompt."""
+    stage, candidate_id = key.split(":", 1)
+    text = request["contents"][0]["parts"][0]["text"]
+    level = rubrics.STAGE_LEVELS[stage]
+    criteria = [c for c in rubrics.parse_rubric(text).values() if c["level"] == level]
+    digest = int(hashlib.sha1(key.encode("utf-8")).hexdigest(), 16)
+    lines, total, max_total = [], 0.0, 0.0
+    for criterion in criteria:
+        score = (digest >> criterion["number"]) % (int(criterion["max_points"]) + 1)
+        total += score
+        max_total += criterion["max_points"]
+        lines.append(f"**{criterion['number']}. {criterion['title']}: {score}/{criterion['max_points']:g} points**\n"
+                     "- Justification: synthetic score from the local batch backend")
+    return f"**CANDIDATE:** {candidate_id}\n\n**SCORE: {total:g}/{max_total:g}**\n\n" + "\n\n".join(lines)
+
+
+class LocalBatchBackend:
+    """
+    File-based stand-in for a batch API. A submitted job completes `latency` seconds later, on the
+    first status check after that; a fraction `error_rate` of requests come back as errors.
+    State lives in files under `root`, so jobs can be polled from another process.
+    """
+
+    name = "local"
+
+    def __init__(self, root: str = None, latency: float = 0.0, error_rate: float = 0.0, responder=None, seed=None):
+        self.root = root or os.path.join(jobs_dir(), "local-backend")
+        self.latency = latency
+        self.error_rate = error_rate
+        self.responder = responder or synthetic_response
+        self.random = random.Random(seed)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, job_name: str, suffix: str) -> str:
+        return os.path.join(self.root, job_name.replace("/", "_") + suffix)
+
+    def submit(self, path: str, display_name: str) -> str:
+        job_name = f"batches/local-{uuid.uuid4().hex[:12]}"
+        with open(path, encoding="utf-8") as src, open(self._path(job_name, ".input.jsonl"), "w", encoding="utf-8") as dst:
+            for line in src:
+                dst.write(line)
+        with open(self._path(job_name, ".meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"display_name": display_name, "submitted_at": time.time(), "latency": self.latency,
+                       "error_rate": self.error_rate}, f)
+        return job_name
+
+    def status(self, job_name: str) -> str:
+        if os.path.exists(self._path(job_name, ".results.jsonl")):
+            return "succeeded"
+        meta_path = self._path(job_name, ".meta.json")
+        if not os.path.exists(meta_path):
+            return "failed"
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if time.time() - meta["submitted_at"] < meta["latency"]:
+            return "running"
+        self._complete(job_name, meta["error_rate"])
+        return "succeeded"
+
+    def _complete(self, job_name: str, error_rate: float):
+        results_path = self._path(job_name, ".results.jsonl")
+        with open(self._path(job_name, ".input.jsonl"), encoding="utf-8") as src, \
+                open(results_path + ".tmp", "w", encoding="utf-8") as dst:
+            for line in src:
+                entry = json.loads(line)
+                if error_rate and self.random.random() < error_rate:
+                    result = {"key": entry["key"], "error": {"code": 500, "message": "Injected failure"}}
+                else:
+                    text = self.responder(entry["key"], entry["request"])
+                    prompt = entry["request"]["contents"][0]["parts"][0]["text"]
+                    result = {"key": entry["key"], "response": {
+                        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}],
+                        # ~4 characters per token, like batch_scoring's estimates
+                        "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4},
+                    }}
+                dst.write(json.dumps(result) + "\n")
+        os.replace(results_path + ".tmp", results_path)
+
+    def download(self, job_name: str, destination: str) -> str:
+        with open(self._path(job_name, ".results.jsonl"), "rb") as src, open(destination, "wb") as dst:
+            dst.write(src.read())
+        return destination
+
+
+def get_backend(name: str = None):
+    name = name or config.getenv("BATCH_BACKEND", "gemini")
+    if name == "gemini":
+        return GeminiBatchBackend()
+    if name == "local":
+        return LocalBatchBackend(latency=float(config.getenv("BATCH_LOCAL_LATENCY_SECONDS", 0)))
+    raise ValueError(f"Unknown batch backend '{name}'. Use 'gemini' or 'local'")
+
+
+# ---------------------------------------------------------------------------
+# Building, submitting and importing jobs
+# ---------------------------------------------------------------------------
+
+def candidate_material(input_text: str) -> str:
+    """A stored reviewer input without its (possibly outdated) rubric section."""
+    sections = re.split(r"(?m)^(?=## )", input_text or "")
+    kept = "".join(section for section in sections if not section.startswith("## EVALUATION RUBRIC")).strip()
+    return kept if kept.startswith("## ") else f"## CANDIDATE RESUME\n\n{kept}"
+
+
+def request_line(key: str, stage: str, rubric: str, material: str) -> dict:
+    message = f"## EVALUATION RUBRIC\n\n{rubric}\n\n{material}"
+    return {
+        "key": key,
+        "request": {
+            "contents": [{"role": "user", "parts": [{"text": message}]}],
+            "system_instruction": {"parts": [{"text": _instruction(stage)}]},
+        },
+    }
+
+
+def submit(requisition_id: str, stages=("resume",), resume_files=(), backend=None) -> dict:
+    """
+    Writes the batch file for a requisition's stored candidates (plus any new resume files) against
+    its latest rubric and submits it.
+
+    Returns:
+        dict with the job name, backend and request count
+
+    Raises:
+        metering.BudgetExceeded: the requisition is over its hard token budget
+    """
+    store = get_store()
+    latest = store.rubric(requisition_id)
+    if latest is None:
+        raise ValueError(f"No rubric recorded for requisition {requisition_id}")
+    metering.check(requisition_id)
+    rubric_version, rubric = latest
+    backend = backend or get_backend()
+
+    os.makedirs(jobs_dir(), exist_ok=True)
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    input_path = os.path.join(jobs_dir(), f"{requisition_id}-{stamp}.jsonl")
+    new_inputs = {}
+    count = 0
+    with open(input_path, "w", encoding="utf-8") as f:
+        for stage in stages:
+            for evaluation in store.evaluations(requisition_id, stage):
+                if not evaluation["input_text"]:
+                    continue
+                line = request_line(f"{stage}:{evaluation['candidate_id']}", stage, rubric,
+                                    candidate_material(evaluation["input_text"]))
+                f.write(json.dumps(line) + "\n")
+                count += 1
+        for path in resume_files:
+            with open(path, encoding="utf-8") as resume_file:
+                resume = resume_file.read()
+            key = "resume:" + os.path.splitext(os.path.basename(path))[0]
+            new_inputs[key] = resume
+            f.write(json.dumps(request_line(key, "resume", rubric, f"## CANDIDATE RESUME\n\n{resume}")) + "\n")
+            count += 1
+    if new_inputs:
+        # Resume text for candidates the store doesn't know yet, attached to their evaluations on import
+        with open(input_path + ".inputs.json", "w", encoding="utf-8") as f:
+            json.dump(new_inputs, f)
+    if not count:
+        raise ValueError(f"Nothing to screen for requisition {requisition_id}")
+
+    job_name = backend.submit(input_path, f"{requisition_id}-{stamp}")
+    store.add_batch_job(job_name, backend.name, requisition_id, rubric_version, count, input_path)
+    return {"job": job_name, "backend": backend.name, "requests": count, "input_path": input_path}
+
+
+def poll(job_name: str, backend=None) -> str:
+    """Current normalised state of a job ("pending", "running", "succeeded", ...), recorded in the store."""
+    store = get_store()
+    job = store.batch_job(job_name)
+    if job is None:
+        raise ValueError(f"Unknown batch job {job_name}")
+    if job["state"] in TERMINAL_STATES or job["state"] == "imported":
+        return job["state"]
+    state = (backend or get_backend(job["backend"])).status(job_name)
+    if state != job["state"]:
+        store.update_batch_job(job_name, state=state)
+    return state
+
+
+def wait(job_name: str, backend=None, poll_seconds: float = None, timeout: float = None) -> str:
+    """Polls until the job reaches a terminal state (with the poll interval growing up to `poll_seconds`)."""
+    poll_seconds = poll_seconds or float(config.getenv("BATCH_POLL_SECONDS", 30))
+    deadline = time.monotonic() + timeout if timeout else None
+    delay = min(1.0, poll_seconds)
+    while True:
+        state = poll(job_name, backend)
+        if state in TERMINAL_STATES or state == "imported":
+            return state
+        if deadline and time.monotonic() + delay > deadline:
+            return state
+        time.sleep(delay)
+        delay = min(poll_seconds, delay * 2)
+
+
+def _response_text(response: dict) -> str:
+    for candidate in response.get("candidates") or ():
+        parts = (candidate.get("content") or {}).get("parts") or ()
+        text = "".join(part.get("text", "") for part in parts if not part.get("thought"))
+        if text:
+            return text
+    return ""
+
+
+def _record_usage(requisition_id: str, candidate_id: str, stage: str, response: dict, model: str = None):
+    metadata = response.get("usageMetadata") or {}
+    if metadata:
+        agent = "ResumeReviewer" if stage == "resume" else "GitHubReviewer"
+        metering.record(
+            requisition_id, candidate_id, f"{agent} (batch)", metadata.get("promptTokenCount") or 0,
+            (metadata.get("candidatesTokenCount") or 0) + (metadata.get("thoughtsTokenCount") or 0),
+            model or response.get("modelVersion"),
+        )
+
+
+def import_results(job_name: str, backend=None) -> dict:
+    """
+    Streams a finished job's result file into the result store, one line at a time.
+
+    Returns:
+        dict with imported / failed counts and the keys that failed
+    """
+    store = get_store()
+    job = store.batch_job(job_name)
+    if job is None or job["state"] != "succeeded":
+        raise ValueError(f"Batch job {job_name} has not succeeded (state: {job and job['state']})")
+    backend = backend or get_backend(job["backend"])
+
+    new_inputs = {}
+    if job["input_path"] and os.path.exists(job["input_path"] + ".inputs.json"):
+        with open(job["input_path"] + ".inputs.json", encoding="utf-8") as f:
+            new_inputs = json.load(f)
+
+    results_path = backend.download(job_name, (job["input_path"] or job_name.replace("/", "_")) + ".results.jsonl")
+    imported, failed = 0, []
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            stage, candidate_id = entry["key"].split(":", 1)
+            # Tokens are spent (and billed) whether or not the evaluation parses
+            _record_usage(job["requisition_id"], candidate_id, stage, entry.get("response") or {})
+            parsed = rubrics.parse_evaluation(_response_text(entry.get("response") or {}), stage)
+            if entry.get("error") or not parsed["criteria"]:
+                failed.append(entry["key"])
+                continue
+            store.put_evaluation(
+                job["requisition_id"], candidate_id, stage,
+                criteria=parsed["criteria"], total=parsed["total"], max_total=parsed["max_total"],
+                rubric_version=job["rubric_version"], candidate_name=parsed["candidate_name"],
+                input_text=new_inputs.get(entry["key"]), markdown=_response_text(entry["response"]),
+            )
+            imported += 1
+    store.update_batch_job(job_name, state="imported", imported=imported, failed=len(failed))
+    return {"job": job_name, "imported": imported, "failed": len(failed), "failed_keys": failed}
+
+
+def run(requisition_id: str, stages=("resume",), resume_files=(), backend=None, timeout: float = None) -> dict:
+    """submit + wait + import_results."""
+    backend = backend or get_backend()
+    job = submit(requisition_id, stages, resume_files, backend)
+    state = wait(job["job"], backend, timeout=timeout)
+    if state != "succeeded":
+        return {**job, "state": state}
+    return {**job, "state": "imported", **import_results(job["job"], backend)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Re-screen candidates through the provider's batch API.")
+    parser.add_argument("--backend", choices=["gemini", "local"], help="default: BATCH_BACKEND or gemini")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("submit", "run"):
+        command = commands.add_parser(name, help=f"{name} a batch job for a requisition")
+        command.add_argument("requisition_id")
+        command.add_argument("--stage", action="append", choices=STAGES, help="stages to re-screen (default: resume)")
+        command.add_argument("--resumes", nargs="*", default=[], help="new resume files to screen as well")
+    poll_command = commands.add_parser("poll", help="check (and import) a submitted job")
+    poll_command.add_argument("job")
+    poll_command.add_argument("--wait", action="store_true")
+    commands.add_parser("list", help="list batch jobs")
+    args = parser.parse_args(argv)
+
+    backend = get_backend(args.backend) if args.backend else None
+    if args.command == "list":
+        for job in get_store().batch_jobs():
+            print(f"{job['name']}  {job['backend']:<6} {job['requisition_id']}  {job['state']:<9} "
+                  f"{job['imported']}/{job['requests']} imported, {job['failed']} failed")
+        return 0
+    if args.command in ("submit", "run"):
+        stages = args.stage or ["resume"]
+        try:
+            if args.command == "submit":
+                job = submit(args.requisition_id, stages, args.resumes, backend)
+                print(f"Submitted {job['job']} ({job['requests']} requests, {job['backend']} backend)")
+                return 0
+            result = run(args.requisition_id, stages, args.resumes, backend)
+        except metering.BudgetExceeded as e:
+            print(f"Not submitted: {e}")
+            return 1
+    else:
+        state = wait(args.job, backend) if args.wait else poll(args.job, backend)
+        if state != "succeeded":
+            print(f"{args.job}: {state}")
+            return 0 if state not in ("failed", "cancelled", "expired") else 1
+        result = {"job": args.job, "state": "imported", **import_results(args.job, backend)}
+
+    print(f"{result['job']}: {result['state']}")
+    if result["state"] == "imported":
+        print(f"Imported {result['imported']} evaluations, {result['failed']} failed")
+    return 0 if result["state"] == "imported" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,250 @@
+"""
+Batched resume screening: several resumes scored against one rubric per model call.
+
+Scoring resumes one at a time re-sends the ResumeReviewer instruction and the full rubric for
+every candidate. `score_resumes` packs K resumes behind a single copy of that shared prefix and
+asks BatchResumeReviewer for K evaluations, each wrapped in `<<<EVALUATION id>>> ... <<<END id>>>`
+so they can be split by candidate id and parsed exactly like single evaluations.
+
+K adapts per batch to the input/output token budgets and the resume lengths (estimated at ~4
+characters per token). A resume whose evaluation is missing or does not parse, or whose batch call
+failed, is re-scored on its own by ResumeReviewer. Results are recorded in the result store under
+the caller's candidate ids.
+
+    python -m hiring_agent_adk.batch_scoring rubric.md resumes/*.txt --requisition req-123
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import time
+
+from . import config, metering, profiling, recording, rubrics, scheduler
+from .store import get_store
+
+CHARS_PER_TOKEN = 4
+
+_BLOCK_RE = re.compile(r"<<<EVALUATION[ \t]+([^\n]+?)[ \t]*>>>\s*(.*?)\s*<<<END[ \t]+\1[ \t]*>>>", re.S)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _budgets() -> dict:
+    return {
+        "input_tokens": int(config.getenv("BATCH_INPUT_TOKENS", 120_000)),
+        "output_tokens": int(config.getenv("BATCH_OUTPUT_TOKENS", 32_000)),
+        "evaluation_tokens": int(config.getenv("BATCH_EVALUATION_TOKENS", 1_500)),
+        "max_resumes": int(config.getenv("BATCH_MAX_RESUMES", 10)),
+    }
+
+
+def plan_batches(resumes: dict, rubric: str, **budgets) -> list:
+    """
+    Greedily groups resumes (in input order) into batches that fit the token budgets.
+
+    Args:
+        resumes: candidate_id -> resume text
+        rubric: The shared rubric, sent once per batch
+        budgets: Overrides for input_tokens, output_tokens, evaluation_tokens, max_resumes
+
+    Returns:
+        list of lists of candidate ids
+    """
+    from .tools_agents import BATCH_RESUME_REVIEWER_INSTRUCTION
+
+    limits = {**_budgets(), **budgets}
+    fixed = estimate_tokens(BATCH_RESUME_REVIEWER_INSTRUCTION) + estimate_tokens(rubric)
+    max_resumes = max(1, min(limits["max_resumes"], limits["output_tokens"] // limits["evaluation_tokens"]))
+
+    batches, batch, used = [], [], fixed
+    for candidate_id, text in resumes.items():
+        tokens = estimate_tokens(text) + 8  # + the "=== RESUME id ===" separator
+        if batch and (used + tokens > limits["input_tokens"] or len(batch) >= max_resumes):
+            batches.append(batch)
+            batch, used = [], fixed
+        batch.append(candidate_id)
+        used += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def batch_message(rubric: str, resumes: dict, candidate_ids: list) -> str:
+    """Rubric first (the shared prefix), then each resume behind its id separator."""
+    parts = [f"## EVALUATION RUBRIC\n\n{rubric}"]
+    parts += [f"=== RESUME {candidate_id} ===\n\n{resumes[candidate_id]}" for candidate_id in candidate_ids]
+    return "\n\n".join(parts)
+
+
+def split_evaluations(text: str, candidate_ids: list) -> dict:
+    """candidate_id -> evaluation Markdown for every well-formed block in a batch response."""
+    blocks = {match.group(1): match.group(2) for match in _BLOCK_RE.finditer(text)}
+    if not blocks and len(candidate_ids) == 1:
+        # A single-resume response without the wrapper is still a usable evaluation
+        blocks = {candidate_ids[0]: text}
+    return {candidate_id: blocks[candidate_id] for candidate_id in candidate_ids if candidate_id in blocks}
+
+
+def _parse(markdown: str, expected_criteria: int):
+    parsed = rubrics.parse_evaluation(markdown, "resume")
+    if len(parsed["criteria"]) < max(1, expected_criteria):
+        return None
+    return parsed
+
+
+async def _score_batch(rubric, resumes, candidate_ids, expected_criteria, semaphore, requisition_id) -> dict:
+    from .runtime import run_agent_async
+
+    # Tokens are metered against the requisition
+    state = {"requisition_id": requisition_id}
+    async with semaphore:
+        metering.check(requisition_id)
+        with scheduler.priority(scheduler.BATCH):
+            text = await run_agent_async("batch_resume_reviewer", batch_message(rubric, resumes, candidate_ids),
+                                         state=state)
+    results = {}
+    for candidate_id, markdown in split_evaluations(text, candidate_ids).items():
+        parsed = _parse(markdown, expected_criteria)
+        if parsed:
+            results[candidate_id] = (parsed, markdown)
+    return results
+
+
+async def _score_single(rubric, resumes, candidate_id, expected_criteria, semaphore, requisition_id,
+                        rubric_version) -> dict:
+    """Scores one resume with ResumeReviewer, as the chat workflow does."""
+    from . import workflow
+    from .runtime import run_agent_async
+
+    state = {
+        "requisition_id": requisition_id,
+        "rubric_version": rubric_version,
+        recording.EXTERNAL_CANDIDATE_ID: candidate_id,
+    }
+    message = workflow.reviewer_message({workflow.RUBRIC: rubric, workflow.RESUME: resumes[candidate_id]}, "resume")
+    async with semaphore:
+        metering.check(requisition_id)
+        with scheduler.priority(scheduler.BATCH):
+            text = await run_agent_async("resume_reviewer", message, state=state)
+    parsed = _parse(text, expected_criteria)
+    return {candidate_id: (parsed, text)} if parsed else {}
+
+
+def _error(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+async def score_resumes(resumes: dict, rubric: str, *, requisition_id: str = None, concurrency: int = None,
+                        **budgets) -> dict:
+    """
+    Scores `resumes` against `rubric` in adaptive batches and records the evaluations.
+
+    Args:
+        resumes: candidate_id -> resume text
+        rubric: Rubric Markdown (as produced by RubricBuilder)
+        requisition_id: Requisition to record under (default: a new one)
+        concurrency: Max parallel model calls (default: BATCH_CONCURRENCY or 4)
+        budgets: Token budget overrides, see plan_batches
+
+    Returns:
+        dict with the number of model calls versus one-per-resume, batch sizes, the ids that
+        needed a single-resume retry or could not be scored (with the error, where a call raised),
+        and the updated rankings
+    """
+    store = get_store()
+    requisition_id = requisition_id or recording.requisition_id_for({})
+    metering.check(requisition_id)
+    latest = store.rubric(requisition_id)
+    rubric_version = latest[0] if latest and latest[1] == rubric else store.add_rubric(requisition_id, rubric)
+    expected_criteria = sum(1 for criterion in rubrics.parse_rubric(rubric).values() if criterion["level"] == 1)
+
+    semaphore = asyncio.Semaphore(concurrency or int(config.getenv("BATCH_CONCURRENCY", 4)))
+    batches = plan_batches(resumes, rubric, **budgets)
+    scored, errors = {}, {}
+    # A batch call that raises loses only its own resumes, which fall back below
+    for batch, results in zip(batches, await asyncio.gather(*(
+        _score_batch(rubric, resumes, batch, expected_criteria, semaphore, requisition_id) for batch in batches
+    ), return_exceptions=True)):
+        if isinstance(results, Exception):
+            errors.update(dict.fromkeys(batch, _error(results)))
+        else:
+            scored.update(results)
+
+    # Anything the batch response dropped or garbled, or whose batch failed, is scored on its own
+    fallbacks = [candidate_id for candidate_id in resumes if candidate_id not in scored]
+    for candidate_id, results in zip(fallbacks, await asyncio.gather(*(
+        _score_single(rubric, resumes, candidate_id, expected_criteria, semaphore, requisition_id, rubric_version)
+        for candidate_id in fallbacks
+    ), return_exceptions=True)):
+        if isinstance(results, Exception):
+            errors[candidate_id] = _error(results)
+        else:
+            scored.update(results)
+
+    for candidate_id, (parsed, markdown) in scored.items():
+        store.put_evaluation(
+            requisition_id, candidate_id, "resume",
+            criteria=parsed["criteria"], total=parsed["total"], max_total=parsed["max_total"],
+            rubric_version=rubric_version, candidate_name=parsed["candidate_name"],
+            input_text=resumes[candidate_id], markdown=markdown,
+        )
+
+    return {
+        "status": "PASSED" if len(scored) == len(resumes) else "WARNING",
+        "requisition_id": requisition_id,
+        "rubric_version": rubric_version,
+        "candidates": len(resumes),
+        "model_calls": len(batches) + len(fallbacks),
+        "single_resume_model_calls": len(resumes),
+        "batch_sizes": [len(batch) for batch in batches],
+        "fallbacks": fallbacks,
+        "failed": [candidate_id for candidate_id in resumes if candidate_id not in scored],
+        "errors": {candidate_id: error for candidate_id, error in errors.items() if candidate_id not in scored},
+        "rankings": store.rankings(requisition_id),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Score many resumes against one rubric in batched model calls.")
+    parser.add_argument("rubric_file", help="rubric Markdown (RubricBuilder output)")
+    parser.add_argument("resumes", nargs="+", help="resume text files; the file name (without extension) is the candidate id")
+    parser.add_argument("--requisition", help="requisition id to record under")
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--plan", action="store_true", help="only print the batch plan")
+    parser.add_argument("--profile", action="store_true", help="profile each batch's Python-side time (see profiling.py)")
+    args = parser.parse_args(argv)
+
+    with open(args.rubric_file, encoding="utf-8") as f:
+        rubric = f.read()
+    resumes = {}
+    for path in args.resumes:
+        with open(path, encoding="utf-8") as f:
+            resumes[os.path.splitext(os.path.basename(path))[0]] = f.read()
+
+    if args.plan:
+        for i, batch in enumerate(plan_batches(resumes, rubric), start=1):
+            print(f"batch {i}: {', '.join(batch)}")
+        return 0
+
+    run_id = f"batch-scoring-{int(time.time())}"
+    with profiling.step("batch_scoring", run_id, args.profile or None):
+        result = asyncio.run(score_resumes(resumes, rubric, requisition_id=args.requisition, concurrency=args.concurrency))
+    print(f"Requisition {result['requisition_id']} (rubric v{result['rubric_version']})")
+    print(f"Model calls: {result['model_calls']} (one per resume: {result['single_resume_model_calls']}), "
+          f"batch sizes: {result['batch_sizes']}, single-resume retries: {len(result['fallbacks'])}")
+    if result["failed"]:
+        print(f"Could not score: {', '.join(result['failed'])}")
+        for candidate_id, error in result["errors"].items():
+            print(f"  {candidate_id}: {error}")
+    for entry in result["rankings"]:
+        print(f"{entry['rank']:>3}. {entry['candidate_name'] or entry['candidate_id']}: resume {entry['resume_score']}")
+    if args.profile:
+        print(f"Profile: python -m {__package__ or 'hiring_agent_adk'}.profiling report --run {run_id}")
+    return 0 if not result["failed"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,445 @@
+"""
+Record/replay cassettes for model calls and GitHub API exchanges.
+
+With CASSETTE_MODE=record, every model request/response (per agent, through the shared model
+callbacks), every `github_api.get` exchange and every user turn sent to the root agent is
+appended to CASSETTE_PATH (JSON Lines, gzip-compressed when the path ends in .gz) together with
+its latency. Message and instruction bodies are stored once, content-addressed, so a long session
+does not repeat its history in every model request.
+
+With CASSETTE_MODE=replay, model calls and GitHub requests are answered from the cassette without
+touching Gemini or api.github.com - after the recorded latency (CASSETTE_TIMING=recorded, the
+default) or immediately (CASSETTE_TIMING=fast). A model call is matched by agent and a hash of its
+request; if the request changed (e.g. a prompt edit), the agent's next unused recording is served
+instead and counted as drift, or CassetteMiss is raised with CASSETTE_STRICT=1.
+
+    python -m hiring_agent_adk.cassette show cassettes/session.jsonl.gz
+    python -m hiring_agent_adk.cassette replay cassettes/session.jsonl.gz --fast
+"""
+
+import argparse
+import asyncio
+import base64
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+
+from . import config
+
+FORMAT_VERSION = 1
+DEFAULT_PATH = os.path.join("cassettes", "session.jsonl.gz")
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recording for a request."""
+
+
+def _dump(obj):
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json", exclude_none=True)
+    if isinstance(obj, (list, tuple)):
+        return [_dump(item) for item in obj]
+    return obj
+
+
+def _canonical(obj) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _content_json(content) -> str:
+    data = _dump(content)
+    # Function call ids are generated per run and would make every replayed request look new
+    for part in data.get("parts") or ():
+        for field in ("function_call", "function_response"):
+            if isinstance(part.get(field), dict):
+                part[field].pop("id", None)
+    return _canonical(data)
+
+
+def http_key(method: str, path: str, params: dict = None) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    return f"{method} {path}" + (f"?{query}" if query else "")
+
+
+class Cassette:
+    """One cassette file, opened for recording or loaded for replay."""
+
+    def __init__(self, path: str, mode: str, *, timing: str = "recorded", strict: bool = False):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode {mode!r} (expected record or replay)")
+        self.path = path
+        self.mode = mode
+        self.timing = timing
+        self.strict = strict
+        self.stats = defaultdict(float)
+        self._lock = threading.Lock()
+        self._pending = {}  # (invocation_id, agent) -> (start, key, request)
+        self._start = time.monotonic()
+
+        if mode == "record":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = gzip.open(path, "wt", encoding="utf-8") if path.endswith(".gz") else open(path, "w", encoding="utf-8")
+            self._blobs = set()
+            self._write({"kind": "header", "version": FORMAT_VERSION,
+                         "created": datetime.now(timezone.utc).isoformat(timespec="seconds")})
+        else:
+            self.entries = load(path)
+            self.blobs = {entry["id"]: entry["data"] for entry in self.entries if entry["kind"] == "blob"}
+            self._models = defaultdict(list)  # agent -> model entries in recorded order
+            self._http = defaultdict(deque)  # key -> http entries in recorded order
+            for entry in self.entries:
+                if entry["kind"] == "model":
+                    self._models[entry["agent"]].append(entry)
+                elif entry["kind"] == "http":
+                    self._http[entry["key"]].append(entry)
+            self._used = set()
+
+    # --- recording ---
+
+    def _at(self) -> int:
+        return round((time.monotonic() - self._start) * 1000)
+
+    def _write(self, entry: dict):
+        self._file.write(_canonical(entry) + "\n")
+
+    def _blob(self, data: str) -> str:
+        blob_id = _digest(data)
+        if blob_id not in self._blobs:
+            self._blobs.add(blob_id)
+            self._write({"kind": "blob", "id": blob_id, "data": data})
+        return blob_id
+
+    def record_user_turn(self, session_id: str, text: str):
+        with self._lock:
+            self._write({"kind": "user", "session": session_id, "text": text, "at_ms": self._at()})
+
+    def _record_model(self, agent: str, key: str, request: dict, response, elapsed: float):
+        with self._lock:
+            stored = {
+                "system": self._blob(request["system"]) if request["system"] is not None else None,
+                "contents": [self._blob(content) for content in request["contents"]],
+                "tools": request["tools"],
+            }
+            self._write({"kind": "model", "agent": agent, "key": key, "request": stored,
+                         "response": _dump(response), "elapsed_ms": round(elapsed * 1000, 1), "at_ms": self._at()})
+            self.stats["model_calls"] += 1
+            self.stats["model_seconds"] += elapsed
+
+    def _record_http(self, key: str, response, elapsed: float):
+        body = response.content or b""
+        try:
+            body, encoding = body.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(body).decode("ascii"), "base64"
+        with self._lock:
+            self._write({"kind": "http", "key": key, "status": response.status_code, "headers": dict(response.headers),
+                         "body": body, "encoding": encoding, "elapsed_ms": round(elapsed * 1000, 1), "at_ms": self._at()})
+            self.stats["http_calls"] += 1
+            self.stats["http_seconds"] += elapsed
+
+    def close(self):
+        if self.mode == "record":
+            with self._lock:
+                self._file.close()
+
+    # --- replay ---
+
+    def _delay(self, entry: dict) -> float:
+        return entry["elapsed_ms"] / 1000 if self.timing == "recorded" else 0.0
+
+    def _next_model(self, agent: str, key: str) -> dict:
+        with self._lock:
+            unused = [entry for entry in self._models.get(agent, ()) if id(entry) not in self._used]
+            entry = next((entry for entry in unused if entry["key"] == key), None)
+            if entry is None:
+                if self.strict or not unused:
+                    self.stats["misses"] += 1
+                    raise CassetteMiss(f"No recorded {agent} model call for request {key}")
+                # The request changed since recording: serve the agent's next call in order
+                entry = unused[0]
+                self.stats["drifted"] += 1
+            self._used.add(id(entry))
+            self.stats["model_calls"] += 1
+            self.stats["model_seconds"] += entry["elapsed_ms"] / 1000
+            return entry
+
+    def _next_http(self, key: str) -> dict:
+        with self._lock:
+            queue = self._http.get(key)
+            if not queue:
+                self.stats["misses"] += 1
+                raise CassetteMiss(f"No recorded GitHub response for {key}")
+            # The last recording keeps answering repeats of the same request
+            entry = queue.popleft() if len(queue) > 1 else queue[0]
+            self.stats["http_calls"] += 1
+            self.stats["http_seconds"] += entry["elapsed_ms"] / 1000
+            return entry
+
+    def user_turns(self) -> list:
+        """(session id, text) of every recorded root-agent user turn, in order."""
+        return [(entry["session"], entry["text"]) for entry in self.entries if entry["kind"] == "user"]
+
+    # --- hooks ---
+
+    def http(self, method: str, path: str, params: dict, send):
+        """Serves `method path` from the cassette, or calls `send()` and records its response."""
+        key = http_key(method, path, params)
+        if self.mode == "record":
+            start = time.monotonic()
+            response = send()
+            self._record_http(key, response, time.monotonic() - start)
+            return response
+
+        entry = self._next_http(key)
+        if self._delay(entry):
+            time.sleep(self._delay(entry))
+        return _response(entry)
+
+    async def before_model(self, callback_context, llm_request):
+        agent = callback_context.agent_name
+        instruction = llm_request.config.system_instruction if llm_request.config else None
+        request = {
+            "system": _canonical(_dump(instruction)) if instruction is not None else None,
+            "contents": [_content_json(content) for content in llm_request.contents],
+            "tools": sorted(llm_request.tools_dict),
+        }
+        key = _digest(_canonical([agent, request["system"], request["contents"], request["tools"]]))
+        if self.mode == "record":
+            self._pending[(callback_context.invocation_id, agent)] = (time.monotonic(), key, request)
+            return None
+
+        from google.adk.models.llm_response import LlmResponse
+
+        entry = self._next_model(agent, key)
+        if self._delay(entry):
+            await asyncio.sleep(self._delay(entry))
+        response = LlmResponse.model_validate(entry["response"])
+
+        # A response from a before_model callback skips the after_model callbacks, which record
+        # rubrics, evaluations and verdicts - run them here so the replayed session has the same state
+        for callback in callback_context._invocation_context.agent.canonical_after_model_callbacks:
+            result = callback(callback_context=callback_context, llm_response=response)
+            if inspect.isawaitable(result):
+                result = await result
+            if result:
+                return result
+        return response
+
+    def after_model(self, callback_context, llm_response):
+        if self.mode != "record" or llm_response.partial:
+            return
+        pending = self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if pending is not None:
+            start, key, request = pending
+            self._record_model(callback_context.agent_name, key, request, llm_response, time.monotonic() - start)
+
+
+def _response(entry: dict):
+    import requests
+    from requests.structures import CaseInsensitiveDict
+
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    body = entry["body"]
+    response._content = base64.b64decode(body) if entry["encoding"] == "base64" else body.encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = entry["key"].split(" ", 1)[1]
+    return response
+
+
+def load(path: str) -> list:
+    """All entries of a cassette file."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+_active = None
+_configured = False
+_active_lock = threading.Lock()
+
+
+def active():
+    """The cassette in use (from CASSETTE_MODE/CASSETTE_PATH on first call), or None."""
+    global _active, _configured
+    if _configured:
+        return _active
+    with _active_lock:
+        if not _configured:
+            mode = (config.getenv("CASSETTE_MODE") or "").lower()
+            if mode:
+                _active = Cassette(
+                    config.getenv("CASSETTE_PATH", DEFAULT_PATH), mode,
+                    timing=config.getenv("CASSETTE_TIMING", "recorded").lower(),
+                    strict=config.getenv("CASSETTE_STRICT", "").lower() in ("1", "true", "yes"),
+                )
+                if mode == "record":
+                    import atexit
+
+                    atexit.register(_active.close)
+            _configured = True
+        return _active
+
+
+def use(cassette):
+    """Installs `cassette` (or None to disable) for this process, overriding the environment."""
+    global _active, _configured
+    with _active_lock:
+        previous = _active
+        _active, _configured = cassette, True
+    if previous is not None and previous is not cassette:
+        previous.close()
+
+
+async def before_model_callback(callback_context, llm_request):
+    """Shared before_model_callback: in replay, answers the model call from the cassette."""
+    cassette = active()
+    return await cassette.before_model(callback_context, llm_request) if cassette else None
+
+
+def after_model_callback(callback_context, llm_response):
+    cassette = active()
+    if cassette:
+        cassette.after_model(callback_context, llm_response)
+    return None
+
+
+def on_model_error_callback(callback_context, llm_request, error):
+    cassette = active()
+    if cassette:
+        cassette._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+    return None
+
+
+def before_agent_callback(callback_context):
+    """before_agent_callback for the root agent: records each user turn while recording."""
+    cassette = active()
+    content = callback_context.user_content
+    if cassette and cassette.mode == "record" and content and content.parts:
+        session_id = callback_context._invocation_context.session.id
+        cassette.record_user_turn(session_id, "".join(part.text for part in content.parts if part.text))
+    return None
+
+
+def summary(path: str) -> dict:
+    """Counts and recorded latency per agent and for GitHub, plus the user turns per session."""
+    entries = load(path)
+    agents = defaultdict(lambda: {"calls": 0, "seconds": 0.0})
+    http = {"calls": 0, "seconds": 0.0}
+    sessions = defaultdict(int)
+    for entry in entries:
+        if entry["kind"] == "model":
+            agents[entry["agent"]]["calls"] += 1
+            agents[entry["agent"]]["seconds"] += entry["elapsed_ms"] / 1000
+        elif entry["kind"] == "http":
+            http["calls"] += 1
+            http["seconds"] += entry["elapsed_ms"] / 1000
+        elif entry["kind"] == "user":
+            sessions[entry["session"]] += 1
+    return {
+        "bytes": os.path.getsize(path),
+        "blobs": sum(1 for entry in entries if entry["kind"] == "blob"),
+        "agents": dict(agents),
+        "http": http,
+        "sessions": dict(sessions),
+    }
+
+
+async def replay_sessions(path: str, *, timing: str = "recorded", strict: bool = False) -> dict:
+    """
+    Re-runs the recorded user turns through the root agent with everything external served from
+    the cassette, so the wall time minus the replayed latency is the orchestration overhead.
+
+    Returns:
+        dict with per-turn wall times, replayed model/GitHub latency and drift/miss counts
+    """
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    from . import cassette as installed  # not __main__ under `python -m`: the hooks read that module's state
+    from .agent import get_root_agent
+
+    cassette = Cassette(path, "replay", timing=timing, strict=strict)
+    installed.use(cassette)
+    agent = get_root_agent()
+    turns = []
+    started = time.perf_counter()
+    runner = InMemoryRunner(agent=agent, app_name=agent.name)
+    try:
+        sessions = {}
+        for recorded_session, text in cassette.user_turns():
+            if recorded_session not in sessions:
+                sessions[recorded_session] = await runner.session_service.create_session(
+                    app_name=agent.name, user_id="cassette"
+                )
+            turn_start = time.perf_counter()
+            async for _ in runner.run_async(
+                user_id="cassette",
+                session_id=sessions[recorded_session].id,
+                new_message=types.Content(role="user", parts=[types.Part.from_text(text=text)]),
+            ):
+                pass
+            turns.append(time.perf_counter() - turn_start)
+    finally:
+        await runner.close()
+        installed.use(None)
+
+    wall = time.perf_counter() - started
+    replayed = cassette.stats["model_seconds"] + cassette.stats["http_seconds"] if timing == "recorded" else 0.0
+    return {
+        "turns": turns,
+        "wall_seconds": wall,
+        "model_calls": int(cassette.stats["model_calls"]),
+        "http_calls": int(cassette.stats["http_calls"]),
+        "replayed_latency_seconds": replayed,
+        "overhead_seconds": max(0.0, wall - replayed),
+        "drifted": int(cassette.stats["drifted"]),
+        "misses": int(cassette.stats["misses"]),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or replay a recorded session cassette.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    show = commands.add_parser("show", help="summarize a cassette")
+    show.add_argument("path")
+    replay = commands.add_parser("replay", help="re-run the recorded session against the cassette")
+    replay.add_argument("path")
+    replay.add_argument("--fast", action="store_true", help="skip the recorded latencies")
+    replay.add_argument("--strict", action="store_true", help="fail when a model request differs from the recording")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        info = summary(args.path)
+        print(f"{args.path}: {info['bytes']:,} bytes, {len(info['sessions'])} session(s), "
+              f"{sum(info['sessions'].values())} user turn(s), {info['blobs']} distinct message bodies")
+        for agent, row in sorted(info["agents"].items()):
+            print(f"  {agent:<28} {row['calls']:>4} model call(s)  {row['seconds']:8.2f}s")
+        print(f"  {'GitHub API':<28} {info['http']['calls']:>4} request(s)     {info['http']['seconds']:8.2f}s")
+        return 0
+
+    result = asyncio.run(replay_sessions(args.path, timing="fast" if args.fast else "recorded", strict=args.strict))
+    print(f"Replayed {len(result['turns'])} turn(s), {result['model_calls']} model call(s), "
+          f"{result['http_calls']} GitHub request(s) in {result['wall_seconds']:.3f}s")
+    print(f"Recorded latency served: {result['replayed_latency_seconds']:.3f}s, "
+          f"orchestration overhead: {result['overhead_seconds']:.3f}s")
+    if result["drifted"]:
+        print(f"{result['drifted']} model request(s) differed from the recording (served in recorded order)")
+    return 0 if not result["misses"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
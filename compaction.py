@@ -0,0 +1,96 @@
+"""
+Transcript compaction at candidate boundaries.
+
+A session that evaluates several candidates keeps every earlier rubric, evaluation and verdict in
+its history, and the orchestrator would otherwise re-read all of it on every turn. Before each
+orchestrator model call, `compact_history` replaces the turns of finished candidates (everything
+before the most recent resume) with one pinned context message: the current job description and
+rubric, and a one-line structured record per earlier candidate from the result store. The current
+candidate's turns are sent unchanged, so the 10th candidate costs about as much as the first.
+
+The session itself is not modified; only the request sent to the model is.
+"""
+
+from . import workflow
+from .store import get_store
+
+
+def _text(content) -> str:
+    return "".join(part.text for part in content.parts or () if part.text)
+
+
+def _relayed(content) -> bool:
+    """True for another agent's message that ADK relays to the orchestrator as a "For context:" user content."""
+    first = next((part.text for part in content.parts or () if part.text), "")
+    return first.lstrip().startswith("For context:")
+
+
+def candidate_starts(contents: list) -> list:
+    """Indices of user turns that paste a resume, i.e. where each candidate's turns begin."""
+    # HiringWorkflow's own messages (e.g. a relayed resume evaluation) also arrive with role "user"
+    return [
+        i for i, content in enumerate(contents)
+        if content.role == "user" and not _relayed(content) and workflow.classify_document(_text(content)) == "resume"
+    ]
+
+
+def _score(value) -> str:
+    return f"{value:g}/10" if value is not None else "-"
+
+
+def candidate_records(requisition_id: str, exclude: str = None) -> list:
+    """One compact line per evaluated candidate of the requisition (ranked), skipping `exclude`."""
+    store = get_store()
+    verdicts = store.verdicts(requisition_id)
+    lines = []
+    for entry in store.rankings(requisition_id):
+        if entry["candidate_id"] == exclude:
+            continue
+        verdict = verdicts.get(entry["candidate_id"]) or {}
+        decision = verdict.get("verdict") or "no verdict"
+        if verdict.get("confidence"):
+            decision += f" ({verdict['confidence']})"
+        lines.append(
+            f"{entry['rank']}. {entry['candidate_name'] or entry['candidate_id']} [{entry['candidate_id']}] - "
+            f"resume {_score(entry['resume_score'])}, GitHub {_score(entry['github_score'])}, {decision}"
+        )
+    return lines
+
+
+def pinned_context(state, records: list) -> str:
+    """The message that stands in for the compacted turns."""
+    sections = ["## SESSION CONTEXT (earlier candidates compacted)"]
+    if state.get(workflow.JOB_DESCRIPTION):
+        sections.append(f"### JOB DESCRIPTION\n\n{state[workflow.JOB_DESCRIPTION]}")
+    if state.get(workflow.RUBRIC):
+        version = f" (version {state['rubric_version']})" if state.get("rubric_version") else ""
+        sections.append(f"### EVALUATION RUBRIC{version}\n\n{state[workflow.RUBRIC]}")
+    sections.append("### EARLIER CANDIDATES (rank. name [id] - scores, verdict)\n\n" + "\n".join(records or ["(none recorded)"]))
+    return "\n\n".join(sections)
+
+
+def compact_contents(contents: list, state) -> list:
+    """
+    `contents` with the turns of finished candidates collapsed into one pinned context message.
+
+    Returns:
+        The compacted list, or `contents` itself when there is nothing to compact
+    """
+    starts = candidate_starts(contents)
+    if len(starts) < 2:
+        return contents
+    from google.genai import types
+
+    current = contents[starts[-1]:]
+    # JD and rubric are pinned from state; if either is missing, keep the turns that introduced them
+    head = [] if state.get(workflow.JOB_DESCRIPTION) and state.get(workflow.RUBRIC) else contents[:starts[0]]
+    requisition_id = state.get("requisition_id")
+    records = candidate_records(requisition_id, exclude=state.get("candidate_id")) if requisition_id else []
+    pinned = types.Content(role="user", parts=[types.Part.from_text(text=pinned_context(state, records))])
+    return head + [pinned] + current
+
+
+def compact_history(callback_context, llm_request):
+    """before_model_callback for the orchestrator: compacts finished candidates out of the request."""
+    llm_request.contents = compact_contents(llm_request.contents, callback_context.state)
+    return None
@@ -0,0 +1,23 @@
+"""
+Environment configuration. The .env file is loaded once, on first use, instead of at import time.
+"""
+
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=None)
+def load_env():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def getenv(name: str, default=None):
+    """os.getenv that makes sure .env has been loaded first."""
+    load_env()
+    return os.getenv(name, default)
+
+
+def model_name():
+    return getenv("MODEL_NAME")
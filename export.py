@@ -0,0 +1,245 @@
+"""
+Columnar export of evaluation results for analytics.
+
+Writes one row per scored criterion, with the candidate's GitHub validation fields and final
+verdict denormalised onto each row, into append-only Parquet (or Arrow IPC) part files laid out as
+Hive partitions:
+
+    <root>/requisition_id=<id>/date=<YYYY-MM-DD>/part-<timestamp>-<uuid>.parquet
+
+so e.g. `pyarrow.dataset.dataset(root, partitioning="hive")` or DuckDB can answer
+"average Technical Skills score by requisition" with a vectorized scan. Each run exports only
+rows updated since the previous run (tracked as a watermark in the result store).
+
+A new verdict or validation re-exports the candidate's criterion rows, and `--full` re-exports
+everything, so the dataset holds several versions of a row. Latest wins: per (requisition_id,
+candidate_id, stage, criterion), keep the row with the highest `updated_at` (when the evaluation,
+validation or verdict behind it last changed), then `exported_at`. `read_latest` does this; in SQL:
+
+    SELECT * FROM dataset QUALIFY row_number() OVER (
+        PARTITION BY requisition_id, candidate_id, stage, criterion
+        ORDER BY updated_at DESC, exported_at DESC) = 1
+
+Requires the optional `pyarrow` dependency.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import time
+import uuid
+
+from .store import get_store
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# A row's identity across exports; see the module docstring
+ROW_KEY = ("requisition_id", "candidate_id", "stage", "criterion")
+
+# Low-cardinality string columns are dictionary-encoded to keep files small
+_DICTIONARY_COLUMNS = (
+    "candidate_id", "candidate_name", "stage", "criterion", "criterion_title",
+    "github_username", "validation_status", "profile_completeness", "verdict", "verdict_confidence",
+)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Columnar export requires pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def collect_rows(since: float = 0.0, requisition_id: str = None) -> list:
+    """
+    Flattens evaluations updated after `since` (or whose validation or verdict was) into
+    per-criterion rows.
+
+    Returns:
+        list of row dicts (one per candidate, stage and criterion); "updated_at" is the latest
+        change to any of the three
+    """
+    store = get_store()
+    sql = """
+        SELECT * FROM (
+            SELECT e.*, v.username AS github_username, v.status AS validation_status,
+                   v.public_repos, v.account_age_years, v.profile_completeness,
+                   d.verdict, d.confidence AS verdict_confidence, d.composite_score,
+                   MAX(e.updated_at, COALESCE(v.updated_at, 0), COALESCE(d.updated_at, 0)) AS row_updated_at
+            FROM evaluations e
+            LEFT JOIN validations v USING (requisition_id, candidate_id)
+            LEFT JOIN verdicts d USING (requisition_id, candidate_id)
+        )
+        WHERE row_updated_at > ?
+    """
+    params = [since]
+    if requisition_id:
+        sql += " AND requisition_id = ?"
+        params.append(requisition_id)
+
+    rows = []
+    for evaluation in store.execute(sql, params):
+        shared = {
+            "requisition_id": evaluation["requisition_id"],
+            "candidate_id": evaluation["candidate_id"],
+            "candidate_name": evaluation["candidate_name"],
+            "stage": evaluation["stage"],
+            "rubric_version": evaluation["rubric_version"],
+            "stage_total": evaluation["total"],
+            "stage_max_total": evaluation["max_total"],
+            "github_username": evaluation["github_username"],
+            "validation_status": evaluation["validation_status"],
+            "public_repos": evaluation["public_repos"],
+            "account_age_years": evaluation["account_age_years"],
+            "profile_completeness": evaluation["profile_completeness"],
+            "verdict": evaluation["verdict"],
+            "verdict_confidence": evaluation["verdict_confidence"],
+            "composite_score": evaluation["composite_score"],
+            "evaluated_at": datetime.datetime.fromtimestamp(evaluation["updated_at"], datetime.timezone.utc),
+            "updated_at": datetime.datetime.fromtimestamp(evaluation["row_updated_at"], datetime.timezone.utc),
+        }
+        for key, criterion in json.loads(evaluation["criteria_json"]).items():
+            rows.append({
+                **shared,
+                "criterion": key,
+                "criterion_title": criterion["title"],
+                "score": criterion["score"],
+                "max_points": criterion["max_points"],
+            })
+    return rows
+
+
+def _schema(pa):
+    string = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("candidate_id", string),
+        ("candidate_name", string),
+        ("stage", string),
+        ("criterion", string),
+        ("criterion_title", string),
+        ("score", pa.float32()),
+        ("max_points", pa.float32()),
+        ("stage_total", pa.float32()),
+        ("stage_max_total", pa.float32()),
+        ("rubric_version", pa.int32()),
+        ("github_username", string),
+        ("validation_status", string),
+        ("public_repos", pa.int32()),
+        ("account_age_years", pa.float32()),
+        ("profile_completeness", string),
+        ("verdict", string),
+        ("verdict_confidence", string),
+        ("composite_score", pa.float32()),
+        ("evaluated_at", pa.timestamp("s", tz="UTC")),
+        ("updated_at", pa.timestamp("us", tz="UTC")),
+        ("exported_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+def write_rows(rows: list, root: str, fmt: str = "parquet") -> list:
+    """
+    Appends rows as new part files under `root`, partitioned by requisition and evaluation date.
+    Existing files are never modified.
+
+    Returns:
+        list of written file paths
+    """
+    pa = _require_pyarrow()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Use one of: {', '.join(FORMATS)}")
+    schema = _schema(pa)
+
+    partitions = {}
+    for row in rows:
+        key = (row["requisition_id"], row["evaluated_at"].date().isoformat())
+        partitions.setdefault(key, []).append(row)
+
+    written = []
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    for (requisition_id, date), partition_rows in sorted(partitions.items()):
+        table = pa.Table.from_pylist(partition_rows, schema=schema)
+        directory = os.path.join(root, f"requisition_id={requisition_id}", f"date={date}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{stamp}-{uuid.uuid4().hex[:8]}{FORMATS[fmt]}")
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            pq.write_table(table, path, compression="zstd", use_dictionary=list(_DICTIONARY_COLUMNS))
+        else:
+            import pyarrow.ipc as ipc
+
+            with ipc.new_file(path, schema, options=ipc.IpcWriteOptions(compression="zstd")) as writer:
+                writer.write_table(table)
+        written.append(path)
+    return written
+
+
+def export(root: str, fmt: str = "parquet", requisition_id: str = None, full: bool = False) -> dict:
+    """
+    Exports everything updated since the last export to `root` and advances the watermark.
+
+    Args:
+        root: Dataset root directory
+        fmt: "parquet" or "arrow"
+        requisition_id: Limit the export to one requisition (does not advance the watermark)
+        full: Ignore the watermark and export every stored evaluation
+    """
+    store = get_store()
+    target = f"{os.path.abspath(root)}:{fmt}"
+    started = time.time()
+    since = 0.0 if full else store.watermark(target)
+    rows = collect_rows(since, requisition_id)
+    exported_at = datetime.datetime.fromtimestamp(started, datetime.timezone.utc)
+    for row in rows:
+        row["exported_at"] = exported_at
+    files = write_rows(rows, root, fmt) if rows else []
+    if not requisition_id:
+        store.set_watermark(target, started)
+    return {"rows": len(rows), "files": files}
+
+
+def latest(table):
+    """Keeps the latest version of each row (by ROW_KEY) of a table read from an export dataset."""
+    pa = _require_pyarrow()
+    import pyarrow.compute as pc
+
+    if table.num_rows == 0:
+        return table
+    order = pc.sort_indices(table, [("updated_at", "descending"), ("exported_at", "descending")])
+    table = table.take(order)
+    # Partition columns read back as dictionaries; group on plain strings
+    keys = pa.table({
+        **{column: table[column].cast(pa.string()) for column in ROW_KEY},
+        "position": pa.array(range(table.num_rows), pa.int64()),
+    })
+    first = keys.group_by(list(ROW_KEY), use_threads=False).aggregate([("position", "min")])
+    return table.take(first["position_min"])
+
+
+def read_latest(root: str, fmt: str = "parquet"):
+    """The export dataset under `root` as one table, with only the latest version of each row."""
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    return latest(ds.dataset(root, format="ipc" if fmt == "arrow" else fmt, partitioning="hive").to_table())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export evaluation results to a columnar dataset.")
+    parser.add_argument("root", help="dataset root directory")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="parquet")
+    parser.add_argument("--requisition", help="only export this requisition")
+    parser.add_argument("--full", action="store_true", help="re-export everything, ignoring the watermark")
+    args = parser.parse_args(argv)
+
+    result = export(args.root, args.format, args.requisition, args.full)
+    print(f"Exported {result['rows']} rows in {len(result['files'])} file(s)")
+    for path in result["files"]:
+        print(f"  {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,368 @@
+"""
+Local stand-in for api.github.com for deterministic load and failure testing.
+
+Serves the endpoints the agents use (users, user repos, repository contents, rate limit) with GitHub-style rate-limit
+headers and ETags, plus injectable latency, error rates, hangs (client timeouts) and rate-limit
+exhaustion. Point the agents at it with GITHUB_API_URL=http://127.0.0.1:<port>.
+
+    python -m <package>.fake_github --port 8765 --latency-ms 40 --error-rate 0.02
+    python -m <package>.fake_github --load 5000 --concurrency 64    # load-test github_validator
+
+Any login exists (with deterministic synthetic data) unless it starts with "missing", so
+thousands of distinct users can be requested without configuration.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeGitHubConfig:
+    """Behaviour knobs; may be changed while the server is running."""
+
+    def __init__(self, latency_ms=0.0, latency_jitter_ms=0.0, error_rate=0.0, error_status=503,
+                 hang_rate=0.0, hang_seconds=15.0, rate_limit=5000, rate_limit_window=3600.0,
+                 users=None, seed=None):
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.users = users or {}  # login -> profile overrides (None = 404)
+        self.random = random.Random(seed)
+
+
+def _digest(login: str) -> int:
+    return int(hashlib.sha1(login.lower().encode("utf-8")).hexdigest(), 16)
+
+
+def synthetic_user(login: str) -> dict:
+    """Deterministic profile for `login`, shaped like GitHub's /users/{login} response."""
+    h = _digest(login)
+    created_year = 2008 + h % 16
+    return {
+        "login": login,
+        "id": h % 10_000_000,
+        "name": login.replace("-", " ").title() if h % 5 else None,
+        "company": "@example" if h % 3 == 0 else None,
+        "blog": f"https://{login}.dev" if h % 4 == 0 else "",
+        "location": "Remote" if h % 2 else None,
+        "bio": "Software engineer" if h % 3 else None,
+        "public_repos": h % 60,
+        "followers": h % 500,
+        "following": h % 80,
+        "created_at": f"{created_year}-0{1 + h % 9}-1{h % 9}T12:00:00Z",
+        "updated_at": "2024-06-01T12:00:00Z",
+        "html_url": f"https://github.com/{login}",
+    }
+
+
+def synthetic_repos(login: str, count: int) -> list:
+    languages = ["Python", "TypeScript", "Go", "Java", "Rust", "JavaScript", None]
+    h = _digest(login)
+    return [
+        {
+            "name": f"project-{i}",
+            "full_name": f"{login}/project-{i}",
+            "fork": (h >> i) % 5 == 0,
+            "language": languages[(h + i) % len(languages)],
+            "stargazers_count": (h >> i) % 40,
+            "size": 100 + (h >> i) % 5000,
+            "pushed_at": f"202{(h + i) % 5}-0{1 + (h + i) % 9}-15T10:00:00Z",
+            "default_branch": "main",
+        }
+        for i in range(count)
+    ]
+
+
+def _repo_language(login: str, name: str):
+    match = re.fullmatch(r"project-(\d+)", name)
+    if not match:
+        return None
+    return synthetic_repos(login, int(match.group(1)) + 1)[-1]["language"]
+
+
+_MANIFEST_FILES = {
+    "Python": {"requirements.txt": "django>=4.2\ncelery==5.3.6\npsycopg[binary]\npytest\n",
+               "Dockerfile": "FROM python:3.12-slim\nCOPY . /app\nRUN pip install -r requirements.txt\n"},
+    "TypeScript": {"package.json": json.dumps({"dependencies": {"react": "^18.2.0", "next": "14.1.0"},
+                                               "devDependencies": {"typescript": "^5.3.0", "jest": "^29.0.0", "eslint": "^8.0.0"}}, indent=2)},
+    "JavaScript": {"package.json": json.dumps({"dependencies": {"express": "^4.18.0"}, "devDependencies": {"jest": "^29.0.0"}}, indent=2),
+                   "docker-compose.yml": "services:\n  db:\n    image: postgres:16\n  cache:\n    image: redis:7\n"},
+    "Go": {"go.mod": "module example.com/app\n\ngo 1.22\n\nrequire (\n\tgithub.com/gin-gonic/gin v1.9.1\n\tgoogle.golang.org/grpc v1.62.0\n)\n",
+           "Dockerfile": "FROM golang:1.22 AS build\n"},
+    "Java": {"pom.xml": "<project><dependencies><dependency><artifactId>spring-boot-starter-web</artifactId></dependency>"
+                        "<dependency><artifactId>junit-jupiter</artifactId></dependency></dependencies></project>\n"},
+    "Rust": {"Cargo.toml": "[package]\nname = \"app\"\n\n[dependencies]\ntokio = \"1\"\naxum = \"0.7\"\nserde = \"1\"\n"},
+}
+
+
+def synthetic_files(login: str, name: str) -> dict:
+    """Deterministic root tree of a synthetic repo: path -> text, with directories as nested dicts."""
+    language = _repo_language(login, name)
+    h = _digest(f"{login}/{name}")
+    files = {"README.md": f"# {name}\n\n{language or 'A'} project by {login}.\n\n" + "Usage notes. " * 400}
+    files.update(_MANIFEST_FILES.get(language, {}))
+    if h % 2:
+        files[".github"] = {"workflows": {"ci.yml": "on: push\njobs:\n  test:\n    steps:\n      - run: make test\n"}}
+    if h % 3:
+        files["tests"] = {"test_app.txt": "ok\n"}
+    return files
+
+
+def _contents(login: str, name: str, path: str):
+    """/repos/{login}/{name}/contents[/path]: a directory listing (list) or file text (str), or None."""
+    node = synthetic_files(login, name)
+    prefix = ""
+    for part in [part for part in path.split("/") if part]:
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node, prefix = node[part], f"{prefix}{part}/"
+    if isinstance(node, dict):
+        return [{"name": child, "path": prefix + child, "type": "dir" if isinstance(value, dict) else "file",
+                 "size": 0 if isinstance(value, dict) else len(value)} for child, value in node.items()]
+    return node
+
+
+class _RateLimiter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.used = 0
+        self.window_start = time.time()
+
+    def take(self, config) -> tuple:
+        """Returns (allowed, remaining, reset_epoch)."""
+        with self.lock:
+            now = time.time()
+            if now - self.window_start >= config.rate_limit_window:
+                self.used, self.window_start = 0, now
+            reset = int(self.window_start + config.rate_limit_window)
+            if self.used >= config.rate_limit:
+                return False, 0, reset
+            self.used += 1
+            return True, config.rate_limit - self.used, reset
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        raw = isinstance(body, bytes)
+        payload = body if raw else json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8" if raw else "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        server = self.server
+        config = server.config
+        server.count("requests")
+
+        delay = config.latency_ms + config.random.uniform(0, config.latency_jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+        if config.hang_rate and config.random.random() < config.hang_rate:
+            server.count("hangs")
+            time.sleep(config.hang_seconds)
+        if config.error_rate and config.random.random() < config.error_rate:
+            server.count("errors")
+            return self._send(config.error_status, {"message": "Injected failure"})
+
+        path = self.path.split("?", 1)[0].rstrip("/")
+        body = self._route(path)
+        if body is None:
+            return self._send(404, {"message": "Not Found"})
+
+        etag = '"' + hashlib.sha1(body if isinstance(body, bytes) else json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            # Conditional hits don't count against GitHub's rate limit
+            server.count("not_modified")
+            return self._send(304, headers={"ETag": etag})
+
+        allowed, remaining, reset = server.rate.take(config)
+        rate_headers = {
+            "X-RateLimit-Limit": str(config.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset),
+        }
+        if not allowed:
+            server.count("rate_limited")
+            return self._send(403, {"message": "API rate limit exceeded"}, rate_headers)
+        self._send(200, body, {**rate_headers, "ETag": etag})
+
+    def _route(self, path):
+        config = self.server.config
+        if path == "/rate_limit":
+            _, remaining, reset = self.server.rate.take(config)
+            return {"resources": {"core": {"limit": config.rate_limit, "remaining": remaining, "reset": reset}}}
+
+        match = re.fullmatch(r"/repos/([^/]+)/([^/]+)/contents(/.*)?", path)
+        if match:
+            login, name, file_path = match.groups()
+            if self.server.user(login) is None:
+                return None
+            node = _contents(login, name, file_path or "")
+            if isinstance(node, str):
+                if "raw" in self.headers.get("Accept", ""):
+                    return node.encode("utf-8")
+                return {"name": file_path.rsplit("/", 1)[-1], "path": file_path.lstrip("/"), "type": "file",
+                        "encoding": "base64", "content": base64.b64encode(node.encode("utf-8")).decode("ascii")}
+            return node
+
+        match = re.fullmatch(r"/users/([^/]+)(/repos)?", path)
+        if not match:
+            return None
+        login, repos = match.groups()
+        user = self.server.user(login)
+        if user is None:
+            return None
+        if repos:
+            return synthetic_repos(login, min(user["public_repos"], 100))
+        return user
+
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    """In-process fake GitHub API. Use as a context manager or call start()/stop()."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, config: FakeGitHubConfig = None, host="127.0.0.1", port=0):
+        super().__init__((host, port), _Handler)
+        self.config = config or FakeGitHubConfig()
+        self.rate = _RateLimiter()
+        self.stats = {}
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name):
+        with self._stats_lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def user(self, login):
+        if login in self.config.users:
+            override = self.config.users[login]
+            return None if override is None else {**synthetic_user(login), **override}
+        if login.lower().startswith("missing"):
+            return None
+        return synthetic_user(login)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-github", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def run_load(total: int, concurrency: int, distinct_users: int = 1000) -> dict:
+    """
+    Calls github_validator `total` times from `concurrency` threads against GITHUB_API_URL.
+
+    Returns:
+        dict with throughput, latency percentiles, status counts and back-pressure state
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .backpressure import backend_states
+    from .tools_agents import github_validator
+
+    def one(i):
+        start = time.perf_counter()
+        result = github_validator(f"user{i % distinct_users}")
+        return time.perf_counter() - start, result["status"]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    statuses = {}
+    for _, status in results:
+        statuses[status] = statuses.get(status, 0) + 1
+
+    def pct(p):
+        return round(1000 * latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+    return {
+        "requests": total,
+        "requests_per_second": round(total / elapsed, 1),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "statuses": statuses,
+        "backends": backend_states(),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run a local fake GitHub API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=5000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--load", type=int, metavar="N", help="run N github_validator calls against the server and exit")
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    config = FakeGitHubConfig(
+        latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms, error_rate=args.error_rate,
+        error_status=args.error_status, hang_rate=args.hang_rate, rate_limit=args.rate_limit, seed=args.seed,
+    )
+    server = FakeGitHubServer(config, args.host, args.port)
+    if args.load:
+        import os
+
+        os.environ["GITHUB_API_URL"] = server.base_url
+        with server:
+            print(json.dumps(run_load(args.load, args.concurrency), indent=2))
+            print(json.dumps(server.stats, indent=2))
+        return 0
+
+    print(f"Fake GitHub API listening on {server.base_url} (set GITHUB_API_URL to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
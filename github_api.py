@@ -0,0 +1,180 @@
+"""
+Shared GitHub REST API client.
+
+All GitHub traffic goes through `get()`, which adds:
+- a configurable base URL (GITHUB_API_URL, e.g. a local fake_github server for load tests),
+- a pooled keep-alive session (GITHUB_POOL_SIZE connections),
+- conditional requests with ETags, so unchanged resources come back as cheap 304s (the cached
+  bodies are kept zlib-compressed, at most GITHUB_ETAG_CACHE_SIZE of them),
+- the "github" scheduler (interactive before batch, fair across teams; see scheduler.py),
+- the "github" back-pressure backend (limiter, circuit breaker, jittered retries),
+- recording to / replay from the active cassette (see cassette.py).
+"""
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+from . import backpressure, cassette, config, scheduler
+
+DEFAULT_API_URL = "https://api.github.com"
+_session = None
+_session_lock = threading.Lock()
+_etags = OrderedDict()  # url -> (etag, compressed body, response fields)
+_etags_lock = threading.Lock()
+
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,37}[a-zA-Z0-9])?$')
+_PROFILE_URL_RE = re.compile(r'github\.com/([a-zA-Z0-9-]+)', re.I)
+_LABELLED_RE = re.compile(r'github\b[^\n:]*?[:\-–]\s*@?([a-zA-Z0-9-]+)\b', re.I)
+_HANDLE_RE = re.compile(r'(?<![\w.])@([a-zA-Z0-9-]+)\b')
+# github.com paths that are not user profiles
+_RESERVED_PATHS = {"orgs", "features", "about", "pricing", "topics", "collections", "settings", "marketplace"}
+
+
+def normalize_username(username: str) -> str:
+    """Reduces a GitHub URL, @handle or plain username to the bare username."""
+    username = username.strip()
+
+    # Handle github.com/username URLs
+    if "github.com/" in username:
+        match = _PROFILE_URL_RE.search(username)
+        if match:
+            username = match.group(1)
+
+    # Handle @username format
+    if username.startswith('@'):
+        username = username[1:]
+
+    # Remove trailing slashes or query params
+    return username.split('?')[0].rstrip('/')
+
+
+def is_valid_username(username: str) -> bool:
+    """1-39 alphanumeric characters or hyphens, not starting/ending with a hyphen."""
+    return bool(_USERNAME_RE.match(username))
+
+
+def find_username(text: str):
+    """
+    Finds a candidate's GitHub username in free text (resume or chat message): a github.com/<user>
+    link, a "GitHub: <user>" label, or an @handle on a line that mentions GitHub.
+
+    Returns:
+        The normalized username, or None
+    """
+    for match in _PROFILE_URL_RE.finditer(text):
+        if match.group(1).lower() not in _RESERVED_PATHS:
+            return match.group(1)
+    for line in text.splitlines():
+        if "github" not in line.lower():
+            continue
+        match = _LABELLED_RE.search(line) or _HANDLE_RE.search(line)
+        if match and is_valid_username(match.group(1)) and match.group(1).lower() != "com":
+            return match.group(1)
+    return None
+
+
+def base_url() -> str:
+    return config.getenv("GITHUB_API_URL", DEFAULT_API_URL).rstrip("/")
+
+
+def session():
+    """Process-wide requests.Session with a connection pool sized for concurrent validations."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            pool_size = int(config.getenv("GITHUB_POOL_SIZE", 32))
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def headers() -> dict:
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "User-Agent": "GitHub-Profile-Validator",
+    }
+    # Add token if available (for higher rate limits)
+    github_token = config.getenv("GITHUB_TOKEN")
+    if github_token:
+        headers["Authorization"] = f"token {github_token}"
+    return headers
+
+
+def _failed(response) -> bool:
+    return response.status_code == 429 or response.status_code >= 500
+
+
+def get(path: str, params: dict = None, timeout=10, extra_headers: dict = None, stream: bool = False):
+    """
+    GET `path` (e.g. "/users/octocat") from the GitHub API.
+
+    Returns:
+        requests.Response. A 304 for a cached ETag is answered with the cached 200 response.
+
+    Raises:
+        backpressure.BackendUnavailable: GitHub circuit open or concurrency limit reached
+        requests.exceptions.RequestException: after retries are exhausted
+        cassette.CassetteMiss: replaying and the request was never recorded
+    """
+    tape = cassette.active()
+    if tape is not None:
+        return tape.http("GET", path, params, lambda: _get(path, params, timeout, extra_headers, stream))
+    return _get(path, params, timeout, extra_headers, stream)
+
+
+def _cache_entry(etag: str, response) -> tuple:
+    fields = (response.url, response.reason, response.encoding, dict(response.headers))
+    return etag, zlib.compress(response.content), fields
+
+
+def _cached_response(entry: tuple):
+    """Rebuilds the 200 response stored by _cache_entry."""
+    import requests
+    from requests.structures import CaseInsensitiveDict
+
+    _, body, (url, reason, encoding, response_headers) = entry
+    response = requests.Response()
+    response.status_code, response.url, response.reason, response.encoding = 200, url, reason, encoding
+    response.headers = CaseInsensitiveDict(response_headers)
+    response._content = zlib.decompress(body)
+    return response
+
+
+def _get(path, params, timeout, extra_headers, stream):
+    import requests
+
+    url = base_url() + path
+    cache_key = url if not params else f"{url}?{sorted(params.items())}"
+    request_headers = {**headers(), **(extra_headers or {})}
+    with _etags_lock:
+        cached = _etags.get(cache_key) if not stream else None
+    if cached:
+        request_headers["If-None-Match"] = cached[0]
+
+    # Scheduled, limited, circuit-broken and retried (with jitter) on 429/5xx and connection errors
+    with scheduler.slot("github"):
+        response = backpressure.get_backend("github").call(
+            lambda: session().get(url, headers=request_headers, params=params, timeout=timeout, stream=stream),
+            failed=_failed,
+            retry_exceptions=(requests.exceptions.Timeout, requests.exceptions.ConnectionError),
+        )
+
+    if response.status_code == 304 and cached:
+        with _etags_lock:
+            _etags.move_to_end(cache_key)
+        return _cached_response(cached)
+    etag = response.headers.get("ETag")
+    if response.status_code == 200 and etag and not stream:
+        with _etags_lock:
+            _etags[cache_key] = _cache_entry(etag, response)
+            _etags.move_to_end(cache_key)
+            while len(_etags) > int(config.getenv("GITHUB_ETAG_CACHE_SIZE", 2048)):
+                _etags.popitem(last=False)
+    return response
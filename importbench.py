@@ -0,0 +1,81 @@
+"""
+Cold-import benchmark for the package, based on `python -X importtime`.
+
+Usage (from the directory that contains the package):
+    python -m <package>.importbench [--budget-ms 50] [--top 10] [--module <package>.agent]
+
+Exits with status 1 when the cumulative import time of the target module exceeds the budget,
+so it can be used as a CI gate against regressions that make the package import heavy again.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+PACKAGE = __package__ or "hiring_agent_adk"
+DEFAULT_BUDGET_MS = 50.0
+
+
+def measure_import(module: str = PACKAGE) -> dict:
+    """
+    Imports `module` in a fresh interpreter with -X importtime.
+
+    Returns:
+        dict with the module's cumulative import time in milliseconds and the per-module
+        (self_ms, cumulative_ms) breakdown
+
+    Raises:
+        RuntimeError: the import failed, or reported no time for `module` itself
+    """
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=parent_dir,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+
+    if module not in modules:
+        # Already imported at start-up (or not reported), so there is no time to compare with the budget
+        raise RuntimeError(f"-X importtime reported no import of {module}")
+
+    return {
+        "module": module,
+        "cumulative_ms": modules[module][1],
+        "modules": modules,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--module", default=PACKAGE, help="module to import (default: the package)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10, help="show the N slowest modules")
+    args = parser.parse_args(argv)
+
+    result = measure_import(args.module)
+    slowest = sorted(result["modules"].items(), key=lambda item: item[1][0], reverse=True)
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for name, (self_ms, cumulative_ms) in slowest[:args.top]:
+        print(f"{self_ms:9.1f} {cumulative_ms:9.1f}  {name}")
+
+    within = result["cumulative_ms"] <= args.budget_ms
+    print(
+        f"\n{'✅' if within else '❌'} import {args.module}: {result['cumulative_ms']:.1f} ms "
+        f"(budget {args.budget_ms:.0f} ms)"
+    )
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
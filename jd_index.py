@@ -0,0 +1,232 @@
+"""
+Near-duplicate job description detection, so RubricBuilder can reuse an existing rubric.
+
+Every JD a rubric is generated for is indexed with a MinHash signature (128 permutations over
+word 3-gram shingles) in an LSH table of 16 bands x 8 rows, which makes a JD a candidate from
+about 0.7 similarity on (95% likely at 0.8). A new JD whose estimated Jaccard similarity to an
+indexed one is at least JD_REUSE_THRESHOLD (default 0.8) reuses that rubric instead of a full
+generation - unless the JDs differ in a skill (per the matching taxonomy), a number ("5+" vs "10+"
+years) or a term of a requirement sentence, in which case the next most similar JD is tried and
+failing all of them a fresh rubric is generated. A requisition never reuses its own earlier rubric,
+so an edited JD is always regenerated (and its candidates rescored). The reused rubric is prefixed
+with a note naming the source requisition, the similarity and the differing terms.
+
+Signatures are stored in the result store and loaded into memory on first use. A lookup reads at
+most BUCKET_SCAN of the newest JDs from each bucket it hits and computes the exact similarity only
+for the MAX_CANDIDATES that share the most buckets with it, so it stays under a millisecond even
+with tens of thousands of boilerplate-heavy JDs indexed (numpy speeds up computing the query
+signature when installed).
+"""
+
+import heapq
+import random
+import re
+import threading
+import zlib
+from collections import Counter
+
+from . import config, rubrics
+from .store import get_store
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # candidate threshold ~ (1 / BANDS) ** (1 / ROWS) = 0.71
+BUCKET_SCAN = 64  # newest entries read per bucket; a crowded bucket holds near-copies of each other
+MAX_CANDIDATES = 32  # entries compared exactly, by the number of buckets shared
+SHINGLE_SIZE = 3
+_MASK = (1 << 64) - 1
+
+# Multiply-shift hash family: h(x) = ((a * x + b) mod 2**64) >> 32, with odd a
+_rng = random.Random(1337)
+_A = [_rng.getrandbits(64) | 1 for _ in range(NUM_PERM)]
+_B = [_rng.getrandbits(64) for _ in range(NUM_PERM)]
+_WORD_RE = re.compile(r"[a-z0-9+#.]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n")
+_REQUIREMENT_RE = re.compile(
+    r"\b(requir|must|experience|years?\b|proficien|knowledge|degree|familiar|expert|skills?\b|qualifications?\b)", re.I
+)
+
+
+def shingles(text: str) -> set:
+    words = [word.strip(".") for word in _WORD_RE.findall(text.lower())]
+    words = [word for word in words if word]
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def signature(text: str) -> tuple:
+    """MinHash signature of `text` (NUM_PERM ints); identical with or without numpy."""
+    hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text)]
+    if not hashes:
+        return (1 << 32,) * NUM_PERM
+    try:
+        import numpy as np
+    except ImportError:
+        return tuple(min(((a * x + b) & _MASK) >> 32 for x in hashes) for a, b in zip(_A, _B))
+    x = np.asarray(hashes, dtype=np.uint64)
+    a = np.asarray(_A, dtype=np.uint64)[:, None]
+    b = np.asarray(_B, dtype=np.uint64)[:, None]
+    # uint64 arithmetic wraps around, i.e. is already mod 2**64
+    return tuple(((a * x + b) >> np.uint64(32)).min(axis=1).tolist())
+
+
+def similarity(first: tuple, second: tuple) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_PERM
+
+
+def _bands(sig: tuple):
+    for band in range(BANDS):
+        yield band, sig[band * ROWS:(band + 1) * ROWS]
+
+
+class JDIndex:
+    """In-memory LSH index over (requisition_id, rubric_version) -> JD signature."""
+
+    def __init__(self):
+        self.entries = []  # (requisition_id, rubric_version, signature, text)
+        self.buckets = {}  # (band, band values) -> [entry position]
+        self._lock = threading.Lock()
+
+    def add(self, requisition_id: str, rubric_version: int, sig: tuple, text: str = None):
+        with self._lock:
+            position = len(self.entries)
+            self.entries.append((requisition_id, rubric_version, sig, text))
+            for key in _bands(sig):
+                self.buckets.setdefault(key, []).append(position)
+
+    def matches(self, sig: tuple, exclude_requisition: str = None) -> list:
+        """
+        Returns:
+            (requisition_id, rubric_version, similarity, text) of the indexed JDs sharing the most
+            LSH buckets with `sig` (at most MAX_CANDIDATES, none of `exclude_requisition`), most
+            similar first
+        """
+        with self._lock:
+            hits = Counter()
+            for key in _bands(sig):
+                hits.update(self.buckets.get(key, ())[-BUCKET_SCAN:])
+            found = []
+            # Most buckets shared first, then the newest
+            for position, _ in heapq.nlargest(MAX_CANDIDATES, hits.items(), key=lambda item: (item[1], item[0])):
+                requisition_id, version, other, text = self.entries[position]
+                if requisition_id != exclude_requisition:
+                    found.append((requisition_id, version, similarity(sig, other), text))
+        found.sort(key=lambda match: (match[2], match[1]), reverse=True)
+        return found
+
+    def nearest(self, sig: tuple, exclude_requisition: str = None):
+        """The first of `matches`, or None."""
+        found = self.matches(sig, exclude_requisition)
+        return found[0] if found else None
+
+    def __len__(self):
+        return len(self.entries)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> JDIndex:
+    """The process-wide index, loaded from the result store on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = JDIndex()
+            for row in get_store().job_descriptions():
+                _index.add(row["requisition_id"], row["rubric_version"], tuple(row["signature"]), row["text"])
+        return _index
+
+
+def index_jd(requisition_id: str, rubric_version: int, text: str):
+    """Records the JD a rubric version was generated (or reused) for."""
+    sig = signature(text)
+    index = get_index()  # loaded before the new row is stored, so it isn't added twice
+    get_store().add_job_description(requisition_id, rubric_version, text, list(sig))
+    index.add(requisition_id, rubric_version, sig, text)
+
+
+def _differences(old_text: str, new_text: str) -> tuple:
+    """(terms only in the new JD, terms only in the old JD), by rubrics.key_terms."""
+    old_terms, new_terms = rubrics.key_terms(old_text or ""), rubrics.key_terms(new_text)
+    return sorted(new_terms - old_terms), sorted(old_terms - new_terms)
+
+
+def _requirement_terms(text: str) -> set:
+    """Key terms of the sentences that state a requirement, plus every term with a digit."""
+    terms = set()
+    for sentence in _SENTENCE_RE.split(text or ""):
+        sentence_terms = rubrics.key_terms(sentence)
+        if _REQUIREMENT_RE.search(sentence):
+            terms |= sentence_terms
+        else:
+            terms |= {term for term in sentence_terms if any(ch.isdigit() for ch in term)}
+    return terms
+
+
+def find_reusable(text: str, threshold: float = None, exclude_requisition: str = None):
+    """
+    Finds the most similar indexed JD whose rubric can be reused for `text`. JDs indexed under
+    `exclude_requisition` (the requisition being built) are never reused.
+
+    Returns:
+        dict with requisition_id, rubric_version, similarity, rubric and differing terms, or None
+    """
+    from .matching import default_extractor
+
+    threshold = threshold if threshold is not None else float(config.getenv("JD_REUSE_THRESHOLD", 0.8))
+    extractor = default_extractor()
+    skills, requirements = None, None
+    for requisition_id, version, score, old_text in get_index().matches(signature(text), exclude_requisition):
+        if score < threshold:
+            return None
+        if skills is None:
+            skills, requirements = extractor.extract(text), _requirement_terms(text)
+        # Location/team/boilerplate changes are fine; a changed skill, number or requirement needs another rubric
+        if extractor.extract(old_text or "") != skills or _requirement_terms(old_text) != requirements:
+            continue
+        rubric = get_store().rubric(requisition_id, version)
+        if rubric is None:
+            continue
+        added, removed = _differences(old_text, text)
+        return {
+            "requisition_id": requisition_id,
+            "rubric_version": version,
+            "similarity": round(score, 3),
+            "rubric": rubric[1],
+            "added_terms": added,
+            "removed_terms": removed,
+        }
+    return None
+
+
+def reuse_note(match: dict) -> str:
+    differences = ", ".join(match["added_terms"] + [f"-{term}" for term in match["removed_terms"]]) or "none"
+    return (
+        f"> ♻️ Reused the rubric of requisition {match['requisition_id']} (version {match['rubric_version']}): "
+        f"its job description is {match['similarity']:.0%} similar to this one. Differing terms: {differences}.\n\n"
+    )
+
+
+def reuse_rubric_callback(callback_context):
+    """
+    before_agent_callback for RubricBuilder: answers with an existing rubric when the JD is a
+    near-duplicate of one already indexed, skipping the model call.
+    """
+    from google.genai import types
+
+    from .recording import requisition_id_for
+
+    content = callback_context.user_content
+    text = "".join(part.text for part in content.parts if part.text) if content and content.parts else ""
+    state = callback_context.state
+    match = find_reusable(text, exclude_requisition=state.get("requisition_id")) if text else None
+    if match is None:
+        return None
+    requisition_id = requisition_id_for(state)
+    version = get_store().add_rubric(requisition_id, match["rubric"])
+    state["rubric_version"] = version
+    index_jd(requisition_id, version, text)
+    return types.Content(role="model", parts=[types.Part.from_text(text=reuse_note(match) + match["rubric"])])
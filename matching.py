@@ -0,0 +1,342 @@
+"""
+Many-to-many matching of applicants against every open requisition.
+
+Skills are extracted with an Aho-Corasick automaton over a skill taxonomy (canonical skill ->
+aliases), in one pass over each text. Each requisition's latest rubric becomes a weighted skill
+vector (skills in the technical-skills criterion count fully, skills mentioned elsewhere in the
+rubric at half weight), normalised so a score is the share of the requisition's skill weight the
+resume covers. Resumes become binary skill vectors, and one matrix product scores every resume
+against every requisition at once.
+
+Only each candidate's top matches are sent through the (expensive) ResumeReviewer path, batched
+per requisition with batch_scoring.
+
+Requires the optional `numpy` dependency; `scipy` is used for sparse matrices when installed.
+
+    python -m hiring_agent_adk.matching resumes/*.txt --top 3 --review
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import os
+from collections import deque
+
+from . import config, rubrics
+from .store import get_store
+
+# Canonical skill -> aliases (matched case-insensitively on word boundaries)
+DEFAULT_TAXONOMY = {
+    "python": ["python"],
+    "java": ["java"],
+    "javascript": ["javascript", "ecmascript"],
+    "typescript": ["typescript"],
+    "go": ["golang", "go lang"],
+    "rust": ["rust"],
+    "c++": ["c++", "cpp"],
+    "c#": ["c#", "csharp"],
+    "ruby": ["ruby"],
+    "php": ["php"],
+    "kotlin": ["kotlin"],
+    "swift": ["swift"],
+    "scala": ["scala"],
+    "sql": ["sql"],
+    "django": ["django"],
+    "flask": ["flask"],
+    "fastapi": ["fastapi"],
+    "spring": ["spring boot", "spring framework"],
+    "node.js": ["node.js", "nodejs", "node js"],
+    "react": ["react", "react.js", "reactjs"],
+    "angular": ["angular"],
+    "vue": ["vue", "vue.js", "vuejs"],
+    "next.js": ["next.js", "nextjs"],
+    ".net": [".net", "dotnet", "asp.net"],
+    "rest apis": ["rest api", "rest apis", "restful", "rest services"],
+    "graphql": ["graphql"],
+    "grpc": ["grpc"],
+    "microservices": ["microservices", "microservice architecture"],
+    "postgresql": ["postgresql", "postgres"],
+    "mysql": ["mysql"],
+    "mongodb": ["mongodb", "mongo"],
+    "redis": ["redis"],
+    "elasticsearch": ["elasticsearch", "elastic search", "opensearch"],
+    "kafka": ["kafka"],
+    "rabbitmq": ["rabbitmq"],
+    "spark": ["apache spark", "pyspark", "spark"],
+    "airflow": ["airflow"],
+    "aws": ["aws", "amazon web services"],
+    "gcp": ["gcp", "google cloud"],
+    "azure": ["azure"],
+    "docker": ["docker"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "terraform": ["terraform"],
+    "ci/cd": ["ci/cd", "continuous integration", "continuous delivery", "github actions", "jenkins", "gitlab ci"],
+    "linux": ["linux"],
+    "git": ["git"],
+    "machine learning": ["machine learning", "ml"],
+    "deep learning": ["deep learning"],
+    "pytorch": ["pytorch"],
+    "tensorflow": ["tensorflow"],
+    "nlp": ["nlp", "natural language processing"],
+    "llms": ["llm", "llms", "large language models"],
+    "pandas": ["pandas"],
+    "numpy": ["numpy"],
+    "data engineering": ["data engineering", "etl", "data pipelines"],
+    "testing": ["unit testing", "pytest", "junit", "test-driven", "tdd"],
+    "system design": ["system design", "distributed systems"],
+    "security": ["security", "owasp"],
+    "agile": ["agile", "scrum"],
+    "html/css": ["html", "css"],
+    "ios": ["ios"],
+    "android": ["android"],
+}
+
+
+# ---------------------------------------------------------------------------
+# Aho-Corasick skill extraction
+# ---------------------------------------------------------------------------
+
+class AhoCorasick:
+    """Multi-pattern matcher: finds every occurrence of any pattern in one pass over the text."""
+
+    def __init__(self, patterns: dict):
+        """
+        Args:
+            patterns: pattern string -> value reported on a match (e.g. alias -> canonical skill)
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern, value in patterns.items():
+            node = 0
+            for char in pattern.lower():
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].append((len(pattern), value))
+
+        # Breadth-first failure links; outputs of the fallback state are inherited
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text: str):
+        """Yields (start, end, value) for every whole-word match in `text`."""
+        lowered = text.lower()
+        node = 0
+        for i, char in enumerate(lowered):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for length, value in self.output[node]:
+                start = i - length + 1
+                # Word boundaries, checked only where the pattern itself starts/ends with a word character
+                if lowered[start].isalnum() and start > 0 and lowered[start - 1].isalnum():
+                    continue
+                if char.isalnum() and i + 1 < len(lowered) and lowered[i + 1].isalnum():
+                    continue
+                yield start, i + 1, value
+
+
+def load_taxonomy() -> dict:
+    """DEFAULT_TAXONOMY, extended/overridden by the JSON file at SKILL_TAXONOMY_PATH if set."""
+    taxonomy = dict(DEFAULT_TAXONOMY)
+    path = config.getenv("SKILL_TAXONOMY_PATH")
+    if path:
+        with open(path, encoding="utf-8") as f:
+            taxonomy.update(json.load(f))
+    return taxonomy
+
+
+class SkillExtractor:
+    def __init__(self, taxonomy: dict = None):
+        taxonomy = taxonomy or load_taxonomy()
+        self.skills = sorted(taxonomy)
+        self.index = {skill: i for i, skill in enumerate(self.skills)}
+        patterns = {}
+        for skill, aliases in taxonomy.items():
+            # Only the listed aliases are matched, so e.g. "go" needs "golang" rather than matching the verb
+            for alias in aliases or [skill]:
+                patterns[alias.lower()] = skill
+        self.matcher = AhoCorasick(patterns)
+
+    def extract(self, text: str) -> set:
+        """Canonical skills mentioned in `text`."""
+        return {skill for _, _, skill in self.matcher.find(text or "")}
+
+
+@functools.lru_cache(maxsize=1)
+def default_extractor() -> SkillExtractor:
+    """Shared extractor over the configured taxonomy (the automaton is built once)."""
+    return SkillExtractor()
+
+
+# ---------------------------------------------------------------------------
+# Vectors and matching
+# ---------------------------------------------------------------------------
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Requisition matching requires numpy: pip install numpy") from e
+    return numpy
+
+
+def requisition_weights(extractor: SkillExtractor, rubric_markdown: str) -> dict:
+    """skill -> weight for a rubric: 1.0 in the technical-skills criterion, 0.5 elsewhere."""
+    weights = {skill: 0.5 for skill in extractor.extract(rubric_markdown)}
+    for criterion in rubrics.parse_rubric(rubric_markdown).values():
+        if criterion["level"] == 1 and "skill" in criterion["title"].lower():
+            weights.update({skill: 1.0 for skill in extractor.extract(criterion["text"])})
+    return weights
+
+
+def _matrix(rows: list, width: int, np):
+    """A (len(rows) x width) matrix from per-row {column: value} dicts - sparse when scipy is available."""
+    row_ids = [r for r, row in enumerate(rows) for _ in row]
+    col_ids = [c for row in rows for c in row]
+    values = [v for row in rows for v in row.values()]
+    try:
+        from scipy import sparse
+    except ImportError:
+        dense = np.zeros((len(rows), width), dtype=np.float32)
+        dense[row_ids, col_ids] = values
+        return dense
+    return sparse.csr_matrix((values, (row_ids, col_ids)), shape=(len(rows), width), dtype=np.float32)
+
+
+class RequisitionIndex:
+    """Skill vectors of the open requisitions, built once and reused for every batch of applicants."""
+
+    def __init__(self, requisitions: dict, extractor: SkillExtractor = None):
+        """
+        Args:
+            requisitions: requisition_id -> rubric Markdown
+        """
+        np = _require_numpy()
+        self.extractor = extractor or default_extractor()
+        self.ids = list(requisitions)
+        self.weights = [requisition_weights(self.extractor, markdown) for markdown in requisitions.values()]
+        rows = []
+        for weights in self.weights:
+            total = sum(weights.values()) or 1.0
+            rows.append({self.extractor.index[skill]: weight / total for skill, weight in weights.items()})
+        self.matrix = _matrix(rows, len(self.extractor.skills), np)  # requisitions x skills, rows sum to 1
+
+    @classmethod
+    def from_store(cls, extractor: SkillExtractor = None):
+        return cls(get_store().open_rubrics(), extractor)
+
+    def score(self, resumes: dict):
+        """
+        Scores every resume against every requisition in one matrix product.
+
+        Returns:
+            (candidate ids, resume skill sets, scores array of shape candidates x requisitions in [0, 1])
+        """
+        np = _require_numpy()
+        candidate_ids = list(resumes)
+        skills = [self.extractor.extract(text) for text in resumes.values()]
+        rows = [{self.extractor.index[skill]: 1.0 for skill in found} for found in skills]
+        resume_matrix = _matrix(rows, len(self.extractor.skills), np)
+        scores = resume_matrix @ self.matrix.T
+        scores = scores.toarray() if hasattr(scores, "toarray") else np.asarray(scores)
+        return candidate_ids, skills, scores
+
+    def top_matches(self, resumes: dict, top_k: int = 3, min_score: float = 0.0) -> dict:
+        """
+        candidate_id -> up to `top_k` best requisitions (score >= min_score), each with the matched
+        and missing required skills.
+        """
+        np = _require_numpy()
+        candidate_ids, skills, scores = self.score(resumes)
+        matches = {}
+        if not self.ids:
+            return {candidate_id: [] for candidate_id in candidate_ids}
+        k = min(top_k, len(self.ids))
+        best = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+        for row, candidate_id in enumerate(candidate_ids):
+            matches[candidate_id] = []
+            for column in best[row]:
+                score = float(scores[row, column])
+                if score < min_score or score <= 0:
+                    continue
+                required = {skill for skill, weight in self.weights[column].items() if weight == 1.0}
+                matches[candidate_id].append({
+                    "requisition_id": self.ids[column],
+                    "score": round(score, 3),
+                    "matched_skills": sorted(skills[row] & set(self.weights[column])),
+                    "missing_required_skills": sorted(required - skills[row]),
+                })
+        return matches
+
+
+async def screen(resumes: dict, top_k: int = 3, min_score: float = 0.3, review: bool = True) -> dict:
+    """
+    Matches applicants against every open requisition and runs ResumeReviewer (batched) only for
+    each applicant's top matches.
+
+    Returns:
+        dict with the matches per candidate and, if `review`, the batch scoring result per requisition
+    """
+    from .batch_scoring import score_resumes
+
+    index = RequisitionIndex.from_store()
+    matches = index.top_matches(resumes, top_k, min_score)
+    result = {"requisitions": len(index.ids), "candidates": len(resumes), "matches": matches, "reviews": {}}
+    if not review:
+        return result
+
+    per_requisition = {}
+    for candidate_id, candidate_matches in matches.items():
+        for match in candidate_matches:
+            per_requisition.setdefault(match["requisition_id"], {})[candidate_id] = resumes[candidate_id]
+    store = get_store()
+    for requisition_id, requisition_resumes in per_requisition.items():
+        rubric = store.rubric(requisition_id)[1]
+        result["reviews"][requisition_id] = await score_resumes(
+            requisition_resumes, rubric, requisition_id=requisition_id
+        )
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Match applicants against every open requisition.")
+    parser.add_argument("resumes", nargs="+", help="resume text files; the file name (without extension) is the candidate id")
+    parser.add_argument("--top", type=int, default=3, help="requisitions per candidate to review")
+    parser.add_argument("--min-score", type=float, default=0.3, help="minimum skill coverage (0-1) to review")
+    parser.add_argument("--review", action="store_true", help="run ResumeReviewer for the top matches")
+    args = parser.parse_args(argv)
+
+    resumes = {}
+    for path in args.resumes:
+        with open(path, encoding="utf-8") as f:
+            resumes[os.path.splitext(os.path.basename(path))[0]] = f.read()
+
+    result = asyncio.run(screen(resumes, args.top, args.min_score, args.review))
+    print(f"Matched {result['candidates']} candidate(s) against {result['requisitions']} open requisition(s)")
+    for candidate_id, candidate_matches in result["matches"].items():
+        print(f"{candidate_id}:")
+        for match in candidate_matches or [{"requisition_id": "(no match above threshold)", "score": 0}]:
+            missing = ", ".join(match.get("missing_required_skills", [])) or "-"
+            print(f"  {match['requisition_id']}: {match['score']:.2f}  missing: {missing}")
+    for requisition_id, review in result["reviews"].items():
+        print(f"Reviewed for {requisition_id}: {review['candidates']} resume(s) in {review['model_calls']} model call(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,277 @@
+"""
+Token metering and per-requisition budgets.
+
+Every model call's prompt and completion tokens (from the response's usage metadata) are added to
+running totals in the result store, attributed to the session's requisition and candidate and to the
+agent that made the call, together with an estimated cost from per-million-token prices.
+
+Each requisition has an optional soft and hard budget, in tokens and/or USD (per-requisition values
+set with `set-budget` or PUT /requisitions/{id}/budget, else REQUISITION_{SOFT,HARD}_{TOKENS,USD}):
+- over the soft budget, the workflow degrades to cheaper modes: GitHub reviews are skipped and the
+  verdict is computed from the scores (workflow.rule_based_verdict) instead of by VerdictSynthesizer;
+- over the hard budget, no more model calls are made for the requisition - service jobs pause until
+  the budget is raised, and any other call is answered with a "budget exhausted" message.
+
+The budget checks run before every model call, on the event loop, so they read each requisition's
+limits and running totals from memory rather than the store: both are loaded once, the totals are
+advanced by `record` as calls finish, and `set_budget` drops the entry so the next check reloads it.
+Entries are also reloaded every BUDGET_REFRESH_SECONDS (default 5) to pick up budgets set and tokens spent by other
+processes, e.g. `set-budget` from the command line while the service runs.
+
+    python -m hiring_agent_adk.metering list
+    python -m hiring_agent_adk.metering show req-1234abcd
+    python -m hiring_agent_adk.metering set-budget req-1234abcd --soft-tokens 400000 --hard-usd 5
+"""
+
+import argparse
+import contextlib
+import contextvars
+import json
+import threading
+import time
+
+from . import config
+from .store import get_store
+
+OK, SOFT, HARD = "ok", "soft", "hard"
+UNATTRIBUTED = "-"  # calls made before a session has a requisition (or candidate) id
+
+_pausing = contextvars.ContextVar("hiring_budget_pausing", default=False)
+
+# requisition id -> {"limits", "tokens", "cost_usd", "loaded_at"}; see the module docstring
+_states = {}
+_states_lock = threading.Lock()
+
+# USD per million (input, output) tokens by model family, matched in order against the model name.
+# List prices at the time of writing; set TOKEN_PRICE_INPUT_USD / TOKEN_PRICE_OUTPUT_USD to override.
+_PRICES = (
+    ("flash-lite", (0.10, 0.40)),
+    ("flash", (0.30, 2.50)),
+    ("pro", (1.25, 10.00)),
+)
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised before spending tokens on a requisition that is over its hard budget."""
+
+    def __init__(self, requisition_id: str, usage: dict):
+        super().__init__(f"requisition {requisition_id} is over its hard token budget")
+        self.requisition_id = requisition_id
+        self.usage = usage
+
+
+def prices(model: str = None) -> tuple:
+    """(input, output) USD per million tokens for `model` (default MODEL_NAME)."""
+    model = (model or config.model_name() or "").lower()
+    default = next((price for family, price in _PRICES if family in model), _PRICES[1][1])
+    return (
+        float(config.getenv("TOKEN_PRICE_INPUT_USD", default[0])),
+        float(config.getenv("TOKEN_PRICE_OUTPUT_USD", default[1])),
+    )
+
+
+def cost(prompt_tokens: int, completion_tokens: int, model: str = None) -> float:
+    input_price, output_price = prices(model)
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def _limit(value, name: str):
+    if value is None:
+        value = config.getenv(name)
+    return float(value) if value not in (None, "") else None
+
+
+def budget(requisition_id: str) -> dict:
+    """The effective limits for a requisition (None = unlimited)."""
+    stored = get_store().budget(requisition_id) or {}
+    return {
+        "soft_tokens": _limit(stored.get("soft_tokens"), "REQUISITION_SOFT_TOKENS"),
+        "hard_tokens": _limit(stored.get("hard_tokens"), "REQUISITION_HARD_TOKENS"),
+        "soft_usd": _limit(stored.get("soft_usd"), "REQUISITION_SOFT_USD"),
+        "hard_usd": _limit(stored.get("hard_usd"), "REQUISITION_HARD_USD"),
+    }
+
+
+def set_budget(requisition_id: str, soft_tokens=None, hard_tokens=None, soft_usd=None, hard_usd=None) -> None:
+    """Stores a requisition's limits (None = environment default) and applies them to the next check."""
+    get_store().set_budget(requisition_id, soft_tokens, hard_tokens, soft_usd, hard_usd)
+    with _states_lock:
+        _states.pop(requisition_id, None)
+
+
+def _state(requisition_id: str) -> dict:
+    """The requisition's cached limits and totals, (re)loaded from the store when missing or stale."""
+    now = time.monotonic()
+    with _states_lock:
+        state = _states.get(requisition_id)
+        if state is None or now - state["loaded_at"] >= float(config.getenv("BUDGET_REFRESH_SECONDS", 5)):
+            # under the lock, so a concurrent `record` cannot land between the load and the cache
+            state = {"limits": budget(requisition_id), **get_store().usage_totals(requisition_id), "loaded_at": now}
+            _states[requisition_id] = state
+        return state
+
+
+def _over(totals: dict, limits: dict, kind: str) -> bool:
+    tokens, usd = limits[f"{kind}_tokens"], limits[f"{kind}_usd"]
+    return (tokens is not None and totals["tokens"] >= tokens) or (usd is not None and totals["cost_usd"] >= usd)
+
+
+def level(requisition_id: str) -> str:
+    """OK, SOFT (degrade to cheaper modes) or HARD (no more model calls) for a requisition."""
+    if not requisition_id or requisition_id == UNATTRIBUTED:
+        return OK
+    state = _state(requisition_id)
+    limits = state["limits"]
+    if not any(value is not None for value in limits.values()):
+        return OK
+    if _over(state, limits, "hard"):
+        return HARD
+    if _over(state, limits, "soft"):
+        return SOFT
+    return OK
+
+
+def check(requisition_id: str) -> str:
+    """Returns the budget level, raising BudgetExceeded at HARD."""
+    current = level(requisition_id)
+    if current == HARD:
+        raise BudgetExceeded(requisition_id, usage(requisition_id))
+    return current
+
+
+def record(requisition_id: str, candidate_id: str, agent: str, prompt_tokens: int, completion_tokens: int,
+           model: str = None) -> float:
+    """Adds one model call to the totals and returns its estimated cost in USD."""
+    usd = cost(prompt_tokens, completion_tokens, model)
+    with _states_lock:
+        get_store().add_usage(requisition_id or UNATTRIBUTED, candidate_id or UNATTRIBUTED, agent,
+                              prompt_tokens, completion_tokens, usd)
+        state = _states.get(requisition_id)
+        if state is not None:
+            state["tokens"] += prompt_tokens + completion_tokens
+            state["cost_usd"] += usd
+    return usd
+
+
+def usage(requisition_id: str) -> dict:
+    """Live usage of a requisition: totals, budget level and breakdowns by agent and candidate."""
+    rows = get_store().usage(requisition_id)
+    totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+    by_agent, by_candidate = {}, {}
+    for row in rows:
+        for group, key in ((by_agent, row["agent"]), (by_candidate, row["candidate_id"])):
+            entry = group.setdefault(key, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0})
+            for field in entry:
+                entry[field] += row[field]
+        for field in totals:
+            totals[field] += row[field]
+    for entry in (totals, *by_agent.values(), *by_candidate.values()):
+        entry["total_tokens"] = entry["prompt_tokens"] + entry["completion_tokens"]
+        entry["cost_usd"] = round(entry["cost_usd"], 6)
+    return {
+        "requisition_id": requisition_id,
+        "level": level(requisition_id),
+        "budget": budget(requisition_id),
+        **totals,
+        "by_agent": by_agent,
+        "by_candidate": by_candidate,
+    }
+
+
+def set_budget_command(requisition_id: str) -> str:
+    """The command line that raises a requisition's budget, for messages shown to users."""
+    return f"python -m {__package__ or 'hiring_agent_adk'}.metering set-budget {requisition_id}"
+
+
+# ---------------------------------------------------------------------------
+# ADK model callbacks
+# ---------------------------------------------------------------------------
+
+
+def _exhausted_response(requisition_id: str):
+    from google.adk.models import LlmResponse
+    from google.genai import types
+
+    message = (
+        f"⚠️ Requisition {requisition_id} has used up its token budget, so no further model calls are made "
+        f"for it. Raise its budget ({set_budget_command(requisition_id)}) to continue."
+    )
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=message)]),
+        error_code="BUDGET_EXCEEDED",
+        error_message=f"requisition {requisition_id} is over its hard token budget",
+    )
+
+
+@contextlib.contextmanager
+def pausing():
+    """
+    Within the block, a model call over the hard budget raises BudgetExceeded instead of being
+    answered with the "budget exhausted" message, so a service job pauses mid-stage rather than
+    treating that message as the agent's output.
+    """
+    token = _pausing.set(True)
+    try:
+        yield
+    finally:
+        _pausing.reset(token)
+
+
+def before_model_callback(callback_context, llm_request):
+    """Answers without calling the model once the session's requisition is over its hard budget."""
+    requisition_id = callback_context.state.get("requisition_id")
+    if level(requisition_id) == HARD:
+        if _pausing.get():
+            raise BudgetExceeded(requisition_id, usage(requisition_id))
+        return _exhausted_response(requisition_id)
+    return None
+
+
+def after_model_callback(callback_context, llm_response):
+    """Adds the call's token usage to the session's requisition / candidate / agent totals."""
+    metadata = llm_response.usage_metadata
+    if llm_response.partial or metadata is None:
+        return None
+    state = callback_context.state
+    record(
+        state.get("requisition_id"),
+        state.get("candidate_id"),
+        callback_context.agent_name,
+        metadata.prompt_token_count or 0,
+        (metadata.candidates_token_count or 0) + (metadata.thoughts_token_count or 0),
+        llm_response.model_version,
+    )
+    return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect token usage and set per-requisition budgets.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="usage and budget level of every requisition")
+    show = subparsers.add_parser("show", help="usage of one requisition by agent and candidate (JSON)")
+    show.add_argument("requisition_id")
+    limits = subparsers.add_parser("set-budget", help="set a requisition's limits (omitted = environment default)")
+    limits.add_argument("requisition_id")
+    limits.add_argument("--soft-tokens", type=int)
+    limits.add_argument("--hard-tokens", type=int)
+    limits.add_argument("--soft-usd", type=float)
+    limits.add_argument("--hard-usd", type=float)
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        requisitions = sorted({row["requisition_id"] for row in get_store().usage()})
+        print(f"{'requisition':<20} {'level':<5} {'calls':>6} {'tokens':>10} {'cost USD':>10}")
+        for requisition_id in requisitions:
+            report = usage(requisition_id)
+            print(f"{requisition_id:<20} {report['level']:<5} {report['calls']:>6} "
+                  f"{report['total_tokens']:>10} {report['cost_usd']:>10.4f}")
+    elif args.command == "show":
+        print(json.dumps(usage(args.requisition_id), indent=2))
+    else:
+        set_budget(args.requisition_id, args.soft_tokens, args.hard_tokens, args.soft_usd, args.hard_usd)
+        print(json.dumps(usage(args.requisition_id), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
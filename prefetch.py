@@ -0,0 +1,132 @@
+"""
+Speculative GitHub prefetch.
+
+Every incoming user message is scanned for a GitHub username (github_api.find_username). When one
+is found, the account validation and the user's repository list are fetched in a background
+thread right away, while the resume is still being reviewed. github_validator then picks up the
+warmed result instead of calling the API on the critical path.
+
+Speculative entries live for GITHUB_PREFETCH_TTL_SECONDS (default 300) and are dropped lazily on
+the next prefetch; a job that has not started yet is cancelled when its entry expires.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from . import config, github_api
+
+_MAX_ENTRIES = 256
+
+_executor = None
+_entries = OrderedDict()  # username (lower-case) -> (expires_at, Future)
+_lock = threading.Lock()
+_stats = {"started": 0, "hits": 0, "misses": 0, "expired": 0}
+
+
+def _ttl() -> float:
+    return float(config.getenv("GITHUB_PREFETCH_TTL_SECONDS", 300))
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = int(config.getenv("GITHUB_PREFETCH_WORKERS", 4))
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="github-prefetch")
+    return _executor
+
+
+def _fetch(username: str) -> dict:
+    from .tools_agents import validate_github_user
+
+    result = validate_github_user(username)
+    if result.get("exists"):
+        # Warm the ETag cache for the repository list the reviewer looks at next
+        try:
+            github_api.get(f"/users/{username}/repos", params={"per_page": 100, "sort": "pushed"}, timeout=10)
+        except Exception:
+            pass
+    return result
+
+
+def _expire(now: float):
+    """Drops expired entries from the front of the (insertion = expiry ordered) cache. Caller holds _lock."""
+    while _entries:
+        key, (expires_at, future) = next(iter(_entries.items()))
+        if expires_at > now and len(_entries) <= _MAX_ENTRIES:
+            break
+        future.cancel()
+        del _entries[key]
+        _stats["expired"] += 1
+
+
+def prefetch(username: str) -> bool:
+    """
+    Starts validating `username` in the background unless a fresh lookup is already cached.
+
+    Returns:
+        True if a new background lookup was started
+    """
+    username = github_api.normalize_username(username)
+    if not github_api.is_valid_username(username):
+        return False
+    key = username.lower()
+    now = time.monotonic()
+    with _lock:
+        _expire(now)
+        if key in _entries:
+            return False
+        _entries[key] = (now + _ttl(), _get_executor().submit(_fetch, username))
+        _stats["started"] += 1
+    return True
+
+
+def prefetch_from_text(text: str):
+    """Prefetches the GitHub account mentioned in `text`, if any. Returns the username found."""
+    username = github_api.find_username(text or "")
+    if username:
+        prefetch(username)
+    return username
+
+
+def take(username: str, timeout: float = 15.0):
+    """
+    The prefetched validation for `username`, waiting for it if the lookup is still running.
+
+    Returns:
+        The github_validator result dict, or None when nothing usable was prefetched (not started,
+        expired, failed, or only a transient warning such as a timeout or rate limit)
+    """
+    key = github_api.normalize_username(username).lower()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            _stats["misses"] += 1
+            return None
+    try:
+        result = entry[1].result(timeout=timeout)
+    except Exception:
+        result = None
+    # `exists` is None for transient failures; those are retried live rather than reused
+    if result is None or result.get("exists") is None:
+        with _lock:
+            _stats["misses"] += 1
+        return None
+    with _lock:
+        _stats["hits"] += 1
+    return result
+
+
+def stats() -> dict:
+    with _lock:
+        return {**_stats, "entries": len(_entries)}
+
+
+def before_agent_callback(callback_context):
+    """before_agent_callback for the root agent: prefetches GitHub accounts named in each user message."""
+    content = callback_context.user_content
+    if content and content.parts:
+        prefetch_from_text("".join(part.text for part in content.parts if part.text))
+    return None
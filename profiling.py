@@ -0,0 +1,412 @@
+"""
+Opt-in sampling profiler for the Python side of each evaluation step.
+
+Metering and the scheduler account for model latency; what they cannot show is the time the
+process itself spends around the calls - ADK event handling and history serialization, prompt
+rendering, github_validator parsing, tool wrapping - which grows with transcripts and concurrency.
+
+With profiling on, every agent run, orchestrator tool call, runner and service job is a *step*.
+While any step is open, a background thread samples the stacks of all threads every
+PROFILE_INTERVAL_MS and charges each sample to the innermost open step on that stack (ADK runs each
+agent and each tool call in its own asyncio task, whose outermost coroutine frame marks the step).
+Samples whose innermost frame is waiting on a socket, lock or sleep are counted as blocked rather
+than as Python time. Finished steps are stored with their folded stacks, so profiles from many
+steps, runs and workers can be merged into one flamegraph.
+
+Profiling is off by default. Turn it on for a chat session by creating the session with state
+{"profile": true}, for a screening job with "profile": true in its submission, for batch scoring
+with --profile, or for everything with PROFILING=1.
+
+    python -m hiring_agent_adk.profiling report                          # hot steps and frames, all runs
+    python -m hiring_agent_adk.profiling report --run <session or job id> --folded steps.folded
+    flamegraph.pl steps.folded > steps.svg                               # or load it in speedscope
+"""
+
+import argparse
+import asyncio
+import contextvars
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from . import config
+from .store import get_store
+
+PROFILE = "profile"  # session state key / job parameter that turns profiling on
+BLOCKED = "[blocked]"  # leaf appended to stacks that were waiting rather than running Python
+
+# Innermost frame modules that mean the thread is waiting, not running Python
+_WAIT_MODULES = frozenset({"selectors", "socket", "ssl", "threading", "queue"})
+
+_MAX_OPEN_SECONDS = 900  # steps never closed (the agent raised, a callback short-circuited) are dropped
+_MAX_TRACKED = 1024
+
+_current = contextvars.ContextVar("hiring_profile_step", default=None)
+_lock = threading.Lock()
+_markers = {}  # id(frame) -> (frame, open steps marked by it, innermost last)
+_wake = threading.Event()
+_sampler = None
+_labels = {}  # code object -> "module:function"
+_open = OrderedDict()  # callback key -> step opened by a before_*_callback
+_open_lock = threading.Lock()
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+_STDLIB_DIR = os.path.dirname(os.path.abspath(os.__file__)) + os.sep
+
+
+def interval() -> float:
+    """Seconds between samples."""
+    return float(config.getenv("PROFILE_INTERVAL_MS", 5)) / 1000
+
+
+def enabled(flag=None) -> bool:
+    """Whether a new step is profiled: always inside a profiled step, else `flag`, else PROFILING."""
+    if _current.get() is not None:
+        return True
+    if flag is not None:
+        return bool(flag)
+    return config.getenv("PROFILING", "").lower() in ("1", "true", "yes")
+
+
+class Step:
+    """One profiled step; samples are charged to it while its marker frame is on a thread's stack."""
+
+    def __init__(self, name: str, run_id: str, parent):
+        self.name = name
+        self.parent = parent
+        self.path = f"{parent.path};{name}" if parent else name
+        self.run_id = parent.run_id if parent and parent.run_id else run_id
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.stacks = Counter()
+        self.samples = self.blocked = 0
+        self.sampled_seconds = 0.0
+        self.frame = self.task = self.token = None
+
+    def row(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "step": self.name,
+            "path": self.path,
+            "started_at": self.started_at,
+            "wall_ms": round((time.perf_counter() - self.start) * 1000, 3),
+            "samples": self.samples,
+            "blocked_samples": self.blocked,
+            "interval_ms": round(1000 * (self.sampled_seconds / self.samples if self.samples else interval()), 3),
+            "stacks": dict(self.stacks),
+        }
+
+
+def begin(name: str, frame, run_id: str = None, task=None) -> Step:
+    """
+    Opens a step whose samples are the stacks running inside `frame`. `task` (the asyncio task that
+    owns `frame`, if any) lets the sampler drop the step should it never be closed.
+    """
+    step = Step(name, run_id, _current.get())
+    step.frame, step.task = frame, task
+    with _lock:
+        entry = _markers.get(id(frame))
+        if entry is None or entry[0] is not frame:
+            entry = _markers[id(frame)] = (frame, [])
+        entry[1].append(step)
+        _start_sampler()
+    step.token = _current.set(step)
+    return step
+
+
+def end(step: Step) -> dict:
+    """Closes `step` and stores its profile; returns the stored row."""
+    with _lock:
+        entry = _markers.get(id(step.frame))
+        if entry is not None and step in entry[1]:
+            entry[1].remove(step)
+            if not entry[1]:
+                del _markers[id(step.frame)]
+    try:
+        _current.reset(step.token)
+    except ValueError:  # closed from another context than it was opened in
+        _current.set(step.parent)
+    step.frame = step.task = None
+    row = step.row()
+    get_store().add_step_profile(row)
+    return row
+
+
+class _Block:
+    def __init__(self, name, run_id, enable):
+        self.name, self.run_id, self.enable = name, run_id, enable
+        self.step = None
+
+    def __enter__(self):
+        if enabled(self.enable):
+            try:
+                task = asyncio.current_task()
+            except RuntimeError:
+                task = None
+            self.step = begin(self.name, sys._getframe(1), self.run_id, task)
+        return self.step
+
+    def __exit__(self, *exc):
+        if self.step is not None:
+            end(self.step)
+        return False
+
+
+def step(name: str, run_id: str = None, enable=None):
+    """
+    `with profiling.step("name"):` profiles the calling function from here to the end of the block
+    (including awaits and the calls it makes). A no-op unless enabled(enable).
+    """
+    return _Block(name, run_id, enable)
+
+
+# ---------------------------------------------------------------------------
+# Sampler
+# ---------------------------------------------------------------------------
+
+
+def _start_sampler():
+    global _sampler
+    if _sampler is None or not _sampler.is_alive():
+        _sampler = threading.Thread(target=_sample_loop, name="hiring-profiler", daemon=True)
+        _sampler.start()
+    _wake.set()
+
+
+def _sample_loop():
+    me = threading.get_ident()
+    last = None
+    while True:
+        _wake.wait()
+        time.sleep(interval())
+        with _lock:
+            if not _markers:
+                _wake.clear()
+                last = None
+                continue
+            now = time.perf_counter()
+            gap = min(now - last, 10 * interval()) if last is not None else interval()
+            last = now
+            _expire(now)
+            _sample(me, gap)
+
+
+def _sample(me: int, gap: float):
+    for ident, frame in sys._current_frames().items():
+        if ident != me:
+            _attribute(frame, gap)
+
+
+def _expire(now: float):
+    for key, (frame, steps) in list(_markers.items()):
+        steps[:] = [
+            step for step in steps
+            if not (step.task is not None and step.task.done()) and now - step.start < _MAX_OPEN_SECONDS
+        ]
+        if not steps:
+            del _markers[key]
+
+
+def _attribute(frame, gap: float):
+    """Charges one sample of the stack ending in `frame` to the innermost step marked on it."""
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame.f_code))
+        entry = _markers.get(id(frame))
+        if entry is not None and entry[0] is frame:
+            break
+        frame = frame.f_back
+    else:
+        return  # not inside any step
+    step = entry[1][-1]
+    blocked = labels[0].partition(":")[0] in _WAIT_MODULES
+    stack = ";".join(reversed(labels))
+    step.stacks[f"{stack};{BLOCKED}" if blocked else stack] += 1
+    step.samples += 1
+    step.blocked += blocked
+    step.sampled_seconds += gap
+
+
+def _label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        label = _labels[code] = f"{_module(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+    return label
+
+
+def _module(filename: str) -> str:
+    path = os.path.abspath(filename) if not filename.startswith("<") else filename
+    for root in ("site-packages", "dist-packages"):
+        marker = f"{os.sep}{root}{os.sep}"
+        if marker in path:
+            path = path.split(marker, 1)[1]
+            break
+    else:
+        if path.startswith(_PACKAGE_DIR):
+            path = os.path.join(__package__ or "", path[len(_PACKAGE_DIR):])
+        elif path.startswith(_STDLIB_DIR):
+            path = path[len(_STDLIB_DIR):]
+        else:
+            path = os.path.basename(path)
+    path = path[:-3] if path.endswith(".py") else path
+    path = path[:-len(os.sep + "__init__")] if path.endswith(os.sep + "__init__") else path
+    return path.replace(os.sep, ".")
+
+
+# ---------------------------------------------------------------------------
+# ADK agent and tool callbacks
+# ---------------------------------------------------------------------------
+
+
+def _task_frame():
+    """The running task and its outermost coroutine frame (None, None outside a coroutine task)."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        return None, None
+    frame = getattr(task.get_coro(), "cr_frame", None) if task is not None else None
+    return (task, frame) if frame is not None else (None, None)
+
+
+def _track(key, step: Step):
+    with _open_lock:
+        _open[key] = step
+        while len(_open) > _MAX_TRACKED:
+            _open.popitem(last=False)
+
+
+def _untrack(key):
+    with _open_lock:
+        return _open.pop(key, None)
+
+
+def before_agent_callback(callback_context):
+    """Opens an `agent:<name>` step for the agent's run; root agents turn it on from session state."""
+    if not enabled(callback_context.state.get(PROFILE)):
+        return None
+    task, frame = _task_frame()
+    if frame is not None:
+        step = begin(f"agent:{callback_context.agent_name}", frame, callback_context.session.id, task)
+        _track((callback_context.invocation_id, callback_context.agent_name), step)
+    return None
+
+
+def after_agent_callback(callback_context):
+    step = _untrack((callback_context.invocation_id, callback_context.agent_name))
+    if step is not None:
+        end(step)
+    return None
+
+
+def before_tool_callback(tool, args, tool_context):
+    """Opens a `tool:<name>` step for one tool call (ADK runs each call in its own task)."""
+    if not enabled(tool_context.state.get(PROFILE)):
+        return None
+    task, frame = _task_frame()
+    if frame is not None:
+        step = begin(f"tool:{tool.name}", frame, tool_context.session.id, task)
+        _track((tool_context.invocation_id, tool_context.function_call_id), step)
+    return None
+
+
+def after_tool_callback(tool, args, tool_context, tool_response):
+    step = _untrack((tool_context.invocation_id, tool_context.function_call_id))
+    if step is not None:
+        end(step)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+
+def _percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def report(rows: list, top: int = 15) -> dict:
+    """Per step name: wall time and Python (on-CPU) vs. blocked time; plus the hottest self frames."""
+    by_step, hot = {}, Counter()
+    python_total = 0.0
+    for row in rows:
+        by_step.setdefault(row["step"], []).append(row)
+        for stack, samples in row["stacks"].items():
+            if not stack.endswith(BLOCKED):
+                ms = samples * row["interval_ms"]
+                hot[stack.rpartition(";")[2]] += ms
+                python_total += ms
+    steps = []
+    for name, group in by_step.items():
+        wall = [row["wall_ms"] for row in group]
+        python = [(row["samples"] - row["blocked_samples"]) * row["interval_ms"] for row in group]
+        blocked = [row["blocked_samples"] * row["interval_ms"] for row in group]
+        steps.append({
+            "step": name,
+            "count": len(group),
+            "wall_ms_p50": round(statistics.median(wall), 1),
+            "wall_ms_p95": round(_percentile(wall, 0.95), 1),
+            "python_ms_mean": round(statistics.mean(python), 1),
+            "blocked_ms_mean": round(statistics.mean(blocked), 1),
+            "python_ms_total": round(sum(python), 1),
+        })
+    steps.sort(key=lambda entry: entry["python_ms_total"], reverse=True)
+    return {
+        "runs": len({row["run_id"] for row in rows}),
+        "steps": steps,
+        "python_ms_total": round(python_total, 1),
+        "hot_frames": [
+            {"frame": frame, "self_ms": round(ms, 1), "share": round(ms / python_total, 3)}
+            for frame, ms in hot.most_common(top)
+        ],
+    }
+
+
+def folded(rows: list) -> list:
+    """Merged folded stacks ("step;path;frame;... samples"), the input format of flamegraph.pl and speedscope."""
+    merged = Counter()
+    for row in rows:
+        for stack, samples in row["stacks"].items():
+            merged[f"{row['path']};{stack}"] += samples
+    return [f"{stack} {samples}" for stack, samples in sorted(merged.items())]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Python-side profiles of agent runs, tool calls and jobs.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rep = subparsers.add_parser("report", help="hot steps and frames; optionally write merged folded stacks")
+    rep.add_argument("--run", help="one session or job id (default: all)")
+    rep.add_argument("--since-hours", type=float, help="only steps started in the last N hours")
+    rep.add_argument("--top", type=int, default=15, help="hot frames to list")
+    rep.add_argument("--folded", metavar="PATH", help="write merged folded stacks for a flamegraph")
+    args = parser.parse_args(argv)
+
+    since = time.time() - 3600 * args.since_hours if args.since_hours else None
+    rows = get_store().step_profiles(args.run, since)
+    if not rows:
+        print("No profiled steps recorded yet (enable with PROFILING=1 or a session/job \"profile\" flag).")
+        return 0
+    result = report(rows, args.top)
+    print(f"{len(rows)} steps from {result['runs']} runs, {result['python_ms_total']:.0f} ms of Python time sampled\n")
+    print(f"{'step':<44} {'count':>5} {'wall p50':>9} {'wall p95':>9} {'python':>8} {'blocked':>8}")
+    for entry in result["steps"]:
+        print(f"{entry['step'][:44]:<44} {entry['count']:>5} {entry['wall_ms_p50']:>9.1f} {entry['wall_ms_p95']:>9.1f} "
+              f"{entry['python_ms_mean']:>8.1f} {entry['blocked_ms_mean']:>8.1f}")
+    print("\n(ms per step; python = sampled on-CPU time, blocked = waiting on sockets, locks or sleeps)\n")
+    print(f"{'self ms':>9} {'share':>6}  frame")
+    for entry in result["hot_frames"]:
+        print(f"{entry['self_ms']:>9.1f} {entry['share']:>6.1%}  {entry['frame']}")
+    if args.folded:
+        lines = folded(rows)
+        with open(args.folded, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"\nWrote {len(lines)} folded stacks to {args.folded}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,231 @@
+"""
+Phase-aware instruction assembly.
+
+The orchestrator instruction covers the whole workflow - opening message, example conversation,
+all seven steps - but on any given turn only the part for the current workflow phase matters. The
+instruction texts are split at their headings (and numbered rules) into sections once, each tagged
+with the phases it applies to; per phase, the relevant sections are pre-rendered into one string
+on first use, and the agent's instruction provider just picks the string for the session's phase.
+The status and help sections are only sent on turns where the user asks for them.
+
+GitHubReviewer's built-in scoring criteria are a fallback for calls without a rubric; when its
+input already carries the EVALUATION RUBRIC they are left out.
+
+    python -m hiring_agent_adk.prompts    # estimated instruction tokens per phase vs. the full text
+"""
+
+import argparse
+import re
+from functools import lru_cache
+
+from . import workflow
+
+_BLOCK_RE = re.compile(r"^(## |### |\d+\. \*\*|- For \*\*)", re.M)
+# An item ends at a blank line followed by an unindented paragraph, which belongs to the section
+_ITEM_END_RE = re.compile(r"\n[ \t]*\n(?=\S)")
+NEW_SESSION = "new_session"  # before the workflow engine has recorded any phase
+
+JD, RESUME, GITHUB, VERDICT = workflow.PHASES
+
+# Section (by the start of its first line) -> phases it is sent in; unlisted sections are always sent
+ORCHESTRATOR_PHASES = {
+    "### STEP 1": (NEW_SESSION, JD),
+    "### STEP 2": (NEW_SESSION, JD),
+    "### STEP 3": (RESUME,),
+    "### STEP 4": (RESUME,),
+    "### STEP 5": (GITHUB,),
+    "### STEP 6": (GITHUB, VERDICT),
+    "### STEP 7": (VERDICT,),
+    # Earlier candidates only exist once a verdict was given; the next one starts at the resume step
+    "### UPDATED JOB DESCRIPTION": (RESUME, VERDICT),
+    "6. **rescore_candidates**": (RESUME, VERDICT),
+    # Auto-proceeding on pasted documents only matters until everything is collected
+    "2. **BE PROACTIVE": (NEW_SESSION, JD, RESUME, GITHUB),
+    # Restate rules 2, 3 and 7 or the WORKFLOW ENGINE section (which gives the current phase)
+    "## YOUR ROLE": (),
+    "4. **🧠 Track conversation state": (),
+    "5. **⚡ Move efficiently": (),
+    "## CONVERSATION TONE": (),
+    "## FINAL NOTES": (),
+    "- For **RubricBuilder**": (NEW_SESSION, JD, RESUME, GITHUB, VERDICT),
+    "- For **ResumeReviewer**": (RESUME,),
+    "- For **GitHubValidator**": (GITHUB,),
+    "- For **GitHubReviewer**": (GITHUB,),
+    "- For **VerdictSynthesizer**": (VERDICT,),
+    "- For **rescore_candidates**": (RESUME, VERDICT),
+    # The workflow engine greets and walks through the steps itself; this is for a fresh session only
+    "## OPENING MESSAGE": (NEW_SESSION,),
+    # A walk-through of the steps, which every phase already has the relevant part of
+    "## EXAMPLE CONVERSATION": (),
+}
+
+# Sent in any phase, but only on turns where the user asks for status or help
+ON_REQUEST = ("## STATE TRACKING", "## MID-CONVERSATION HELP")
+_ON_REQUEST_RE = re.compile(r"\b(status|where are we|progress|help|what can you|how does this work)\b", re.I)
+
+# GitHubReviewer: sections dropped when the input already contains the requisition's rubric
+GITHUB_REVIEWER_FALLBACK = ("## SCORING CRITERIA",)
+
+
+def _level(line: str) -> int:
+    if line.startswith("### "):
+        return 3
+    if line.startswith("## "):
+        return 2
+    return 4
+
+
+def split_sections(text: str) -> list:
+    """
+    Splits `text` at `##`/`###` headings and numbered bold rules into (first line, level, text)
+    blocks. A paragraph after a rule or tool item, e.g. a note on all the tools listed, is a block
+    of its own at the item's level, so it is kept whenever its section is.
+    """
+    starts = [match.start() for match in _BLOCK_RE.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts = [0] + starts
+    blocks = []
+    for start, end in zip(starts, starts[1:] + [len(text)]):
+        block = text[start:end]
+        first_line = block.split("\n", 1)[0]
+        level = _level(first_line) if _BLOCK_RE.match(first_line) else 1
+        item_end = _ITEM_END_RE.search(block) if level == 4 else None
+        if item_end:
+            blocks.append((first_line, level, block[:item_end.end()]))
+            block = block[item_end.end():]
+            first_line = block.split("\n", 1)[0]
+        blocks.append((first_line, level, block))
+    return blocks
+
+
+def assemble(blocks: list, keep) -> str:
+    """
+    Joins the blocks `keep(first_line)` accepts, dropping everything nested under a rejected
+    heading. A heading whose own body is empty is kept only if one of its nested blocks is.
+    """
+    kept, dropped_level = [], None
+    for first_line, level, _ in blocks:
+        if dropped_level is not None and level > dropped_level:
+            kept.append(False)
+            continue
+        dropped_level = None
+        kept.append(bool(keep(first_line)))
+        if not kept[-1]:
+            dropped_level = level
+    for i in reversed(range(len(blocks))):
+        first_line, level, block = blocks[i]
+        if kept[i] and not block[len(first_line):].strip():
+            nested = []
+            for j in range(i + 1, len(blocks)):
+                if blocks[j][1] <= level:
+                    break
+                nested.append(kept[j])
+            kept[i] = any(nested) if nested else True
+    return "".join(block for (_, _, block), keep_block in zip(blocks, kept) if keep_block)
+
+
+def _phase_filter(table: dict, phase: str, on_request: bool = False):
+    def keep(first_line):
+        if first_line.startswith(ON_REQUEST):
+            return on_request
+        for prefix, phases in table.items():
+            if first_line.startswith(prefix):
+                return phase in phases
+        return True
+    return keep
+
+
+def _user_text(context) -> str:
+    content = context.user_content
+    return "".join(part.text for part in content.parts if part.text) if content and content.parts else ""
+
+
+@lru_cache(maxsize=None)
+def orchestrator_instruction_for(phase: str, on_request: bool = False) -> str:
+    """
+    The orchestrator instruction for one workflow phase, rendered once per process.
+
+    Args:
+        phase: One of workflow.PHASES, or NEW_SESSION.
+        on_request: Include the status/help sections (the user asked for them this turn).
+    """
+    from .agent import ORCHESTRATOR_INSTRUCTION
+
+    text = assemble(split_sections(ORCHESTRATOR_INSTRUCTION),
+                    _phase_filter(ORCHESTRATOR_PHASES, phase, on_request))
+    # The provider bypasses ADK's {state} templating, so the phase is filled in here
+    return text.replace("{workflow_phase?}", phase if phase in workflow.PHASES else "")
+
+
+def orchestrator_instruction(context) -> str:
+    """Instruction provider for the orchestrator: the pre-rendered text for the session's phase."""
+    phase = context.state.get(workflow.PHASE)
+    return orchestrator_instruction_for(phase if phase in workflow.PHASES else NEW_SESSION,
+                                        bool(_ON_REQUEST_RE.search(_user_text(context))))
+
+
+@lru_cache(maxsize=None)
+def github_reviewer_instruction_for(has_rubric: bool) -> str:
+    from .tools_agents import GITHUB_REVIEWER_INSTRUCTION
+
+    if not has_rubric:
+        return GITHUB_REVIEWER_INSTRUCTION
+    return assemble(
+        split_sections(GITHUB_REVIEWER_INSTRUCTION),
+        lambda first_line: not first_line.startswith(GITHUB_REVIEWER_FALLBACK),
+    )
+
+
+def github_reviewer_instruction(context) -> str:
+    """Instruction provider for GitHubReviewer: skips the fallback criteria when the rubric is in the input."""
+    return github_reviewer_instruction_for("## EVALUATION RUBRIC" in _user_text(context))
+
+
+def prerender():
+    """Renders every variant up front (called when the agents are built)."""
+    for phase in (NEW_SESSION, *workflow.PHASES):
+        orchestrator_instruction_for(phase, False)
+        orchestrator_instruction_for(phase, True)
+    github_reviewer_instruction_for(True)
+    github_reviewer_instruction_for(False)
+
+
+def count_tokens(text: str, exact: bool = False) -> int:
+    """Estimated tokens (~4 characters each), or the model's own count with `exact` (needs an API key)."""
+    if not exact:
+        from .batch_scoring import estimate_tokens
+
+        return estimate_tokens(text)
+    from google import genai
+
+    from . import config
+
+    return genai.Client().models.count_tokens(model=config.model_name(), contents=text).total_tokens
+
+
+def report(exact: bool = False) -> list:
+    """(label, tokens, full-text tokens) for every phase-specific instruction variant."""
+    from .agent import ORCHESTRATOR_INSTRUCTION
+    from .tools_agents import GITHUB_REVIEWER_INSTRUCTION
+
+    full = count_tokens(ORCHESTRATOR_INSTRUCTION, exact)
+    rows = [(f"orchestrator / {phase}", count_tokens(orchestrator_instruction_for(phase, False), exact), full)
+            for phase in (NEW_SESSION, *workflow.PHASES)]
+    rows.append(("GitHubReviewer / rubric in input", count_tokens(github_reviewer_instruction_for(True), exact),
+                 count_tokens(GITHUB_REVIEWER_INSTRUCTION, exact)))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report instruction tokens per workflow phase.")
+    parser.add_argument("--exact", action="store_true", help="count with the Gemini API instead of estimating")
+    args = parser.parse_args(argv)
+
+    print(f"{'instruction':<46} {'tokens':>7} {'full':>7} {'saved':>6}")
+    for label, tokens, full in report(exact=args.exact):
+        print(f"{label:<46} {tokens:>7} {full:>7} {1 - tokens / full:>6.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
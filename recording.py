@@ -0,0 +1,146 @@
+"""
+Callbacks that record agent and tool outputs in the result store as structured rows.
+
+Requisition and candidate ids live in session state ("requisition_id", "candidate_id"), so every
+artifact produced for the same candidate in a session lands under the same keys.
+"""
+
+import hashlib
+import re
+import uuid
+
+from . import jd_index, rubrics
+from .store import get_store
+
+# Agent name -> evaluation stage its output is recorded under
+AGENT_STAGES = {"ResumeReviewer": "resume", "GitHubReviewer": "github"}
+
+# State key for a candidate id assigned outside the agents (see ats_sync.py)
+EXTERNAL_CANDIDATE_ID = "external_candidate_id"
+
+_VERDICT_RE = re.compile(r"(?<![A-Z])(NO HIRE|HIRE)\b")
+_CONFIDENCE_RE = re.compile(r"CONFIDENCE LEVEL:\**\s*(High|Medium|Low)", re.I)
+_COMPOSITE_RE = re.compile(r"COMPOSITE SCORE:\**\s*(\d+(?:\.\d+)?)", re.I)
+
+
+def _response_text(llm_response) -> str:
+    content = llm_response.content
+    if llm_response.partial or not content or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if part.text and not part.thought)
+
+
+def _user_text(callback_context) -> str:
+    content = callback_context.user_content
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if part.text)
+
+
+def requisition_id_for(state) -> str:
+    """The session's requisition id, assigning a new one on first use."""
+    requisition_id = state.get("requisition_id")
+    if not requisition_id:
+        requisition_id = f"req-{uuid.uuid4().hex[:10]}"
+        state["requisition_id"] = requisition_id
+    return requisition_id
+
+
+def candidate_id_for(name: str, input_text: str) -> str:
+    if name:
+        slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+        if slug:
+            return slug
+    return "cand-" + hashlib.sha1(input_text.encode("utf-8")).hexdigest()[:12]
+
+
+def record_rubric(callback_context, llm_response):
+    """after_model_callback for RubricBuilder: stores each generated rubric as a new version."""
+    text = _response_text(llm_response)
+    if not rubrics.parse_rubric(text):
+        return None
+    state = callback_context.state
+    requisition_id = requisition_id_for(state)
+    state["rubric_version"] = get_store().add_rubric(requisition_id, text)
+    job_description = _user_text(callback_context)
+    if job_description:
+        # Lets later near-identical JDs reuse this rubric
+        jd_index.index_jd(requisition_id, state["rubric_version"], job_description)
+    return None
+
+
+def record_evaluation(callback_context, llm_response):
+    """after_model_callback for ResumeReviewer/GitHubReviewer: stores per-criterion scores."""
+    stage = AGENT_STAGES.get(callback_context.agent_name)
+    text = _response_text(llm_response)
+    parsed = rubrics.parse_evaluation(text, stage) if stage else None
+    if not parsed or not parsed["criteria"]:
+        return None
+
+    state = callback_context.state
+    input_text = _user_text(callback_context)
+    if stage == "resume" or not state.get("candidate_id"):
+        # An id the caller already knows the candidate by (e.g. from the ATS) wins over the derived one
+        state["candidate_id"] = state.get(EXTERNAL_CANDIDATE_ID) or candidate_id_for(parsed["candidate_name"], input_text)
+    get_store().put_evaluation(
+        requisition_id_for(state),
+        state["candidate_id"],
+        stage,
+        criteria=parsed["criteria"],
+        total=parsed["total"],
+        max_total=parsed["max_total"],
+        rubric_version=state.get("rubric_version"),
+        candidate_name=parsed["candidate_name"],
+        input_text=input_text,
+        markdown=text,
+    )
+    return None
+
+
+def record_validation(tool, args, tool_context, tool_response):
+    """after_tool_callback for the orchestrator: stores github_validator results."""
+    if tool.name != "github_validator" or not isinstance(tool_response, dict):
+        return None
+    store_validation(tool_context.state, tool_response)
+    return None
+
+
+def store_validation(state, result: dict):
+    """Stores a github_validator result for the session's current candidate."""
+    candidate_id = state.get("candidate_id") or f"gh-{result.get('username', '').lower()}"
+    get_store().put_validation(requisition_id_for(state), candidate_id, result)
+
+
+def parse_verdict(text: str) -> dict:
+    """Pulls the decision, confidence and composite score out of a VerdictSynthesizer report."""
+    decision = text.split("## DECISION", 1)[-1]
+    # The template lists "🔴 NO HIRE  /  🟢 HIRE"; a real verdict names only one of them
+    verdicts = set(_VERDICT_RE.findall(decision.split("CONFIDENCE LEVEL", 1)[0]))
+    confidence = _CONFIDENCE_RE.search(text)
+    composite = _COMPOSITE_RE.search(text)
+    return {
+        "verdict": verdicts.pop() if len(verdicts) == 1 else None,
+        "confidence": confidence.group(1).capitalize() if confidence else None,
+        "composite_score": float(composite.group(1)) if composite else None,
+    }
+
+
+def store_verdict(state, text: str):
+    """Stores a verdict produced without VerdictSynthesizer (e.g. workflow.rule_based_verdict)."""
+    parsed = parse_verdict(text)
+    if parsed["verdict"]:
+        candidate_id = state.get("candidate_id") or candidate_id_for(rubrics.parse_evaluation(text)["candidate_name"], text)
+        get_store().put_verdict(requisition_id_for(state), candidate_id, **parsed)
+
+
+def record_verdict(callback_context, llm_response):
+    """after_model_callback for VerdictSynthesizer: stores the decision for analytics."""
+    text = _response_text(llm_response)
+    parsed = parse_verdict(text) if text else None
+    if not parsed or not parsed["verdict"]:
+        return None
+    state = callback_context.state
+    name = rubrics.parse_evaluation(text)["candidate_name"]
+    candidate_id = state.get("candidate_id") or candidate_id_for(name, _user_text(callback_context))
+    get_store().put_verdict(requisition_id_for(state), candidate_id, **parsed)
+    return None
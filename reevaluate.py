@@ -0,0 +1,170 @@
+"""
+Incremental re-evaluation after a requisition's rubric changes.
+
+RubricBuilder, ResumeReviewer and GitHubReviewer outputs are recorded in the result store (see
+recording.py). When the JD is tweaked and a new rubric is generated, `rescore_requisition`
+diffs the old and new rubrics and asks CriterionRescorer to re-score only the criteria that
+changed; every other criterion score is kept as-is, then totals and rankings are recomputed.
+"""
+
+import argparse
+import asyncio
+
+from . import config, rubrics, scheduler
+from .store import get_store
+
+
+# ---------------------------------------------------------------------------
+# Re-scoring
+# ---------------------------------------------------------------------------
+
+def _rescore_message(criteria_keys, rubric, input_text) -> str:
+    sections = "\n\n".join(rubric[key]["text"] for key in criteria_keys)
+    return (
+        "## CRITERIA TO RE-SCORE\n\n"
+        f"{sections}\n\n"
+        "## CANDIDATE MATERIAL (as originally evaluated)\n\n"
+        f"{input_text}"
+    )
+
+
+async def _rescore_one(evaluation, criteria_keys, rubric, semaphore) -> dict:
+    from .runtime import run_agent_async
+
+    async with semaphore:
+        text = await run_agent_async(
+            "criterion_rescorer", _rescore_message(criteria_keys, rubric, evaluation["input_text"] or ""),
+            # Attributes the call's tokens to the candidate (see metering.py)
+            state={"requisition_id": evaluation["requisition_id"], "candidate_id": evaluation["candidate_id"]},
+        )
+    return rubrics.parse_evaluation(text, evaluation["stage"])["criteria"]
+
+
+async def _noop() -> dict:
+    return {}
+
+
+async def rescore_requisition(requisition_id: str, *, rubric_version: int = None, concurrency: int = None) -> dict:
+    """
+    Brings every stored evaluation of a requisition up to date with its latest (or given) rubric.
+
+    Args:
+        requisition_id: Requisition whose candidates should be re-scored
+        rubric_version: Target rubric version (default: latest)
+        concurrency: Max parallel CriterionRescorer calls (default: RESCORE_CONCURRENCY or 8)
+
+    Returns:
+        dict with the changed criteria, per-candidate old/new totals, the number of model calls made
+        versus a full re-run, and the updated rankings
+    """
+    store = get_store()
+    target = store.rubric(requisition_id, rubric_version)
+    if target is None:
+        return {"status": "FAILED", "error": f"No rubric recorded for requisition {requisition_id}"}
+    version, markdown = target
+    new_rubric = rubrics.parse_rubric(markdown)
+
+    diffs = {}
+    jobs = []
+    criteria_total = 0
+    for evaluation in store.evaluations(requisition_id):
+        if evaluation["rubric_version"] == version:
+            continue
+        old_version = evaluation["rubric_version"]
+        if old_version not in diffs:
+            old = store.rubric(requisition_id, old_version) if old_version else None
+            diffs[old_version] = rubrics.diff_rubrics(rubrics.parse_rubric(old[1]), new_rubric) if old else None
+        diff = diffs[old_version]
+
+        level = rubrics.STAGE_LEVELS[evaluation["stage"]]
+        stage_keys = [key for key, criterion in new_rubric.items() if criterion["level"] == level]
+        if diff is None:
+            # No baseline rubric to compare against - every criterion of the stage must be re-scored
+            to_rescore = stage_keys
+        else:
+            to_rescore = [key for key in stage_keys if key in diff["changed"] or key in diff["added"]]
+        jobs.append((evaluation, to_rescore))
+        criteria_total += len(stage_keys)
+
+    semaphore = asyncio.Semaphore(concurrency or int(config.getenv("RESCORE_CONCURRENCY", 8)))
+    rescored = await asyncio.gather(*(
+        _rescore_one(evaluation, keys, new_rubric, semaphore) if keys and evaluation["input_text"] else _noop()
+        for evaluation, keys in jobs
+    ))
+
+    updated = []
+    for (evaluation, keys), new_scores in zip(jobs, rescored):
+        scores = {key: value for key, value in evaluation["criteria"].items() if key in new_rubric}
+        missing = [key for key in keys if key not in new_scores]
+        scores.update({key: new_scores[key] for key in keys if key in new_scores})
+        total, max_total = rubrics.total_for(scores, new_rubric, evaluation["stage"])
+        store.put_evaluation(
+            requisition_id, evaluation["candidate_id"], evaluation["stage"],
+            criteria=scores, total=total, max_total=max_total, rubric_version=version,
+        )
+        updated.append({
+            "candidate_id": evaluation["candidate_id"],
+            "candidate_name": evaluation["candidate_name"],
+            "stage": evaluation["stage"],
+            "rescored_criteria": [new_rubric[key]["title"] for key in keys if key in new_scores],
+            "kept_previous_score": [new_rubric[key]["title"] for key in missing],
+            "old_total": f"{evaluation['total']:g}/{evaluation['max_total']:g}",
+            "new_total": f"{total:g}/{max_total:g}",
+        })
+
+    changed = sorted({key for diff in diffs.values() if diff for key in diff["changed"] + diff["added"]})
+    return {
+        "status": "PASSED",
+        "requisition_id": requisition_id,
+        "rubric_version": version,
+        "changed_criteria": [new_rubric[key]["title"] for key in changed],
+        "model_calls": sum(1 for _, keys in jobs if keys),
+        "full_rerun_model_calls": len(jobs),
+        "criteria_rescored": sum(len(keys) for _, keys in jobs),
+        "criteria_total": criteria_total,
+        "updated": updated,
+        "rankings": store.rankings(requisition_id),
+    }
+
+
+async def rescore_candidates(tool_context) -> dict:
+    """
+    Re-scores every previously evaluated candidate against the newest rubric, re-running only the
+    criteria that the rubric change affected. Call this after RubricBuilder regenerated the rubric
+    for an updated job description.
+
+    Returns:
+        dict with the changed criteria, old/new totals per candidate and updated rankings
+    """
+    requisition_id = tool_context.state.get("requisition_id")
+    if not requisition_id:
+        return {"status": "FAILED", "error": "No rubric has been generated in this session yet."}
+    return await rescore_requisition(requisition_id)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Re-score a requisition's candidates after a rubric change.")
+    parser.add_argument("requisition_id")
+    parser.add_argument("--rubric-file", help="record this Markdown rubric as the new version first")
+    args = parser.parse_args(argv)
+
+    if args.rubric_file:
+        with open(args.rubric_file, encoding="utf-8") as f:
+            get_store().add_rubric(args.requisition_id, f.read())
+    # Bulk re-scoring yields to interactive sessions (the orchestrator's rescore tool stays interactive)
+    with scheduler.priority(scheduler.BATCH):
+        result = asyncio.run(rescore_requisition(args.requisition_id))
+    if result["status"] != "PASSED":
+        print(result["error"])
+        return 1
+    print(f"Changed criteria: {', '.join(result['changed_criteria']) or 'none'}")
+    print(f"Model calls: {result['model_calls']} (full re-run: {result['full_rerun_model_calls']}), "
+          f"criteria re-scored: {result['criteria_rescored']}/{result['criteria_total']}")
+    for entry in result["rankings"]:
+        print(f"{entry['rank']:>3}. {entry['candidate_name'] or entry['candidate_id']}: "
+              f"resume {entry['resume_score']}, github {entry['github_score']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
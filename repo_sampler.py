@@ -0,0 +1,357 @@
+"""
+Bounded-byte sampling of a candidate's repositories, as tech-stack evidence for GitHubReviewer.
+
+Instead of cloning, `sample(username)` picks the candidate's top REPO_SAMPLE_COUNT original
+(non-fork) repositories by stars and recency, lists each root directory through the contents API
+and fetches only the files that reveal a stack: dependency manifests (requirements.txt,
+package.json, go.mod, ...), Dockerfiles, CI configs and the head of the README. File bodies are
+requested raw and streamed (gzip transfer encoding is decompressed on the fly), and reading stops
+at a hard per-candidate budget of REPO_SAMPLE_BYTES of repository content, so one huge manifest
+cannot blow it.
+
+The detected languages, frameworks and tooling are summarized in a compact fact sheet:
+
+    python -m hiring_agent_adk.repo_sampler octocat
+"""
+
+import argparse
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import config, github_api, scheduler
+
+# Root files worth reading, by the language or tool they indicate
+MANIFESTS = {
+    "requirements.txt": "Python",
+    "pyproject.toml": "Python",
+    "setup.py": "Python",
+    "Pipfile": "Python",
+    "package.json": "JavaScript",
+    "go.mod": "Go",
+    "Cargo.toml": "Rust",
+    "pom.xml": "Java",
+    "build.gradle": "Java",
+    "build.gradle.kts": "Kotlin",
+    "Gemfile": "Ruby",
+    "composer.json": "PHP",
+    "mix.exs": "Elixir",
+    "Dockerfile": None,
+    "docker-compose.yml": None,
+    "docker-compose.yaml": None,
+    ".gitlab-ci.yml": None,
+    "Jenkinsfile": None,
+}
+# Root files/directories whose mere presence is evidence
+PRESENCE_SIGNALS = {
+    "Dockerfile": "Docker",
+    "docker-compose.yml": "Docker Compose",
+    "docker-compose.yaml": "Docker Compose",
+    ".github": "GitHub Actions",
+    ".gitlab-ci.yml": "GitLab CI",
+    ".circleci": "CircleCI",
+    "Jenkinsfile": "Jenkins",
+    "Makefile": "Make",
+    "tests": "Tests",
+    "test": "Tests",
+    "__tests__": "Tests",
+    "terraform": "Terraform",
+    "k8s": "Kubernetes",
+    "helm": "Helm",
+}
+# Dependency name (as it appears in a manifest) -> (kind, label)
+DEPENDENCIES = {
+    "django": ("framework", "Django"), "flask": ("framework", "Flask"), "fastapi": ("framework", "FastAPI"),
+    "celery": ("framework", "Celery"), "sqlalchemy": ("framework", "SQLAlchemy"), "pandas": ("framework", "pandas"),
+    "numpy": ("framework", "NumPy"), "torch": ("framework", "PyTorch"), "tensorflow": ("framework", "TensorFlow"),
+    "scikit-learn": ("framework", "scikit-learn"), "pydantic": ("framework", "Pydantic"),
+    "pytest": ("tooling", "pytest"), "mypy": ("tooling", "mypy"), "ruff": ("tooling", "Ruff"), "black": ("tooling", "Black"),
+    "react": ("framework", "React"), "next": ("framework", "Next.js"), "vue": ("framework", "Vue"),
+    "@angular/core": ("framework", "Angular"), "svelte": ("framework", "Svelte"), "express": ("framework", "Express"),
+    "@nestjs/core": ("framework", "NestJS"), "graphql": ("framework", "GraphQL"), "typescript": ("language", "TypeScript"),
+    "jest": ("tooling", "Jest"), "vitest": ("tooling", "Vitest"), "eslint": ("tooling", "ESLint"),
+    "webpack": ("tooling", "webpack"), "vite": ("tooling", "Vite"), "prettier": ("tooling", "Prettier"),
+    "github.com/gin-gonic/gin": ("framework", "Gin"), "github.com/labstack/echo/v4": ("framework", "Echo"),
+    "github.com/gofiber/fiber/v2": ("framework", "Fiber"), "google.golang.org/grpc": ("framework", "gRPC"),
+    "github.com/spf13/cobra": ("framework", "Cobra"),
+    "tokio": ("framework", "Tokio"), "actix-web": ("framework", "Actix Web"), "axum": ("framework", "Axum"),
+    "serde": ("framework", "Serde"),
+    "spring-boot-starter": ("framework", "Spring Boot"), "spring-boot-starter-web": ("framework", "Spring Boot"),
+    "junit": ("tooling", "JUnit"), "junit-jupiter": ("tooling", "JUnit"),
+    "rails": ("framework", "Rails"), "rspec": ("tooling", "RSpec"),
+    "laravel/framework": ("framework", "Laravel"), "symfony/framework-bundle": ("framework", "Symfony"),
+    "phoenix": ("framework", "Phoenix"),
+    "postgres": ("tooling", "PostgreSQL"), "redis": ("tooling", "Redis"), "kafka": ("tooling", "Kafka"),
+    "mongo": ("tooling", "MongoDB"), "mysql": ("tooling", "MySQL"),
+}
+# FROM images in Dockerfiles -> language
+_BASE_IMAGES = {"python": "Python", "node": "JavaScript", "golang": "Go", "rust": "Rust", "openjdk": "Java",
+                "eclipse-temurin": "Java", "ruby": "Ruby", "php": "PHP", "elixir": "Elixir"}
+
+_TOKEN_RE = re.compile(r"[a-z0-9@][a-z0-9_.@/-]*")
+_FROM_RE = re.compile(r"^\s*FROM\s+(?:--platform=\S+\s+)?([\w./-]+)", re.I | re.M)
+_RAW = {"Accept": "application/vnd.github.raw"}
+
+
+class ByteBudget:
+    """Hard cap on the bytes read for one candidate, shared by the threads sampling its repos."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.used)
+
+    def take(self, size: int) -> int:
+        """Claims up to `size` bytes of the budget; returns how many were granted."""
+        with self._lock:
+            granted = min(size, self.remaining)
+            self.used += granted
+            return granted
+
+    def read(self, response, cap: int = None):
+        """
+        Streams a response body until it ends, `cap` bytes, or the budget runs out.
+
+        Returns:
+            (bytes read, whether the body was cut short)
+        """
+        chunks, size, truncated = [], 0, False
+        try:
+            for chunk in response.iter_content(chunk_size=8192):
+                wanted = len(chunk) if cap is None else min(len(chunk), cap - size)
+                granted = self.take(wanted)
+                chunks.append(chunk[:granted])
+                size += granted
+                if granted < len(chunk):
+                    truncated = True
+                    break
+        finally:
+            response.close()
+        return b"".join(chunks), truncated
+
+
+def _get(path: str, budget: ByteBudget, cap: int = None, raw: bool = False):
+    """Budgeted GET; returns (body, truncated) or (None, False) when unavailable or over budget."""
+    if budget.remaining <= 0:
+        return None, False
+    response = github_api.get(path, timeout=10, extra_headers=_RAW if raw else None, stream=True)
+    if response.status_code != 200:
+        response.close()
+        return None, False
+    return budget.read(response, cap)
+
+
+def _json(path: str, budget: ByteBudget):
+    body, truncated = _get(path, budget)
+    if body is None or truncated:
+        return None
+    return json.loads(body)
+
+
+def select_repositories(repos: list, count: int) -> list:
+    """The `count` original (non-fork, non-archived) repositories with the most stars, then most recently pushed."""
+    originals = [repo for repo in repos if not repo.get("fork") and not repo.get("archived")]
+    originals.sort(key=lambda repo: repo.get("pushed_at") or "", reverse=True)
+    originals.sort(key=lambda repo: repo.get("stargazers_count") or 0, reverse=True)
+    return originals[:count]
+
+
+def detect(files: dict) -> dict:
+    """
+    Languages, frameworks and tooling evidenced by one repository's sampled files.
+
+    Args:
+        files: root file/directory name -> file text (None for entries listed but not read)
+
+    Returns:
+        dict of sets: languages, frameworks, tooling
+    """
+    found = {"languages": set(), "frameworks": set(), "tooling": set()}
+    for name, text in files.items():
+        if name in PRESENCE_SIGNALS:
+            found["tooling"].add(PRESENCE_SIGNALS[name])
+        if MANIFESTS.get(name):
+            found["languages"].add(MANIFESTS[name])
+        if not text or name.lower().startswith("readme"):
+            continue
+        if name == "Dockerfile":
+            for image in _FROM_RE.findall(text):
+                language = _BASE_IMAGES.get(image.split("/")[-1].split(":")[0].lower())
+                if language:
+                    found["languages"].add(language)
+        for token in set(_TOKEN_RE.findall(text.lower())):
+            kind, label = DEPENDENCIES.get(token.rstrip(".,"), (None, None))
+            if kind == "language":
+                found["languages"].add(label)
+            elif kind:
+                found[f"{kind}s" if kind == "framework" else kind].add(label)
+    return found
+
+
+def _sample_repository(repo: dict, budget: ByteBudget, manifest_bytes: int, readme_bytes: int):
+    full_name = repo["full_name"]
+    listing = _json(f"/repos/{full_name}/contents", budget)
+    if listing is None:
+        return None
+    names = {entry["name"]: entry.get("type") for entry in listing if isinstance(entry, dict)}
+    files = {name: None for name in names}
+    readme = next((name for name in names if name.lower().startswith("readme")), None)
+
+    wanted = [name for name in names if name in MANIFESTS]
+    if ".github" in names:
+        workflows = _json(f"/repos/{full_name}/contents/.github/workflows", budget) or []
+        wanted += [f".github/workflows/{entry['name']}" for entry in workflows[:2] if isinstance(entry, dict)]
+    for name in wanted:
+        body, _ = _get(f"/repos/{full_name}/contents/{name}", budget, cap=manifest_bytes, raw=True)
+        if body is not None:
+            files[name] = body.decode("utf-8", "replace")
+    readme_head = ""
+    if readme:
+        body, _ = _get(f"/repos/{full_name}/contents/{readme}", budget, cap=readme_bytes, raw=True)
+        readme_head = body.decode("utf-8", "replace") if body is not None else ""
+
+    found = detect(files)
+    if repo.get("language"):
+        found["languages"].add(repo["language"])
+    return {
+        "name": repo["name"],
+        "stars": repo.get("stargazers_count") or 0,
+        "pushed_at": (repo.get("pushed_at") or "")[:10],
+        "files_read": sorted(name for name, text in files.items() if text is not None),
+        "readme_head": _first_line(readme_head),
+        **{kind: sorted(values) for kind, values in found.items()},
+    }
+
+
+def _first_line(readme: str) -> str:
+    # The first prose line; the title usually just repeats the repo name
+    for line in readme.splitlines():
+        line = line.strip()
+        if line and not line.startswith(("#", "[!", "![", "<", "=", "-")):
+            return line[:120]
+    return ""
+
+
+def _tally(repos: list, kind: str) -> dict:
+    counts = {}
+    for repo in repos:
+        for label in repo[kind]:
+            counts[label] = counts.get(label, 0) + 1
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+def fact_sheet(result: dict) -> str:
+    """Compact Markdown summary of a sample() result, for the reviewer's input."""
+    def line(counts):
+        return ", ".join(f"{label} ({count})" for label, count in counts.items()) or "none found"
+
+    lines = [
+        f"Sampled {len(result['repos'])} original repositories of {result['username']} "
+        f"({result['bytes_read']:,} of {result['byte_budget']:,} bytes read)",
+        f"- Languages: {line(result['languages'])}",
+        f"- Frameworks/libraries: {line(result['frameworks'])}",
+        f"- Tooling: {line(result['tooling'])}",
+    ]
+    for repo in result["repos"]:
+        files = ", ".join(repo["files_read"]) or "no manifests"
+        readme = f' - "{repo["readme_head"]}"' if repo["readme_head"] else ""
+        lines.append(f"  * {repo['name']} (★{repo['stars']}, pushed {repo['pushed_at'] or '?'}): {files}{readme}")
+    return "\n".join(lines)
+
+
+def sample(username: str, count: int = None, byte_budget: int = None) -> dict:
+    """
+    Samples a candidate's top original repositories within a byte budget.
+
+    Args:
+        username: GitHub username (URL or @handle accepted)
+        count: Repositories to sample (default REPO_SAMPLE_COUNT or 5)
+        byte_budget: Max bytes read for this candidate (default REPO_SAMPLE_BYTES or 262144)
+
+    Returns:
+        dict with status, per-repo findings, language/framework/tooling tallies and the fact sheet
+    """
+    username = github_api.normalize_username(username)
+    count = count or int(config.getenv("REPO_SAMPLE_COUNT", 5))
+    budget = ByteBudget(byte_budget or int(config.getenv("REPO_SAMPLE_BYTES", 256 * 1024)))
+    manifest_bytes = int(config.getenv("REPO_SAMPLE_FILE_BYTES", 32 * 1024))
+    readme_bytes = int(config.getenv("REPO_SAMPLE_README_BYTES", 2 * 1024))
+
+    # Same query as the prefetcher's, so it is usually answered from the ETag cache. The listing is
+    # metadata (~5 KB per repo on github.com), not repository content, so it is not charged to the
+    # byte budget - otherwise a candidate with ~50 repos would exhaust it before any manifest
+    response = github_api.get(f"/users/{username}/repos", params={"per_page": 100, "sort": "pushed"}, timeout=10)
+    if response.status_code != 200:
+        return {"status": "WARNING", "username": username, "error": f"GitHub API error: {response.status_code}"}
+
+    selected = select_repositories(response.json(), count)
+    # Pool threads don't inherit the caller's context, so its scheduling class is passed along
+    cls, team = scheduler.current()
+
+    def sample_one(repo):
+        with scheduler.priority(cls, team):
+            return _sample_repository(repo, budget, manifest_bytes, readme_bytes)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(selected))) as pool:
+        sampled = list(pool.map(sample_one, selected))
+    # A repo whose listing did not fit in the budget contributes nothing
+    repos = [repo for repo in sampled if repo is not None]
+
+    result = {
+        "status": "PASSED" if repos else "WARNING",
+        "username": username,
+        "repos": repos,
+        "languages": _tally(repos, "languages"),
+        "frameworks": _tally(repos, "frameworks"),
+        "tooling": _tally(repos, "tooling"),
+        "bytes_read": budget.used,
+        "byte_budget": budget.limit,
+    }
+    result["fact_sheet"] = fact_sheet(result)
+    return result
+
+
+def sample_repositories(username: str) -> dict:
+    """
+    Reads dependency manifests, Dockerfiles, CI configs and README heads from the candidate's top
+    original GitHub repositories and summarizes the languages, frameworks and tooling they show.
+
+    Args:
+        username: GitHub username (can be URL, @username, or plain username)
+
+    Returns:
+        dict with status and a "fact_sheet" summary of the repository evidence
+    """
+    import requests
+
+    from .backpressure import BackendUnavailable
+
+    try:
+        result = sample(username)
+    except BackendUnavailable as e:
+        return {"status": "WARNING", "username": username, "error": f"GitHub API temporarily unavailable ({e.reason})"}
+    except requests.exceptions.RequestException as e:
+        return {"status": "WARNING", "username": username, "error": f"GitHub request failed: {e}"}
+    return {key: result[key] for key in ("status", "username", "error", "fact_sheet") if key in result}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Sample a GitHub user's repositories for tech-stack evidence.")
+    parser.add_argument("username")
+    parser.add_argument("--count", type=int)
+    parser.add_argument("--bytes", type=int, help="per-candidate byte budget")
+    parser.add_argument("--json", action="store_true", help="print the full result as JSON")
+    args = parser.parse_args(argv)
+
+    result = sample(args.username, count=args.count, byte_budget=args.bytes)
+    print(json.dumps(result, indent=2) if args.json else result.get("fact_sheet") or result.get("error"))
+    return 0 if result["status"] == "PASSED" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
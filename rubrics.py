@@ -0,0 +1,180 @@
+"""
+Structured view of the Markdown produced by RubricBuilder, ResumeReviewer and GitHubReviewer.
+
+The agents are instructed to emit fixed headings, e.g.
+    **1. Technical Skills Match (4 points)**          (rubric)
+    **1. Technical Skills Match: 3/4 points**          (evaluation)
+so criteria and scores can be recovered without another model call. Criteria are keyed by level
+and title ("L1.technical_skills_match"), which is stable across rubric regenerations.
+"""
+
+import re
+
+# Rubric level -> evaluation stage it is scored in
+LEVEL_STAGES = {1: "resume", 2: "github"}
+STAGE_LEVELS = {stage: level for level, stage in LEVEL_STAGES.items()}
+
+_LEVEL_RE = re.compile(r"^\s*#{1,4}\s*LEVEL\s*(\d+)\b", re.I)
+_HEADING_RE = re.compile(r"^\s*#{1,4}\s+\S")
+_RUBRIC_CRITERION_RE = re.compile(
+    r"^\s*(?:#{1,4}\s*)?\**\s*(\d+)\.\s*(.+?)\s*\(\s*(\d+(?:\.\d+)?)\s*points?\s*\)\s*\**\s*:?\s*$", re.I
+)
+_EVAL_CRITERION_RE = re.compile(
+    r"^\s*(?:#{1,4}\s*)?\**\s*(\d+)\.\s*(.+?)\s*:\s*\**\s*(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)\s*points?\s*\**\s*$",
+    re.I,
+)
+# Bold all-caps section labels (**KEY STRENGTHS:**) and horizontal rules end a criterion block
+_SECTION_END_RE = re.compile(r"^\s*(?:\*\*[A-Z][A-Z /&()-]+:?\*\*|---+)\s*$")
+_TOTAL_RE = re.compile(r"(?:OVERALL\s+)?SCORE:\**\s*(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)", re.I)
+_CANDIDATE_RE = re.compile(r"\*\*CANDIDATE:\*\*\s*(.+)")
+
+
+def criterion_key(level: int, title: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "_", title.lower().replace("&", "and")).strip("_")
+    return f"L{level}.{slug}"
+
+
+def parse_rubric(markdown: str) -> dict:
+    """
+    Splits a rubric into its scored criteria.
+
+    Returns:
+        dict of criterion key -> {"level", "number", "title", "max_points", "text"}, in rubric order.
+        "text" holds the criterion heading and its scoring guide.
+    """
+    criteria = {}
+    level = None
+    current = None
+    for line in (markdown or "").splitlines():
+        level_match = _LEVEL_RE.match(line)
+        if level_match:
+            level, current = int(level_match.group(1)), None
+            continue
+        if _HEADING_RE.match(line) and not _RUBRIC_CRITERION_RE.match(line):
+            # A non-level heading (e.g. "## IMPORTANT GUIDELINES") ends the scored sections
+            level, current = None, None
+            continue
+        match = _RUBRIC_CRITERION_RE.match(line) if level is not None else None
+        if match:
+            number, title, points = match.groups()
+            title = title.strip("* ")
+            current = {
+                "level": level,
+                "number": int(number),
+                "title": title,
+                "max_points": float(points),
+                "text": line.strip(),
+            }
+            criteria[criterion_key(level, title)] = current
+        elif current is not None and line.strip():
+            current["text"] += "\n" + line.rstrip()
+    return criteria
+
+
+def parse_evaluation(markdown: str, stage: str = "resume") -> dict:
+    """
+    Extracts per-criterion scores from a ResumeReviewer/GitHubReviewer evaluation.
+
+    Returns:
+        dict with "candidate_name", "total", "max_total" and "criteria" (criterion key ->
+        {"title", "score", "max_points", "detail"})
+    """
+    level = STAGE_LEVELS[stage]
+    criteria = {}
+    current = None
+    for line in (markdown or "").splitlines():
+        match = _EVAL_CRITERION_RE.match(line)
+        if match:
+            _, title, score, max_points = match.groups()
+            title = title.strip("* ")
+            current = {
+                "title": title,
+                "score": float(score),
+                "max_points": float(max_points),
+                "detail": line.strip(),
+            }
+            criteria[criterion_key(level, title)] = current
+        elif current is not None and _SECTION_END_RE.match(line):
+            current = None
+        elif current is not None and line.strip():
+            current["detail"] += "\n" + line.rstrip()
+
+    total_match = _TOTAL_RE.search(markdown or "")
+    name_match = _CANDIDATE_RE.search(markdown or "")
+    return {
+        "candidate_name": name_match.group(1).strip() if name_match else None,
+        "total": float(total_match.group(1)) if total_match else sum(c["score"] for c in criteria.values()),
+        "max_total": float(total_match.group(2)) if total_match else sum(c["max_points"] for c in criteria.values()),
+        "criteria": criteria,
+    }
+
+
+def _words(text: str) -> set:
+    return set(re.findall(r"[a-z0-9+#.]+", text.lower()))
+
+
+def key_terms(text: str) -> set:
+    """
+    Requirement-bearing terms of a criterion: capitalised words that don't start a sentence
+    (Python, Kafka, AWS) and anything with a digit (5+, 2019). Regenerated rubrics reword the
+    scoring guide freely, but a changed JD shows up as a changed set of these terms.
+    """
+    terms = set()
+    for line in text.splitlines():
+        line = re.sub(r"^[\s*#>-]+", "", line)
+        for sentence in re.split(r"(?<=[.:!?])\s+", line):
+            tokens = re.findall(r"[A-Za-z0-9][\w+#.-]*", sentence.replace("*", ""))
+            for position, token in enumerate(tokens):
+                token = token.rstrip(".")
+                if (position and token[:1].isupper()) or any(ch.isdigit() for ch in token):
+                    terms.add(token.lower())
+    return terms
+
+
+def text_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the word sets of two criterion texts."""
+    words_a, words_b = _words(a), _words(b)
+    if not words_a and not words_b:
+        return 1.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+def diff_rubrics(old: dict, new: dict, threshold: float = 0.5) -> dict:
+    """
+    Compares two parsed rubrics criterion by criterion.
+
+    A criterion counts as changed when its point value differs, its requirement terms differ
+    (see `key_terms`), or its wording similarity drops below `threshold`. Regenerated rubrics never
+    match word-for-word, so an exact comparison would flag everything.
+
+    Returns:
+        dict with "changed", "added", "removed" and "unchanged" lists of criterion keys
+    """
+    changed, unchanged = [], []
+    for key in new:
+        if key not in old:
+            continue
+        old_text, new_text = old[key]["text"], new[key]["text"]
+        if (
+            old[key]["max_points"] == new[key]["max_points"]
+            and key_terms(old_text) == key_terms(new_text)
+            and text_similarity(old_text, new_text) >= threshold
+        ):
+            unchanged.append(key)
+        else:
+            changed.append(key)
+    return {
+        "changed": changed,
+        "added": [key for key in new if key not in old],
+        "removed": [key for key in old if key not in new],
+        "unchanged": unchanged,
+    }
+
+
+def total_for(scores: dict, rubric: dict, stage: str) -> tuple:
+    """Recomputes (total, max_total) for `stage` from criterion scores against the current rubric."""
+    level = STAGE_LEVELS[stage]
+    keys = [key for key, criterion in rubric.items() if criterion["level"] == level]
+    total = sum(scores[key]["score"] for key in keys if key in scores)
+    max_total = sum(rubric[key]["max_points"] for key in keys)
+    return total, max_total
@@ -0,0 +1,75 @@
+"""
+Runs a single agent outside the chat UI: one message in, the agent's final text out.
+
+Used by the programmatic paths (re-scoring, batch jobs) that call sub-agents directly with
+structured inputs instead of going through the conversational orchestrator.
+"""
+
+import asyncio
+
+from . import profiling
+
+
+def _final_text(event) -> str:
+    if not event.content or not event.content.parts or event.partial:
+        return ""
+    return "".join(part.text for part in event.content.parts if part.text and not part.thought)
+
+
+async def run_agent_async(agent, message: str, *, state: dict = None, user_id: str = "hiring-agent") -> str:
+    """
+    Runs `agent` on `message` in a fresh in-memory session.
+
+    Args:
+        agent: An agent instance or a name registered in tools_agents.AGENT_FACTORIES
+        message: The user message (e.g. rubric + resume)
+        state: Optional initial session state (e.g. requisition_id, candidate_id)
+
+    Returns:
+        The text of the agent's last response
+    """
+    text, _ = await run_agent_session_async(agent, message, state=state, user_id=user_id)
+    return text
+
+
+async def run_agent_session_async(agent, message: str, *, state: dict = None, user_id: str = "hiring-agent"):
+    """
+    Like run_agent_async, but also returns the session state after the run, so callers can pick up
+    what the agent's callbacks recorded (requisition_id, candidate_id, rubric_version, ...).
+
+    Returns:
+        (final response text, final session state dict)
+    """
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    if isinstance(agent, str):
+        from .tools_agents import get_agent
+
+        agent = get_agent(agent)
+
+    runner = InMemoryRunner(agent=agent, app_name=agent.name)
+    # Event handling on the caller's side; the agent's own work is its agent:<name> step
+    with profiling.step(f"runner:{agent.name}"):
+        try:
+            session = await runner.session_service.create_session(
+                app_name=agent.name, user_id=user_id, state=state or {}
+            )
+            text = ""
+            async for event in runner.run_async(
+                user_id=user_id,
+                session_id=session.id,
+                new_message=types.Content(role="user", parts=[types.Part.from_text(text=message)]),
+            ):
+                text = _final_text(event) or text
+            session = await runner.session_service.get_session(
+                app_name=agent.name, user_id=user_id, session_id=session.id
+            )
+            return text, dict(session.state)
+        finally:
+            await runner.close()
+
+
+def run_agent(agent, message: str, **kwargs) -> str:
+    """Blocking wrapper around run_agent_async for scripts and CLIs."""
+    return asyncio.run(run_agent_async(agent, message, **kwargs))
@@ -0,0 +1,377 @@
+"""
+Priority and fairness scheduling in front of the Gemini and GitHub back-pressure limiters.
+
+Every sub-agent model call and every GitHub request waits for a slot from the backend's scheduler
+before it reaches backpressure.py. Slots are handed out:
+- by priority class: INTERACTIVE (recruiters' chat sessions, the default) before BATCH (the
+  screening API, batch scoring, matching and re-scoring CLIs),
+- within a class, by weighted fair queuing across teams (start-time fair queuing; weights from
+  SCHEDULER_TEAM_WEIGHTS, e.g. "recruiting=3,sourcing=1"),
+- up to the backend limiter's current (adaptive) limit in total, of which BATCH may hold at most
+  SCHEDULER_BATCH_SHARE (default 0.75), so a large batch run always leaves room for chat turns.
+
+The class and team of a call come from the context: `with scheduler.priority(scheduler.BATCH, team):`
+around bulk work (contextvars follow asyncio tasks and asyncio.to_thread), else the session's
+"team" state for model calls. `stats()` reports queue wait percentiles per backend and class.
+
+    python -m hiring_agent_adk.scheduler bench    # interactive wait with a batch backlog, scheduled vs. FIFO
+"""
+
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+
+from . import backpressure, config
+
+INTERACTIVE, BATCH = "interactive", "batch"
+CLASSES = (INTERACTIVE, BATCH)  # highest priority first
+DEFAULT_TEAM = "default"
+_WAIT_WINDOW = 2048  # recent waits kept per class for percentiles
+
+_priority = contextvars.ContextVar("scheduler_priority", default=(INTERACTIVE, None))
+
+
+@contextlib.contextmanager
+def priority(cls: str, team: str = None):
+    """
+    Runs the enclosed calls (and tasks/threads started from them) in priority class `cls` for
+    `team` (default: the team already in effect).
+    """
+    if cls not in CLASSES:
+        raise ValueError(f"Unknown priority class {cls!r}. Available: {', '.join(CLASSES)}")
+    token = _priority.set((cls, team if team is not None else _priority.get()[1]))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current(state=None) -> tuple:
+    """(class, team) for a call made now; `state` supplies the team of a chat session."""
+    cls, team = _priority.get()
+    if team is None and state is not None:
+        team = state.get("team")
+    return cls, team or DEFAULT_TEAM
+
+
+def team_weights() -> dict:
+    weights = {}
+    for item in (config.getenv("SCHEDULER_TEAM_WEIGHTS") or "").split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() and weight.strip():
+            weights[name.strip()] = float(weight)
+    return weights
+
+
+class _Waiter:
+    __slots__ = ("cls", "team", "start_tag", "enqueued_at", "event", "loop", "future", "granted")
+
+    def __init__(self, cls, team, loop=None):
+        self.cls = cls
+        self.team = team
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.loop = loop
+        self.future = loop.create_future() if loop else None
+        self.event = None if loop else threading.Event()
+
+    def wake(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+        else:
+            self.event.set()
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class Scheduler:
+    """Priority classes with per-class caps over a shared total, fair-queued by team within a class."""
+
+    def __init__(self, name: str, total=None, batch_share: float = 0.75, weights: dict = None):
+        """
+        Args:
+            name: Backend name; unless `total` is given, the total follows that backend's AIMD limit
+            total: Fixed total concurrency (int) or a zero-argument callable returning it
+            batch_share: Fraction of the total BATCH calls may hold at once
+            weights: team -> weight for fair queuing (default 1)
+        """
+        self.name = name
+        self._total = total
+        self.batch_share = batch_share
+        self.weights = weights or {}
+        self._lock = threading.Lock()
+        self._queues = {cls: {} for cls in CLASSES}  # class -> team -> deque of waiters
+        self._in_flight = {cls: 0 for cls in CLASSES}
+        self._virtual_time = {cls: 0.0 for cls in CLASSES}
+        self._last_finish = {cls: {} for cls in CLASSES}  # class -> team -> finish tag of its last call
+        self._waits = {cls: deque(maxlen=_WAIT_WINDOW) for cls in CLASSES}
+        self._granted = {cls: 0 for cls in CLASSES}
+
+    def total(self) -> int:
+        if self._total is None:
+            return max(1, int(backpressure.get_backend(self.name).limiter.limit))
+        return max(1, int(self._total() if callable(self._total) else self._total))
+
+    def cap(self, cls: str, total: int = None) -> int:
+        total = total or self.total()
+        return total if cls == INTERACTIVE else max(1, math.floor(total * self.batch_share))
+
+    # Queueing (caller holds _lock)
+
+    def _enqueue(self, waiter: _Waiter):
+        last_finish = self._last_finish[waiter.cls]
+        waiter.start_tag = max(self._virtual_time[waiter.cls], last_finish.get(waiter.team, 0.0))
+        last_finish[waiter.team] = waiter.start_tag + 1.0 / self.weights.get(waiter.team, 1.0)
+        self._queues[waiter.cls].setdefault(waiter.team, deque()).append(waiter)
+
+    def _dispatch(self):
+        total = self.total()
+        for cls in CLASSES:
+            queues = self._queues[cls]
+            while queues and sum(self._in_flight.values()) < total and self._in_flight[cls] < self.cap(cls, total):
+                # The team whose head waiter has the smallest start tag goes next
+                team = min(queues, key=lambda name: queues[name][0].start_tag)
+                waiter = queues[team].popleft()
+                if not queues[team]:
+                    del queues[team]
+                self._virtual_time[cls] = waiter.start_tag
+                self._grant(waiter)
+            if queues:
+                # Lower classes wait while a higher class has waiters
+                return
+
+    def _grant(self, waiter: _Waiter):
+        waiter.granted = True
+        self._in_flight[waiter.cls] += 1
+        self._granted[waiter.cls] += 1
+        self._waits[waiter.cls].append(time.monotonic() - waiter.enqueued_at)
+        waiter.wake()
+
+    def _withdraw(self, waiter: _Waiter):
+        queue = self._queues[waiter.cls].get(waiter.team)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[waiter.cls][waiter.team]
+
+    # Public API
+
+    def acquire(self, cls: str = INTERACTIVE, team: str = DEFAULT_TEAM):
+        """Blocks the calling thread until the call may proceed; pair with release(cls)."""
+        waiter = _Waiter(cls, team)
+        with self._lock:
+            self._enqueue(waiter)
+            self._dispatch()
+        waiter.event.wait()
+
+    async def acquire_async(self, cls: str = INTERACTIVE, team: str = DEFAULT_TEAM):
+        """Event-loop friendly acquire; a cancelled waiter gives up its place (or its slot)."""
+        waiter = _Waiter(cls, team, asyncio.get_running_loop())
+        with self._lock:
+            self._enqueue(waiter)
+            self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    self._withdraw(waiter)
+            if waiter.granted:
+                self.release(cls)
+            raise
+
+    def release(self, cls: str):
+        with self._lock:
+            self._in_flight[cls] = max(0, self._in_flight[cls] - 1)
+            self._dispatch()
+
+    @contextlib.contextmanager
+    def slot(self, state=None):
+        """Holds a slot for the enclosed block, in the class and team of the current context."""
+        cls, team = current(state)
+        self.acquire(cls, team)
+        try:
+            yield
+        finally:
+            self.release(cls)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = self.total()
+            classes = {}
+            for cls in CLASSES:
+                waits = sorted(self._waits[cls])
+                classes[cls] = {
+                    "in_flight": self._in_flight[cls],
+                    "waiting": sum(len(queue) for queue in self._queues[cls].values()),
+                    "cap": self.cap(cls, total),
+                    "granted": self._granted[cls],
+                    "wait_ms_p50": _percentile_ms(waits, 0.50),
+                    "wait_ms_p95": _percentile_ms(waits, 0.95),
+                    "wait_ms_max": _percentile_ms(waits, 1.0),
+                }
+            return {"total": total, "classes": classes}
+
+
+def _percentile_ms(sorted_values: list, fraction: float):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1)
+    return round(sorted_values[max(0, index)] * 1000, 1)
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(name: str) -> Scheduler:
+    """The process-wide scheduler for backend `name` ("gemini" or "github")."""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(name)
+        if scheduler is None:
+            scheduler = _schedulers[name] = Scheduler(
+                name,
+                batch_share=float(config.getenv("SCHEDULER_BATCH_SHARE", 0.75)),
+                weights=team_weights(),
+            )
+        return scheduler
+
+
+def stats() -> dict:
+    """Per backend and class: slots in use, waiting calls, caps and recent queue wait percentiles."""
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+    return {scheduler.name: scheduler.snapshot() for scheduler in schedulers}
+
+
+def slot(name: str):
+    """`with scheduler.slot("github"):` - a slot on backend `name` in the current class and team."""
+    return get_scheduler(name).slot()
+
+
+# ---------------------------------------------------------------------------
+# ADK model callbacks - wrap backpressure's so slots are taken in scheduling order
+# ---------------------------------------------------------------------------
+
+# (invocation_id, agent_name) -> (class,) of the slot held by the in-flight model call
+_model_slots = {}
+
+
+def _call_key(callback_context):
+    return (callback_context.invocation_id, callback_context.agent_name)
+
+
+async def before_model_callback(callback_context, llm_request):
+    """Waits for the call's turn on the "gemini" scheduler, then for backpressure admission."""
+    cls, team = current(callback_context.state)
+    scheduler = get_scheduler("gemini")
+    await scheduler.acquire_async(cls, team)
+    try:
+        refusal = await backpressure.before_model_callback(callback_context, llm_request)
+    except BaseException:  # cancelled while waiting for admission
+        scheduler.release(cls)
+        raise
+    if refusal is not None:
+        # No after-callbacks run for a refused call, so the slot is returned here
+        scheduler.release(cls)
+        return refusal
+    key, entry = _call_key(callback_context), (cls,)
+    _model_slots[key] = entry
+    backpressure.on_abandoned(lambda: _release_slot(key, entry))
+    return None
+
+
+def _release_slot(key, entry):
+    if _model_slots.get(key) is entry:
+        del _model_slots[key]
+        get_scheduler("gemini").release(entry[0])
+
+
+def after_model_callback(callback_context, llm_response):
+    backpressure.after_model_callback(callback_context, llm_response)
+    entry = _model_slots.pop(_call_key(callback_context), None)
+    if entry is not None:
+        get_scheduler("gemini").release(entry[0])
+    return None
+
+
+def on_model_error_callback(callback_context, llm_request, error):
+    backpressure.on_model_error_callback(callback_context, llm_request, error)
+    entry = _model_slots.pop(_call_key(callback_context), None)
+    if entry is not None:
+        get_scheduler("gemini").release(entry[0])
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+async def _simulate(scheduled: bool, total: int, batch_calls: int, interactive_calls: int,
+                    service_ms: float, interval_ms: float) -> list:
+    """Interactive latencies (ms) while `batch_calls` are queued at once; FIFO when not `scheduled`."""
+    scheduler = Scheduler("bench", total=total)
+    fifo = asyncio.Semaphore(total)
+    latencies = []
+
+    async def call(cls, team, record):
+        start = time.monotonic()
+        if scheduled:
+            await scheduler.acquire_async(cls, team)
+        else:
+            await fifo.acquire()
+        try:
+            await asyncio.sleep(service_ms / 1000)
+        finally:
+            if scheduled:
+                scheduler.release(cls)
+            else:
+                fifo.release()
+        if record:
+            latencies.append((time.monotonic() - start) * 1000)
+
+    batch = [asyncio.create_task(call(BATCH, f"team-{i % 2}", False)) for i in range(batch_calls)]
+    await asyncio.sleep(0)
+    interactive = []
+    for _ in range(interactive_calls):
+        interactive.append(asyncio.create_task(call(INTERACTIVE, DEFAULT_TEAM, True)))
+        await asyncio.sleep(interval_ms / 1000)
+    await asyncio.gather(*interactive)
+    for task in batch:
+        task.cancel()
+    await asyncio.gather(*batch, return_exceptions=True)
+    return sorted(latencies)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Scheduler stats and benchmark.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    bench = subparsers.add_parser("bench", help="interactive latency behind a batch backlog, scheduled vs. FIFO")
+    bench.add_argument("--total", type=int, default=8, help="concurrent calls the backend allows")
+    bench.add_argument("--batch", type=int, default=2000, help="batch calls queued up front")
+    bench.add_argument("--interactive", type=int, default=40, help="interactive calls, arriving one per interval")
+    bench.add_argument("--service-ms", type=float, default=20.0, help="duration of one call")
+    bench.add_argument("--interval-ms", type=float, default=25.0, help="gap between interactive arrivals")
+    args = parser.parse_args(argv)
+
+    print(f"{'mode':<10} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for scheduled in (False, True):
+        latencies = asyncio.run(_simulate(
+            scheduled, args.total, args.batch, args.interactive, args.service_ms, args.interval_ms
+        ))
+        print(f"{'scheduled' if scheduled else 'fifo':<10} {_percentile_ms([v / 1000 for v in latencies], 0.5):>8} "
+              f"{_percentile_ms([v / 1000 for v in latencies], 0.95):>8} {latencies[-1]:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,248 @@
+"""
+Adaptive self-consistency for ResumeReviewer scores near the pass line.
+
+One ResumeReviewer sample is noisy close to the PASS/FAIL line, and a fixed ensemble for every
+candidate multiplies cost. Instead, each evaluation is sampled once; only when its score (/10) is
+within SELF_CONSISTENCY_MARGIN of workflow.PASS_LINE are more samples of the same request drawn, in
+parallel rounds of SELF_CONSISTENCY_BATCH, stopping as soon as all samples agree within
+SELF_CONSISTENCY_TOLERANCE points (or their median leaves the margin, or SELF_CONSISTENCY_MAX_SAMPLES
+is reached). The evaluation with the median score is the one returned and recorded, and the number
+of samples per candidate is stored next to it.
+
+Extra samples go through the same scheduler slot and back-pressure admission as any model call and
+are metered with the primary response. They are not drawn while a cassette is active (they could not
+be replayed) or while the requisition is over its soft budget.
+
+    python -m hiring_agent_adk.self_consistency report --requisition req-1234abcd
+    python -m hiring_agent_adk.self_consistency simulate --candidates 5000 --noise 1.0
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import threading
+import time
+from collections import OrderedDict
+
+from . import backpressure, cassette, config, metering, recording, rubrics, scheduler, workflow
+from .store import get_store
+
+SAMPLES = "resume_samples"  # state key: samples drawn for the latest resume evaluation
+
+_requests = OrderedDict()  # (invocation id, agent) -> LlmRequest of the primary call
+_requests_lock = threading.Lock()
+_MAX_TRACKED = 1024
+
+
+def settings() -> dict:
+    return {
+        "threshold": float(config.getenv("SELF_CONSISTENCY_THRESHOLD", workflow.PASS_LINE)),
+        "margin": float(config.getenv("SELF_CONSISTENCY_MARGIN", 1.0)),
+        "tolerance": float(config.getenv("SELF_CONSISTENCY_TOLERANCE", 0.5)),
+        "max_samples": int(config.getenv("SELF_CONSISTENCY_MAX_SAMPLES", 5)),
+        "batch": int(config.getenv("SELF_CONSISTENCY_BATCH", 2)),
+    }
+
+
+def should_stop(scores: list, limits: dict) -> bool:
+    """True once the scores (/10) drawn so far settle the evaluation (`limits` as from settings())."""
+    if len(scores) >= limits["max_samples"]:
+        return True
+    if abs(statistics.median(scores) - limits["threshold"]) > limits["margin"]:
+        return True  # clearly strong or weak (the case for most single samples)
+    return len(scores) > 1 and max(scores) - min(scores) <= limits["tolerance"]
+
+
+def median_index(scores: list) -> int:
+    """Index of the sample whose score is the (lower) median."""
+    ranked = sorted(range(len(scores)), key=lambda i: scores[i])
+    return ranked[(len(ranked) - 1) // 2]
+
+
+def _score(text: str):
+    parsed = rubrics.parse_evaluation(text, "resume")
+    if not parsed["criteria"] or not parsed["max_total"]:
+        return None
+    return 10 * parsed["total"] / parsed["max_total"]
+
+
+# ---------------------------------------------------------------------------
+# ADK model callbacks (ResumeReviewer)
+# ---------------------------------------------------------------------------
+
+
+def before_model_callback(callback_context, llm_request):
+    """Keeps the request so borderline responses can be re-sampled."""
+    with _requests_lock:
+        _requests[(callback_context.invocation_id, callback_context.agent_name)] = llm_request
+        while len(_requests) > _MAX_TRACKED:
+            _requests.popitem(last=False)
+    return None
+
+
+async def _sample(model, llm_request, state):
+    """One extra sample, scheduled and admitted like a regular model call."""
+    cls, team = scheduler.current(state)
+    gemini = scheduler.get_scheduler("gemini")
+    await gemini.acquire_async(cls, team)
+    try:
+        backend = backpressure.get_backend("gemini")
+        await backend.admit_async()
+        start, response = time.monotonic(), None
+        try:
+            async for response in model.generate_content_async(llm_request.model_copy(deep=True), stream=False):
+                if not response.partial:
+                    break
+        finally:
+            backend.record(time.monotonic() - start, ok=response is not None and not response.error_code)
+        return response
+    finally:
+        gemini.release(cls)
+
+
+def _add_usage(llm_response, extra):
+    """Adds an extra sample's tokens to the response that metering records."""
+    from google.genai import types
+
+    if extra.usage_metadata is None:
+        return
+    metadata = llm_response.usage_metadata or types.GenerateContentResponseUsageMetadata()
+    for field in ("prompt_token_count", "candidates_token_count", "thoughts_token_count"):
+        added = getattr(extra.usage_metadata, field)
+        if added:
+            setattr(metadata, field, (getattr(metadata, field) or 0) + added)
+    llm_response.usage_metadata = metadata
+
+
+async def after_model_callback(callback_context, llm_response):
+    """Draws more samples for a borderline score and swaps in the median evaluation."""
+    with _requests_lock:
+        llm_request = _requests.pop((callback_context.invocation_id, callback_context.agent_name), None)
+    text = recording._response_text(llm_response)
+    score = _score(text) if llm_request is not None and text else None
+    if score is None:
+        return None
+    state = callback_context.state
+    state[SAMPLES] = 1
+    limits = settings()
+    if (
+        should_stop([score], limits)
+        or cassette.active() is not None
+        or metering.level(state.get("requisition_id")) != metering.OK
+    ):
+        return None
+
+    from .tools_agents import get_agent
+
+    model = get_agent("resume_reviewer").canonical_model
+    samples, scores = [llm_response], [score]
+    while not should_stop(scores, limits):
+        count = min(limits["batch"], limits["max_samples"] - len(scores))
+        responses = await asyncio.gather(
+            *(_sample(model, llm_request, state) for _ in range(count)), return_exceptions=True
+        )
+        drawn = 0
+        for response in responses:
+            if isinstance(response, BaseException) or response is None:
+                continue
+            _add_usage(llm_response, response)
+            sample_score = _score(recording._response_text(response))
+            if sample_score is not None:
+                samples.append(response)
+                scores.append(sample_score)
+                drawn += 1
+        if not drawn:
+            break  # the backend is refusing or the samples are unparseable; keep what we have
+
+    from google.genai import types
+
+    chosen = recording._response_text(samples[median_index(scores)])
+    note = (
+        f"_Borderline score: evaluated {len(scores)} times "
+        f"({', '.join(f'{value:.1f}' for value in scores)} /10); this is the median evaluation._"
+    )
+    llm_response.content = types.Content(role="model", parts=[types.Part(text=f"{chosen}\n\n{note}")])
+    state[SAMPLES] = len(scores)
+    return None
+
+
+def record_samples(callback_context, llm_response):
+    """after_model_callback (after recording.record_evaluation): stores the sample count per candidate."""
+    state = callback_context.state
+    if state.get(SAMPLES) and state.get("candidate_id") and recording._response_text(llm_response):
+        get_store().put_samples(recording.requisition_id_for(state), state["candidate_id"], "resume", state[SAMPLES])
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Simulation
+# ---------------------------------------------------------------------------
+
+
+def simulate(candidates: int = 5000, noise: float = 1.0, seed: int = 7, **limits) -> dict:
+    """
+    Decision accuracy and samples per candidate for a single sample, a fixed ensemble and the adaptive
+    sampler, with true scores uniform on 0-10 and each sample off by N(0, noise).
+    """
+    limits = {**settings(), **limits}
+    rng = random.Random(seed)
+    threshold = limits["threshold"]
+
+    def draw(true_score):
+        return min(10.0, max(0.0, rng.gauss(true_score, noise)))
+
+    correct = {"single": 0, "ensemble": 0, "adaptive": 0}
+    samples = {"single": 0, "ensemble": 0, "adaptive": 0}
+    histogram = {}
+    for _ in range(candidates):
+        true_score = rng.uniform(0, 10)
+        truth = true_score >= threshold
+        first = draw(true_score)
+        ensemble = [first] + [draw(true_score) for _ in range(limits["max_samples"] - 1)]
+        adaptive = [first]
+        while not should_stop(adaptive, limits):
+            adaptive += [draw(true_score) for _ in range(min(limits["batch"], limits["max_samples"] - len(adaptive)))]
+        for name, scores in (("single", [first]), ("ensemble", ensemble), ("adaptive", adaptive)):
+            correct[name] += (scores[median_index(scores)] >= threshold) == truth
+            samples[name] += len(scores)
+        histogram[len(adaptive)] = histogram.get(len(adaptive), 0) + 1
+    return {
+        "settings": limits,
+        "noise": noise,
+        "accuracy": {name: round(count / candidates, 4) for name, count in correct.items()},
+        "samples_per_candidate": {name: round(count / candidates, 3) for name, count in samples.items()},
+        "adaptive_samples_histogram": dict(sorted(histogram.items())),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Adaptive self-consistency for borderline resume scores.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    report = subparsers.add_parser("report", help="samples drawn per candidate")
+    report.add_argument("--requisition", help="one requisition (default: all)")
+    sim = subparsers.add_parser("simulate", help="accuracy vs. cost of single / fixed ensemble / adaptive sampling")
+    sim.add_argument("--candidates", type=int, default=5000)
+    sim.add_argument("--noise", type=float, default=1.0, help="standard deviation of one sample's score (/10)")
+    sim.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    if args.command == "simulate":
+        print(json.dumps(simulate(args.candidates, args.noise, args.seed), indent=2))
+        return 0
+    rows = get_store().samples(args.requisition)
+    if not rows:
+        print("No sample counts recorded yet.")
+        return 0
+    print(f"{'requisition':<20} {'candidate':<28} {'samples':>7}")
+    for row in rows:
+        print(f"{row['requisition_id']:<20} {row['candidate_id']:<28} {row['samples']:>7}")
+    counts = [row["samples"] for row in rows]
+    print(f"\n{len(counts)} candidates, {sum(counts) / len(counts):.2f} samples per candidate, "
+          f"{sum(count > 1 for count in counts)} re-sampled as borderline")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,515 @@
+"""
+HTTP API for programmatic screening, alongside the `adk web` chat UI.
+
+Endpoints call the sub-agents directly with structured inputs, so no orchestrator turns are spent:
+
+    POST /requisitions                   {"job_description": "...", "team": "..."} -> 202, a job that builds the rubric
+    GET  /requisitions/{id}              latest rubric version and current rankings
+    POST /requisitions/{id}/candidates   {"resumes": [{"text": "...", "github_username": "..."}], "team": "..."}
+                                         -> 202, one job per resume
+    GET  /requisitions/{id}/usage        live token usage and cost, by agent and candidate
+    PUT  /requisitions/{id}/budget       {"soft_tokens": ..., "hard_usd": ...} -> sets limits, resumes paused jobs
+    GET  /jobs/{id}                      job status and results so far
+    GET  /jobs/{id}/events               Server-Sent Events: progress and results until the job finishes
+
+Each worker process runs SERVICE_WORKERS jobs concurrently on asyncio, behind a queue of at most
+SERVICE_QUEUE_SIZE waiting jobs. Submissions that do not fit are answered with 429 and a
+Retry-After estimate instead of piling up; while the Gemini circuit is open they get 503.
+
+Jobs run in the scheduler's BATCH class (see scheduler.py), fair-queued by the "team" given at
+submission, so bulk screening never crowds out recruiters' chat sessions on shared quotas.
+
+With "profile": true in a submission (or PROFILING=1), each job's Python-side time is profiled
+per step and stored under the job id (see profiling.py).
+
+With ATS_SOURCE set, applications are also pulled from an applicant-tracking system every
+ATS_POLL_SECONDS and queued as candidate jobs (see ats_sync.py).
+
+Requisitions over their soft token budget (see metering.py) are screened without GitHub reviews and
+with rule-based verdicts; jobs of requisitions over their hard budget pause before their next model
+call and continue from there once the budget is raised.
+
+    python -m hiring_agent_adk.service --host 0.0.0.0 --port 8080
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+import uuid
+from collections import OrderedDict
+
+from . import (
+    backpressure, config, github_api, metering, profiling, recording, repo_sampler, rubrics, scheduler, shadow, workflow,
+)
+from .store import get_store
+
+# Ids the sub-agents' recording callbacks read from and write back to session state
+_SHARED_KEYS = ("requisition_id", "rubric_version", "candidate_id", recording.EXTERNAL_CANDIDATE_ID)
+_HEARTBEAT_SECONDS = 15
+
+
+def _require_fastapi():
+    try:
+        import fastapi
+    except ImportError as e:
+        raise ImportError("The screening service requires FastAPI and uvicorn: pip install fastapi uvicorn") from e
+    return fastapi
+
+
+class QueueFull(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__("screening queue is full")
+        self.retry_after = retry_after
+
+
+class Job:
+    """One unit of queued work and the ordered events it has produced so far."""
+
+    def __init__(self, kind: str, requisition_id: str, params: dict, team: str = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.requisition_id = requisition_id
+        self.params = params
+        self.team = team
+        self.status = "queued"
+        self.events = []  # (event name, data)
+        self.result = {}
+        self.state = None  # pipeline state, kept so a paused job continues where it stopped
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    async def emit(self, event: str, data: dict = None):
+        data = data or {}
+        async with self._changed:
+            self.events.append((event, data))
+            self._changed.notify_all()
+
+    async def finish(self, status: str, error: str = None):
+        self.status, self.error, self.finished_at = status, error, time.time()
+        await self.emit(status, {"error": error} if error else {"result": self.result})
+
+    async def stream(self, heartbeat: float = _HEARTBEAT_SECONDS):
+        """Yields every event from the first, then new ones as they arrive, until the job finishes (None = heartbeat)."""
+        position = 0
+        while True:
+            async with self._changed:
+                if position >= len(self.events) and not self.finished:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), heartbeat)
+                    except asyncio.TimeoutError:
+                        pass
+                events = self.events[position:]
+            position += len(events)
+            if not events:
+                yield None
+            for event in events:
+                yield event
+            if self.finished and position >= len(self.events):
+                return
+
+    def snapshot(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "requisition_id": self.requisition_id,
+            "team": self.team,
+            "status": self.status,
+            "error": self.error,
+            "result": self.result,
+            "events": len(self.events),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Pipelines - sub-agents called directly with structured inputs
+# ---------------------------------------------------------------------------
+
+
+async def _run(agent_name: str, message: str, state: dict) -> str:
+    """Runs a sub-agent with the shared ids from `state`, copying back the ids its callbacks set."""
+    from .runtime import run_agent_session_async
+
+    shared = {key: state[key] for key in _SHARED_KEYS if state.get(key) is not None}
+    text, final_state = await run_agent_session_async(agent_name, message, state=shared)
+    state.update({key: final_state[key] for key in _SHARED_KEYS if final_state.get(key) is not None})
+    return text
+
+
+def _evaluation(text: str, stage: str) -> dict:
+    parsed = rubrics.parse_evaluation(text, stage)
+    if not parsed["criteria"]:
+        raise ValueError(f"{stage} evaluation could not be parsed")
+    return {
+        "candidate_name": parsed["candidate_name"],
+        "total": parsed["total"],
+        "max_total": parsed["max_total"],
+        "markdown": text,
+    }
+
+
+async def build_rubric(job: Job):
+    metering.check(job.requisition_id)
+    state = {"requisition_id": job.requisition_id}
+    await _run("rubric_builder", job.params["job_description"], state)
+    stored = get_store().rubric(job.requisition_id)
+    if stored is None:
+        raise ValueError("RubricBuilder did not produce a rubric")
+    job.result = {"rubric_version": stored[0], "rubric": stored[1]}
+    await job.emit("rubric", job.result)
+
+
+async def evaluate_candidate(job: Job):
+    """
+    Resume review, GitHub validation + review (when a username is known) and the verdict. Stages
+    already in `job.result` are skipped, so a job paused on its budget resumes where it stopped.
+    """
+    from .tools_agents import github_validator
+
+    if job.state is None:
+        store = get_store()
+        rubric_version, rubric = store.rubric(job.requisition_id)
+        job.state = {
+            "requisition_id": job.requisition_id,
+            "rubric_version": rubric_version,
+            workflow.JOB_DESCRIPTION: store.job_description(job.requisition_id),
+            workflow.RUBRIC: rubric,
+            workflow.RESUME: job.params["text"],
+            recording.EXTERNAL_CANDIDATE_ID: job.params.get("candidate_id"),
+        }
+    state = job.state
+
+    if "resume" not in job.result:
+        metering.check(job.requisition_id)
+        text = await _run("resume_reviewer", workflow.reviewer_message(state, "resume"), state)
+        state[workflow.RESUME_EVALUATION] = text
+        job.result["candidate_id"] = state.get("candidate_id")
+        job.result["resume"] = _evaluation(text, "resume")
+        samples = get_store().samples(job.requisition_id, state.get("candidate_id"))
+        job.result["resume"]["samples"] = samples[0]["samples"] if samples else 1
+        await job.emit("resume_evaluation", {"candidate_id": state.get("candidate_id"), **job.result["resume"]})
+
+    username = job.params.get("github_username") or github_api.find_username(job.params["text"])
+    if username and "github_validation" not in job.result:
+        result = await asyncio.to_thread(github_validator, username)
+        recording.store_validation(state, result)
+        state[workflow.GITHUB_VALIDATION] = json.dumps(result)
+        job.result["github_validation"] = result
+        await job.emit("github_validation", result)
+    validation = job.result.get("github_validation") or {}
+    if validation.get("status") == "PASSED" and "github" not in job.result:
+        if metering.check(job.requisition_id) == metering.SOFT:
+            job.result["github"] = None
+            job.result.setdefault("degraded", []).append("github_review_skipped")
+            await job.emit("github_evaluation_skipped", {"reason": "requisition over its soft token budget"})
+        else:
+            evidence = await asyncio.to_thread(repo_sampler.sample_repositories, validation.get("username", username))
+            state[workflow.REPOSITORY_EVIDENCE] = evidence.get("fact_sheet")
+            if evidence.get("fact_sheet"):
+                await job.emit("repository_evidence", {"fact_sheet": evidence["fact_sheet"]})
+            text = await _run("github_reviewer", workflow.reviewer_message(state, "github"), state)
+            state[workflow.GITHUB_EVALUATION] = text
+            job.result["github"] = _evaluation(text, "github")
+            await job.emit("github_evaluation", job.result["github"])
+
+    if metering.check(job.requisition_id) == metering.SOFT:
+        text = workflow.rule_based_verdict(
+            state[workflow.RESUME_EVALUATION], state.get(workflow.GITHUB_EVALUATION),
+            "the requisition is over its soft token budget",
+        )
+        recording.store_verdict(state, text)
+        job.result.setdefault("degraded", []).append("rule_based_verdict")
+    else:
+        text = await _run("verdict_synthesizer", workflow.reviewer_message(state, "verdict"), state)
+    job.result["verdict"] = {**recording.parse_verdict(text), "markdown": text}
+    await job.emit("verdict", job.result["verdict"])
+
+
+PIPELINES = {"rubric": build_rubric, "candidate": evaluate_candidate}
+
+
+# ---------------------------------------------------------------------------
+# Job queue
+# ---------------------------------------------------------------------------
+
+
+class ScreeningService:
+    """Bounded job queue drained by a fixed number of asyncio workers."""
+
+    def __init__(self, workers: int = None, queue_size: int = None, retention: int = None):
+        self.workers = workers or int(config.getenv("SERVICE_WORKERS", 16))
+        self.queue_size = queue_size or int(config.getenv("SERVICE_QUEUE_SIZE", 200))
+        self.retention = retention or int(config.getenv("SERVICE_JOB_RETENTION", 5000))
+        self.jobs = OrderedDict()  # job id -> Job, oldest first
+        self.paused = {}  # requisition id -> jobs waiting for a budget increase
+        self.running = 0
+        self._queue = None
+        self._tasks = []
+        self._avg_seconds = 30.0  # running average job duration, for Retry-After
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def retry_after(self) -> int:
+        """Seconds until the queue has likely drained enough to accept work again."""
+        backlog = self._queue.qsize() + self.running if self._queue else 0
+        return max(1, math.ceil(self._avg_seconds * backlog / (self.workers * 2)))
+
+    def submit(self, kind: str, requisition_id: str, params: dict, team: str = None) -> Job:
+        """
+        Queues a job without waiting.
+
+        Raises:
+            QueueFull: the queue is at SERVICE_QUEUE_SIZE
+            backpressure.BackendUnavailable: the Gemini circuit is open
+        """
+        breaker = backpressure.get_backend("gemini").breaker
+        if breaker.retry_after() > 0:
+            raise backpressure.BackendUnavailable("gemini", "circuit open", breaker.retry_after())
+        job = Job(kind, requisition_id, params, team)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFull(self.retry_after()) from None
+        self.jobs[job.id] = job
+        self._evict()
+        return job
+
+    def submit_many(self, kind: str, requisition_id: str, params: list, team: str = None) -> list:
+        """All-or-nothing: raises QueueFull unless every job fits."""
+        if self._queue.maxsize - self._queue.qsize() < len(params):
+            raise QueueFull(self.retry_after())
+        return [self.submit(kind, requisition_id, item, team) for item in params]
+
+    def resume(self, requisition_id: str) -> int:
+        """Re-queues the requisition's paused jobs (as many as fit) unless it is still over its hard budget."""
+        if metering.level(requisition_id) == metering.HARD:
+            return 0
+        paused = self.paused.get(requisition_id, [])
+        resumed = 0
+        while paused and not self._queue.full():
+            job = paused.pop(0)
+            job.status = "queued"
+            self._queue.put_nowait(job)
+            resumed += 1
+        if not paused:
+            self.paused.pop(requisition_id, None)
+        return resumed
+
+    def _evict(self):
+        # Finished jobs beyond the retention limit are forgotten, oldest first
+        excess = len(self.jobs) - self.retention
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished][:max(0, excess)]:
+            del self.jobs[job_id]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            self.running += 1
+            started = time.monotonic()
+            try:
+                job.status = "running"
+                await job.emit("started", {"kind": job.kind})
+                with profiling.step(f"job:{job.kind}", job.id, job.params.get(profiling.PROFILE)):
+                    # A stage that crosses the hard budget mid-way raises BudgetExceeded and pauses the job
+                    with scheduler.priority(scheduler.BATCH, job.team), metering.pausing():
+                        await PIPELINES[job.kind](job)
+                await job.finish("done")
+            except metering.BudgetExceeded as e:
+                job.status = "paused"
+                self.paused.setdefault(job.requisition_id, []).append(job)
+                await job.emit("paused", {"reason": str(e), "usage": e.usage})
+            except asyncio.CancelledError:
+                await job.finish("failed", "service shutting down")
+                raise
+            except Exception as e:
+                await job.finish("failed", f"{type(e).__name__}: {e}")
+            finally:
+                self.running -= 1
+                self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * (time.monotonic() - started)
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "paused": sum(len(jobs) for jobs in self.paused.values()),
+            "queue_size": self.queue_size,
+            "avg_job_seconds": round(self._avg_seconds, 2),
+            "backends": backpressure.backend_states(),
+            "scheduler": scheduler.stats(),
+            "shadow": shadow.stats(),
+        }
+
+
+# ---------------------------------------------------------------------------
+# HTTP app
+# ---------------------------------------------------------------------------
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def create_app(service: ScreeningService = None):
+    """The FastAPI app; `service` defaults to one configured from the environment."""
+    _require_fastapi()
+    from contextlib import asynccontextmanager
+
+    from fastapi import Body, FastAPI, HTTPException
+    from fastapi.responses import JSONResponse, StreamingResponse
+
+    service = service or ScreeningService()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await service.start()
+        sync = None
+        if config.getenv("ATS_SOURCE"):
+            # New and updated applicants are pulled from the ATS and screened like submitted resumes
+            from . import ats_sync
+
+            app.state.ats = ats_sync.Syncer(ats_sync.source_from_uri(config.getenv("ATS_SOURCE")))
+            sync = asyncio.create_task(app.state.ats.run(service))
+        try:
+            yield
+        finally:
+            if sync is not None:
+                sync.cancel()
+                await asyncio.gather(sync, return_exceptions=True)
+            await service.stop()
+
+    app = FastAPI(title="Hiring Agent screening API", lifespan=lifespan)
+    app.state.service = service
+    app.state.ats = None
+
+    def busy(e) -> JSONResponse:
+        if isinstance(e, QueueFull):
+            status, retry_after, message = 429, e.retry_after, "Screening queue is full, retry later"
+        else:
+            status, retry_after, message = 503, max(1, math.ceil(e.retry_after)), f"Gemini temporarily unavailable ({e.reason})"
+        return JSONResponse(
+            {"status": "BUSY", "error": message, "retry_after": retry_after},
+            status_code=status, headers={"Retry-After": str(retry_after)},
+        )
+
+    def job_or_404(job_id: str) -> Job:
+        job = service.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(404, f"Unknown job {job_id}")
+        return job
+
+    @app.post("/requisitions", status_code=202)
+    async def create_requisition(payload: dict = Body(...)):
+        job_description = (payload.get("job_description") or "").strip()
+        if not job_description:
+            raise HTTPException(422, "job_description is required")
+        requisition_id = payload.get("requisition_id") or recording.requisition_id_for({})
+        try:
+            job = service.submit(
+                "rubric", requisition_id,
+                {"job_description": job_description, profiling.PROFILE: payload.get("profile")}, payload.get("team"),
+            )
+        except (QueueFull, backpressure.BackendUnavailable) as e:
+            return busy(e)
+        return {"requisition_id": requisition_id, "job": job.snapshot()}
+
+    @app.get("/requisitions/{requisition_id}")
+    async def get_requisition(requisition_id: str):
+        store = get_store()
+        rubric = store.rubric(requisition_id)
+        if rubric is None:
+            raise HTTPException(404, f"No rubric for requisition {requisition_id} (yet)")
+        return {
+            "requisition_id": requisition_id,
+            "rubric_version": rubric[0],
+            "rankings": store.rankings(requisition_id),
+            "budget_level": metering.level(requisition_id),
+        }
+
+    @app.get("/requisitions/{requisition_id}/usage")
+    async def get_usage(requisition_id: str):
+        return metering.usage(requisition_id)
+
+    @app.put("/requisitions/{requisition_id}/budget")
+    async def put_budget(requisition_id: str, payload: dict = Body(...)):
+        limits = {key: payload.get(key) for key in ("soft_tokens", "hard_tokens", "soft_usd", "hard_usd")}
+        if not all(value is None or (isinstance(value, (int, float)) and value >= 0) for value in limits.values()):
+            raise HTTPException(422, "budget limits must be non-negative numbers or null")
+        metering.set_budget(requisition_id, **limits)
+        return {**metering.usage(requisition_id), "resumed_jobs": service.resume(requisition_id)}
+
+    @app.post("/requisitions/{requisition_id}/candidates", status_code=202)
+    async def submit_candidates(requisition_id: str, payload: dict = Body(...)):
+        resumes = payload.get("resumes") or []
+        if not resumes or not all(isinstance(item, dict) and (item.get("text") or "").strip() for item in resumes):
+            raise HTTPException(422, 'resumes must be a non-empty list of {"text": ..., "github_username": ...}')
+        if get_store().rubric(requisition_id) is None:
+            raise HTTPException(409, f"Requisition {requisition_id} has no rubric yet; wait for its rubric job")
+        params = [
+            {"text": item["text"], "github_username": item.get("github_username"), profiling.PROFILE: payload.get("profile")}
+            for item in resumes
+        ]
+        try:
+            jobs = service.submit_many("candidate", requisition_id, params, payload.get("team"))
+        except (QueueFull, backpressure.BackendUnavailable) as e:
+            return busy(e)
+        return {"requisition_id": requisition_id, "jobs": [job.snapshot() for job in jobs]}
+
+    @app.get("/jobs/{job_id}")
+    async def get_job(job_id: str):
+        return job_or_404(job_id).snapshot()
+
+    @app.get("/jobs/{job_id}/events")
+    async def job_events(job_id: str):
+        job = job_or_404(job_id)
+
+        async def events():
+            async for item in job.stream():
+                yield ": keep-alive\n\n" if item is None else _sse(*item)
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    @app.get("/health")
+    async def health():
+        stats = service.stats()
+        if app.state.ats is not None:
+            stats["ats"] = app.state.ats.stats
+        return stats
+
+    return app
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the screening HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, help="concurrent jobs (default SERVICE_WORKERS or 16)")
+    parser.add_argument("--queue-size", type=int, help="max waiting jobs (default SERVICE_QUEUE_SIZE or 200)")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    uvicorn.run(create_app(ScreeningService(workers=args.workers, queue_size=args.queue_size)), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,415 @@
+"""
+Memory-bounded session service for long-lived `adk web` / API workers.
+
+`BoundedSessionService` is ADK's in-memory session service with two bounds on what stays resident:
+- at most SESSION_MAX_RESIDENT sessions are kept in memory; the least recently used ones are
+  written (zlib-compressed JSON) to SQLite at SESSION_DB_PATH and loaded back transparently the
+  next time they are read or appended to;
+- once a candidate is finished (the next resume is pasted), that candidate's turns - the
+  multi-kilobyte rubric, evaluation and verdict Markdown - are kept as one compressed chunk instead
+  of live events, and only inflated while a turn reads the session. The orchestrator only sees
+  them compacted anyway (compaction.py).
+
+To use it with `adk web`, put a `services.py` next to the agent folder (in the parent directory):
+
+    from hiring_agent_adk import sessions
+    sessions.register()
+
+and start `adk web --session_service_uri bounded://` (or `bounded:///path/to/sessions.db`).
+
+    python -m hiring_agent_adk.sessions profile --sessions 200 --candidates 5    # bytes per session / artifact
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlparse
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+
+from . import config, workflow
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id)
+);
+"""
+
+
+def _compress(value) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def _decompress(blob: bytes):
+    return json.loads(zlib.decompress(blob))
+
+
+class _SessionDB:
+    """Evicted sessions, one compressed row each."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def execute(self, sql: str, params=()):
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params).fetchall()
+
+
+class BoundedSessionService(InMemorySessionService):
+    """InMemorySessionService with an LRU bound on resident sessions and compressed finished turns."""
+
+    def __init__(self, max_resident: int = None, db_path: str = None, archive: bool = None):
+        """
+        Args:
+            max_resident: Sessions kept in memory (default SESSION_MAX_RESIDENT or 200)
+            db_path: SQLite file for evicted sessions (default SESSION_DB_PATH or hiring_sessions.db)
+            archive: Compress finished candidates' turns (default SESSION_ARCHIVE, on)
+        """
+        super().__init__()
+        self.max_resident = max_resident or int(config.getenv("SESSION_MAX_RESIDENT", 200))
+        self.db = _SessionDB(db_path or config.getenv("SESSION_DB_PATH", "hiring_sessions.db"))
+        self.archive = archive if archive is not None else config.getenv("SESSION_ARCHIVE", "1") != "0"
+        self._lru = OrderedDict()  # (app, user, session id) -> None, least recently used first
+        self._archived = {}  # (app, user, session id) -> compressed chunks of finished events
+        self.evictions = 0
+        self.loads = 0
+
+    # Residency
+
+    def _touch(self, key):
+        self._lru[key] = None
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_resident:
+            self._evict(next(iter(self._lru)))
+
+    def _evict(self, key):
+        app_name, user_id, session_id = key
+        self._lru.pop(key, None)
+        session = self.sessions.get(app_name, {}).get(user_id, {}).pop(session_id, None)
+        if session is None:
+            return
+        events = self._archived_events(key) + [event.model_dump(mode="json") for event in session.events]
+        data = {**session.model_dump(mode="json", exclude={"events"}), "events": events}
+        self.db.execute(
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+            (app_name, user_id, session_id, session.last_update_time, _compress(data)),
+        )
+        self._archived.pop(key, None)
+        self.evictions += 1
+
+    def _ensure_resident(self, app_name: str, user_id: str, session_id: str) -> bool:
+        """Loads an evicted session back into memory; False if it exists nowhere."""
+        if session_id is None:
+            return False
+        key = (app_name, user_id, session_id.strip())
+        if key[2] in self.sessions.get(app_name, {}).get(user_id, {}):
+            self._touch(key)
+            return True
+        rows = self.db.execute(
+            "SELECT data FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?", key
+        )
+        if not rows:
+            return False
+        session = Session.model_validate(_decompress(rows[0][0]))
+        self.sessions.setdefault(app_name, {}).setdefault(user_id, {})[key[2]] = session
+        if self.archive:
+            resumes = [i for i, event in enumerate(session.events) if event.author == "user" and _is_resume(event)]
+            if resumes:
+                self._archive_finished(key, session, resumes[-1])
+        self.db.execute("DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?", key)
+        self.loads += 1
+        self._touch(key)
+        return True
+
+    # Archiving finished candidates
+
+    def _archived_events(self, key) -> list:
+        return [event for chunk in self._archived.get(key, ()) for event in _decompress(chunk)]
+
+    def _archive_finished(self, key, storage_session: Session, boundary: int):
+        """Compresses every event before `boundary`, the newest resume (the finished candidates' turns)."""
+        if boundary <= 0:
+            return
+        finished = storage_session.events[:boundary]
+        self._archived.setdefault(key, []).append(_compress([event.model_dump(mode="json") for event in finished]))
+        del storage_session.events[:boundary]
+
+    # BaseSessionService
+
+    async def create_session(self, *, app_name, user_id, state=None, session_id=None) -> Session:
+        # An evicted session with this id must still count as existing
+        self._ensure_resident(app_name, user_id, session_id)
+        session = await super().create_session(app_name=app_name, user_id=user_id, state=state, session_id=session_id)
+        self._touch((app_name, user_id, session.id))
+        return session
+
+    async def get_session(self, *, app_name, user_id, session_id, config=None):
+        if not self._ensure_resident(app_name, user_id, session_id):
+            return None
+        key = (app_name, user_id, session_id.strip())
+        if key not in self._archived:
+            return await super().get_session(app_name=app_name, user_id=user_id, session_id=session_id, config=config)
+        session = await super().get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        events = [Event.model_validate(event) for event in self._archived_events(key)] + session.events
+        if config and config.num_recent_events is not None:
+            events = events[len(events) - config.num_recent_events:] if config.num_recent_events else []
+        if config and config.after_timestamp is not None:
+            events = [event for event in events if event.timestamp >= config.after_timestamp]
+        session.events = events
+        return session
+
+    async def list_sessions(self, *, app_name, user_id=None):
+        response = await super().list_sessions(app_name=app_name, user_id=user_id)
+        sql, params = "SELECT data FROM sessions WHERE app_name = ?", [app_name]
+        if user_id is not None:
+            sql += " AND user_id = ?"
+            params.append(user_id)
+        for (blob,) in self.db.execute(sql, params):
+            data = _decompress(blob)
+            response.sessions.append(Session.model_validate({**data, "events": []}))
+        response.sessions.sort(key=lambda s: (s.last_update_time, s.user_id, s.id))
+        return response
+
+    async def delete_session(self, *, app_name, user_id, session_id) -> None:
+        key = (app_name, user_id, session_id.strip())
+        self._lru.pop(key, None)
+        self._archived.pop(key, None)
+        self.db.execute("DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?", key)
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        # The session may have been evicted while the runner held its copy
+        self._ensure_resident(*key)
+        event = await super().append_event(session, event)
+        if self.archive and event.author == "user" and _is_resume(event):
+            storage_session = self.sessions[key[0]][key[1]][key[2]]
+            self._archive_finished(key, storage_session, len(storage_session.events) - 1)
+        return event
+
+    def stats(self) -> dict:
+        return {
+            "resident": len(self._lru),
+            "max_resident": self.max_resident,
+            "archived_chunks": sum(len(chunks) for chunks in self._archived.values()),
+            "archived_bytes": sum(len(chunk) for chunks in self._archived.values() for chunk in chunks),
+            "evicted": self.db.execute("SELECT COUNT(*) FROM sessions")[0][0],
+            "evictions": self.evictions,
+            "loads": self.loads,
+        }
+
+
+def _is_resume(event: Event) -> bool:
+    content = event.content
+    text = "".join(part.text for part in content.parts if part.text) if content and content.parts else ""
+    return workflow.classify_document(text) == "resume"
+
+
+def _factory(uri: str, **kwargs):
+    parsed = urlparse(uri)
+    query = parse_qs(parsed.query)
+    return BoundedSessionService(
+        max_resident=int(query["max_resident"][0]) if "max_resident" in query else None,
+        db_path=(parsed.netloc + parsed.path) or None,
+    )
+
+
+def register(scheme: str = "bounded"):
+    """Registers `bounded://[path]?max_resident=N` as an ADK session service URI (for services.py)."""
+    from google.adk.cli.service_registry import get_service_registry
+
+    get_service_registry().register_session_service(scheme, _factory)
+
+
+# ---------------------------------------------------------------------------
+# Memory profiling harness
+# ---------------------------------------------------------------------------
+
+_WORDS = (
+    "python django api design scalable service latency team ownership mentoring kubernetes postgres "
+    "testing criteria evidence score strong gap experience years backend cloud deploy review rubric "
+    "candidate github repository commits architecture migration performance reliability incident "
+    "roadmap stakeholder delivery async queue cache observability security frontend data pipeline"
+).split()
+
+
+def _text(rng, words: int) -> str:
+    lines = []
+    for _ in range(max(1, words // 12)):
+        lines.append("- " + " ".join(rng.choice(_WORDS) for _ in range(12)))
+    return "\n".join(lines)
+
+
+def synthetic_conversation(rng, candidates: int) -> list:
+    """(author, text, state delta) turns shaped like a workflow session: JD, rubric, then per candidate
+    resume, evaluations and verdict."""
+    turns = [
+        ("user", "Job description - responsibilities, requirements, qualifications, we offer:\n" + _text(rng, 450), {}),
+    ]
+    rubric = "## EVALUATION RUBRIC\n" + _text(rng, 700)
+    turns.append(("HiringWorkflow", rubric, {workflow.RUBRIC: rubric, workflow.PHASE: workflow.AWAITING_RESUME}))
+    for i in range(candidates):
+        resume = (f"Candidate {i}\ncandidate{i}@example.com\nWork Experience\nAcme 2018 - present\n"
+                  "Education\nBachelor, University\n" + _text(rng, 450))
+        turns.append(("user", resume, {}))
+        for key, words in ((workflow.RESUME_EVALUATION, 800), (workflow.GITHUB_EVALUATION, 800), (workflow.VERDICT, 1000)):
+            text = f"## {key.upper()}\n" + _text(rng, words)
+            turns.append(("HiringWorkflow", text, {key: text}))
+    return turns
+
+
+async def _populate(service, sessions: int, candidates: int, seed: int = 7) -> list:
+    import random
+
+    from google.genai import types
+
+    rng = random.Random(seed)
+    ids = []
+    for n in range(sessions):
+        session = await service.create_session(app_name="hiring", user_id=f"recruiter-{n % 10}")
+        for author, text, delta in synthetic_conversation(rng, candidates):
+            role = "user" if author == "user" else "model"
+            event = Event(
+                author=author, invocation_id=f"inv-{n}",
+                content=types.Content(role=role, parts=[types.Part.from_text(text=text)]),
+            )
+            event.actions.state_delta.update(delta)
+            await service.append_event(session, event)
+        ids.append((session.user_id, session.id))
+    return ids
+
+
+def _measure(label: str, run) -> dict:
+    import asyncio
+    import gc
+    import tracemalloc
+
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    result = asyncio.run(run())
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    grown = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return {"label": label, "bytes": grown, "snapshot": after, "before": before, **(result or {})}
+
+
+def profile(sessions: int = 200, candidates: int = 5, max_resident: int = 50, github_users: int = 0, top: int = 0) -> list:
+    """
+    Populates N simulated sessions into the plain in-memory service and the bounded one, diffing
+    tracemalloc snapshots around each run; then deletes everything again to check for leaks.
+
+    Returns:
+        rows of (label, retained bytes, bytes per unit, unit)
+    """
+    import tracemalloc
+
+    tracemalloc.start()
+    rows = []
+    keep = {}
+
+    async def plain():
+        keep["plain"] = InMemorySessionService()
+        keep["plain_ids"] = await _populate(keep["plain"], sessions, candidates)
+
+    async def bounded(archive: bool):
+        service = BoundedSessionService(max_resident=max_resident, db_path=os.path.join(tmp, f"s{archive}.db"),
+                                        archive=archive)
+        keep["bounded"] = service
+        keep["bounded_ids"] = await _populate(service, sessions, candidates)
+        return {"stats": service.stats()}
+
+    async def drop(name):
+        service = keep.pop(name)
+        for user_id, session_id in keep.pop(f"{name}_ids"):
+            await service.delete_session(app_name="hiring", user_id=user_id, session_id=session_id)
+        keep[f"{name}_empty"] = service
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result = _measure("in-memory", plain)
+        rows.append(("InMemorySessionService", result["bytes"], result["bytes"] / sessions, "session"))
+        result = _measure("in-memory, all deleted", lambda: drop("plain"))
+        rows.append(("  after deleting every session", result["bytes"], None, "(leak check: ~ -above)"))
+
+        for archive in (False, True):
+            result = _measure("bounded", lambda: bounded(archive))
+            stats = result["stats"]
+            label = f"Bounded (resident {stats['resident']}/{sessions}{', archived turns' if archive else ''})"
+            rows.append((label, result["bytes"], result["bytes"] / sessions, "session"))
+            if archive and stats["archived_chunks"]:
+                rows.append(("  compressed finished candidate", stats["archived_bytes"],
+                             stats["archived_bytes"] / stats["archived_chunks"], "artifact"))
+            evicted_bytes = sum(len(row[0]) for row in keep["bounded"].db.execute("SELECT data FROM sessions"))
+            if stats["evicted"]:
+                rows.append(("  evicted session on disk", evicted_bytes, evicted_bytes / stats["evicted"], "session"))
+            if top:
+                for stat in result["snapshot"].compare_to(result["before"], "lineno")[:top]:
+                    print(f"    {stat}")
+            keep.pop("bounded")
+            keep.pop("bounded_ids")
+
+        if github_users:
+            rows.extend(_profile_github(github_users))
+    tracemalloc.stop()
+    return rows
+
+
+def _profile_github(users: int) -> list:
+    """Bytes held per cached GitHub response (ETag cache): what clearing the cache frees after `users` reviews."""
+    from . import github_api
+    from .fake_github import FakeGitHubServer
+    from .tools_agents import validate_github_user
+
+    with FakeGitHubServer() as server:
+        os.environ["GITHUB_API_URL"] = server.base_url
+        for i in range(users):
+            validate_github_user(f"profile-user-{i}")
+            github_api.get(f"/users/profile-user-{i}/repos", params={"per_page": 100, "sort": "pushed"}, timeout=10)
+        entries = len(github_api._etags)
+
+        async def clear():
+            with github_api._etags_lock:
+                github_api._etags.clear()
+
+        freed = -_measure("github", clear)["bytes"]
+    return [("GitHub ETag cache", freed, freed / max(1, entries), "artifact")]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Session memory tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    prof = subparsers.add_parser("profile", help="tracemalloc bytes per session and per cached artifact")
+    prof.add_argument("--sessions", type=int, default=200)
+    prof.add_argument("--candidates", type=int, default=5, help="candidates evaluated per session")
+    prof.add_argument("--max-resident", type=int, default=50)
+    prof.add_argument("--github-users", type=int, default=0, help="also profile the GitHub response cache")
+    prof.add_argument("--top", type=int, default=0, help="print the top allocation sites per bounded run")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    rows = profile(args.sessions, args.candidates, args.max_resident, args.github_users, args.top)
+    print(f"{'':<52} {'retained':>12} {'per unit':>10}")
+    for label, total, per_unit, unit in rows:
+        per = f"{per_unit / 1024:>8.1f} KB/{unit}" if per_unit is not None else f"  {unit}"
+        print(f"{label:<52} {total / 1024:>10.1f} KB {per}")
+    print(f"({time.perf_counter() - started:.1f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,359 @@
+"""
+Shadow evaluation: mirrors a sample of live ResumeReviewer / GitHubReviewer calls to an alternate
+model or prompt version, so a cheaper or faster model's score drift can be measured before switching.
+
+When a primary reviewer produces a scored evaluation, its input is - with probability
+SHADOW_SAMPLE_RATE - handed to a background pool that runs the same agent with SHADOW_MODEL and/or
+the instruction in SHADOW_PROMPT_FILE. The callback only makes a non-blocking hand-off: when
+SHADOW_CONCURRENCY mirrors are already running the sample is dropped, so shadow traffic never adds
+latency to the primary response. Mirrors run in the BATCH scheduler class, are not recorded as
+evaluations and are not charged to the requisition's token budget; each mirror stores both score
+sets, latencies and token counts side by side in the result store.
+
+Both sides are measured alike: timers start once the scheduler has admitted the first model call
+(queueing is not latency), and the primary is compared on its first scored sample - its score,
+latency and tokens from before self-consistency draws any extra samples.
+
+    SHADOW_MODEL=gemini-flash-lite-latest SHADOW_SAMPLE_RATE=0.2 adk web
+    python -m hiring_agent_adk.shadow report
+    python -m hiring_agent_adk.shadow show --agent ResumeReviewer --limit 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from . import cassette, config, metering, recording, rubrics, scheduler, workflow
+from .store import get_store
+
+# Primary agent name -> (registry name, evaluation stage)
+MIRRORED = {"ResumeReviewer": ("resume_reviewer", "resume"), "GitHubReviewer": ("github_reviewer", "github")}
+
+_primary = OrderedDict()  # invocation id -> {"started", "prompt_tokens", "completion_tokens"}
+_primary_lock = threading.Lock()
+_MAX_TRACKED = 1024
+
+_pool = None
+_pool_lock = threading.Lock()
+_shadow_agents = {}
+_running = 0
+_dropped = 0
+
+
+def enabled() -> bool:
+    return float(config.getenv("SHADOW_SAMPLE_RATE", 0) or 0) > 0 and bool(
+        config.getenv("SHADOW_MODEL") or config.getenv("SHADOW_PROMPT_FILE")
+    )
+
+
+def prompt_version() -> str:
+    """Label of the shadow prompt: the SHADOW_PROMPT_FILE name, or "default"."""
+    path = config.getenv("SHADOW_PROMPT_FILE")
+    return os.path.splitext(os.path.basename(path))[0] if path else "default"
+
+
+def _usage(llm_response) -> tuple:
+    metadata = llm_response.usage_metadata
+    if metadata is None:
+        return 0, 0
+    return metadata.prompt_token_count or 0, (metadata.candidates_token_count or 0) + (metadata.thoughts_token_count or 0)
+
+
+# ---------------------------------------------------------------------------
+# Primary side: callbacks on the mirrored agents
+# ---------------------------------------------------------------------------
+
+
+def before_model_callback(callback_context, llm_request):
+    """Notes when the primary invocation's first model call was admitted (register it after the scheduler)."""
+    if callback_context.agent_name in MIRRORED and enabled():
+        with _primary_lock:
+            _primary.setdefault(
+                callback_context.invocation_id, {"started": time.monotonic(), "prompt_tokens": 0, "completion_tokens": 0}
+            )
+            while len(_primary) > _MAX_TRACKED:
+                _primary.popitem(last=False)
+    return None
+
+
+def measure_model_callback(callback_context, llm_response):
+    """
+    Adds up the primary's tokens and keeps its first scored sample with its latency. Register it
+    before any callback that changes the response (self-consistency adds its samples' usage).
+    """
+    if llm_response.partial or callback_context.agent_name not in MIRRORED:
+        return None
+    with _primary_lock:
+        tracked = _primary.get(callback_context.invocation_id)
+        if tracked is None or "parsed" in tracked:
+            return None
+        prompt_tokens, completion_tokens = _usage(llm_response)
+        tracked["prompt_tokens"] += prompt_tokens
+        tracked["completion_tokens"] += completion_tokens
+    parsed = rubrics.parse_evaluation(recording._response_text(llm_response), MIRRORED[callback_context.agent_name][1])
+    if parsed["criteria"]:
+        tracked["latency_ms"] = round((time.monotonic() - tracked["started"]) * 1000, 1)
+        tracked["parsed"] = parsed
+    return None  # otherwise a tool call or an unparseable reply; the invocation continues
+
+
+def after_model_callback(callback_context, llm_response):
+    """Once the primary has produced scores (see measure_model_callback), maybe hands its input to a mirror."""
+    if llm_response.partial or callback_context.agent_name not in MIRRORED:
+        return None
+    with _primary_lock:
+        tracked = _primary.get(callback_context.invocation_id)
+        if tracked is None or "parsed" not in tracked:
+            return None
+        _primary.pop(callback_context.invocation_id, None)
+
+    name, stage = MIRRORED[callback_context.agent_name]
+    state = callback_context.state
+    if (
+        random.random() >= float(config.getenv("SHADOW_SAMPLE_RATE", 0))
+        # Mirrors call GitHub too, which would end up in the recording
+        or cassette.active() is not None
+        or metering.level(state.get("requisition_id")) != metering.OK
+    ):
+        return None
+    primary = {**tracked, "model": llm_response.model_version or config.model_name()}
+    submit(name, stage, recording._user_text(callback_context), primary,
+           state.get("requisition_id"), state.get("candidate_id"))
+    return None
+
+
+def submit(name: str, stage: str, message: str, primary: dict, requisition_id=None, candidate_id=None) -> bool:
+    """Starts a mirror in the background; False (and dropped) when SHADOW_CONCURRENCY are already running."""
+    global _pool, _running, _dropped
+    concurrency = int(config.getenv("SHADOW_CONCURRENCY", 2))
+    with _pool_lock:
+        if _running >= concurrency:
+            _dropped += 1
+            return False
+        _running += 1
+        if _pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            _pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="shadow")
+    team = scheduler.current()[1]
+    _pool.submit(_mirror, name, stage, message, primary, requisition_id, candidate_id, team)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Shadow side
+# ---------------------------------------------------------------------------
+
+
+def _shadow_before(callback_context, llm_request):
+    # Runs after the scheduler has granted a slot, so queueing isn't counted as model latency
+    if "shadow_started" not in callback_context.state:
+        callback_context.state["shadow_started"] = time.monotonic()
+    return None
+
+
+def _shadow_after(callback_context, llm_response):
+    if llm_response.partial:
+        return None
+    prompt_tokens, completion_tokens = _usage(llm_response)
+    state = callback_context.state
+    state["shadow_prompt_tokens"] = state.get("shadow_prompt_tokens", 0) + prompt_tokens
+    state["shadow_completion_tokens"] = state.get("shadow_completion_tokens", 0) + completion_tokens
+    state["shadow_finished"] = time.monotonic()
+    return None
+
+
+def shadow_agent(name: str):
+    """The mirrored agent with the shadow model / instruction and no recording or metering callbacks."""
+    with _pool_lock:
+        agent = _shadow_agents.get(name)
+    if agent is None:
+        from .tools_agents import get_agent
+
+        update = {
+            "before_model_callback": [scheduler.before_model_callback, _shadow_before],
+            "after_model_callback": [scheduler.after_model_callback, _shadow_after],
+            "on_model_error_callback": [scheduler.on_model_error_callback],
+        }
+        if config.getenv("SHADOW_MODEL"):
+            update["model"] = config.getenv("SHADOW_MODEL")
+        if config.getenv("SHADOW_PROMPT_FILE"):
+            with open(config.getenv("SHADOW_PROMPT_FILE"), encoding="utf-8") as handle:
+                update["instruction"] = handle.read()
+        agent = get_agent(name).clone(update=update)
+        with _pool_lock:
+            agent = _shadow_agents.setdefault(name, agent)
+    return agent
+
+
+def _mirror(name, stage, message, primary, requisition_id, candidate_id, team):
+    from .runtime import run_agent_session_async
+
+    row = {
+        "agent": next((agent for agent, (key, _) in MIRRORED.items() if key == name), name),
+        "requisition_id": requisition_id, "candidate_id": candidate_id,
+        "primary_model": primary["model"], "shadow_model": config.getenv("SHADOW_MODEL"),
+        "prompt_version": prompt_version(),
+        "primary_total": _normalised(primary["parsed"]), "primary_criteria": _scores(primary["parsed"]),
+        "primary_latency_ms": primary["latency_ms"],
+        "primary_prompt_tokens": primary["prompt_tokens"], "primary_completion_tokens": primary["completion_tokens"],
+    }
+    try:
+        # Inside the try: a missing prompt file or a failed clone is recorded and still frees the slot
+        agent = shadow_agent(name)
+        row["shadow_model"] = (
+            agent.model if isinstance(agent.model, str) else getattr(agent.model, "model", str(agent.model))
+        )
+        with scheduler.priority(scheduler.BATCH, team):
+            text, state = asyncio.run(run_agent_session_async(agent, message))
+        parsed = rubrics.parse_evaluation(text, stage)
+        row.update(
+            shadow_total=_normalised(parsed) if parsed["criteria"] else None,
+            shadow_criteria=_scores(parsed),
+            shadow_latency_ms=round((state["shadow_finished"] - state["shadow_started"]) * 1000, 1)
+            if "shadow_started" in state else None,
+            shadow_prompt_tokens=state.get("shadow_prompt_tokens", 0),
+            shadow_completion_tokens=state.get("shadow_completion_tokens", 0),
+            error=None if parsed["criteria"] else "unparseable evaluation",
+        )
+    except Exception as error:  # a failed mirror must never surface anywhere else
+        row["error"] = f"{type(error).__name__}: {error}"
+    finally:
+        _finished()
+    get_store().add_shadow_run(row)
+
+
+def _finished():
+    global _running
+    with _pool_lock:
+        _running -= 1
+
+
+def _normalised(parsed: dict):
+    return round(10 * parsed["total"] / parsed["max_total"], 2) if parsed["max_total"] else None
+
+
+def _scores(parsed: dict) -> dict:
+    return {key: [criterion["score"], criterion["max_points"]] for key, criterion in parsed["criteria"].items()}
+
+
+def stats() -> dict:
+    return {"enabled": enabled(), "running": _running, "dropped": _dropped}
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+
+def _percentile(values: list, p: float):
+    values = sorted(v for v in values if v is not None)
+    return values[min(len(values) - 1, int(p * len(values)))] if values else None
+
+
+def _mean(values: list):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def report(agent: str = None) -> list:
+    """
+    Score agreement against latency and cost savings, per (agent, shadow model, prompt version).
+
+    Returns:
+        list of dicts: runs, errors, mean / max |Δscore| (/10), decision agreement at workflow.PASS_LINE,
+        share within 1 point, per-criterion mean |Δ|, p50/p95 latencies and cost per evaluation
+    """
+    groups = {}
+    for row in get_store().shadow_runs(agent):
+        groups.setdefault((row["agent"], row["shadow_model"], row["prompt_version"]), []).append(row)
+
+    results = []
+    for (agent_name, shadow_model, version), rows in sorted(groups.items()):
+        ok = [row for row in rows if not row["error"] and row["primary_total"] is not None]
+        deltas = [abs(row["shadow_total"] - row["primary_total"]) for row in ok]
+        criteria = {}
+        for row in ok:
+            for key, (score, max_points) in row["primary_criteria"].items():
+                if key in row["shadow_criteria"] and max_points:
+                    shadow_score = row["shadow_criteria"][key][0]
+                    criteria.setdefault(key, []).append(abs(shadow_score - score) / max_points * 10)
+        primary_cost = _mean([
+            metering.cost(row["primary_prompt_tokens"], row["primary_completion_tokens"], row["primary_model"]) for row in ok
+        ])
+        shadow_cost = _mean([
+            metering.cost(row["shadow_prompt_tokens"], row["shadow_completion_tokens"], shadow_model) for row in ok
+        ])
+        primary_p50 = _percentile([row["primary_latency_ms"] for row in ok], 0.5)
+        shadow_p50 = _percentile([row["shadow_latency_ms"] for row in ok], 0.5)
+        results.append({
+            "agent": agent_name,
+            "shadow_model": shadow_model,
+            "prompt_version": version,
+            "runs": len(rows),
+            "errors": len(rows) - len(ok),
+            "mean_abs_delta": round(_mean(deltas), 2) if deltas else None,
+            "max_abs_delta": round(max(deltas), 2) if deltas else None,
+            "within_1_point": round(sum(d <= 1 for d in deltas) / len(deltas), 3) if deltas else None,
+            "decision_agreement": round(sum(
+                (row["primary_total"] >= workflow.PASS_LINE) == (row["shadow_total"] >= workflow.PASS_LINE) for row in ok
+            ) / len(ok), 3) if ok else None,
+            "criteria_mean_abs_delta": {key: round(_mean(values), 2) for key, values in sorted(criteria.items())},
+            "primary_latency_ms": {"p50": primary_p50, "p95": _percentile([row["primary_latency_ms"] for row in ok], 0.95)},
+            "shadow_latency_ms": {"p50": shadow_p50, "p95": _percentile([row["shadow_latency_ms"] for row in ok], 0.95)},
+            "latency_saving": round(1 - shadow_p50 / primary_p50, 3) if primary_p50 and shadow_p50 is not None else None,
+            "primary_cost_usd": round(primary_cost, 6) if primary_cost is not None else None,
+            "shadow_cost_usd": round(shadow_cost, 6) if shadow_cost is not None else None,
+            "cost_saving": round(1 - shadow_cost / primary_cost, 3) if primary_cost else None,
+        })
+    return results
+
+
+def _pct(value) -> str:
+    return f"{value * 100:.0f}%" if value is not None else "-"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare shadow evaluations against the primary model.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    report_parser = subparsers.add_parser("report", help="score agreement vs. latency and cost savings")
+    report_parser.add_argument("--agent", help="ResumeReviewer or GitHubReviewer")
+    report_parser.add_argument("--json", action="store_true")
+    show = subparsers.add_parser("show", help="individual shadow runs, newest first (JSON)")
+    show.add_argument("--agent")
+    show.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        print(json.dumps(get_store().shadow_runs(args.agent)[:args.limit], indent=2))
+        return 0
+    results = report(args.agent)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    if not results:
+        print("No shadow runs recorded yet (set SHADOW_SAMPLE_RATE and SHADOW_MODEL or SHADOW_PROMPT_FILE).")
+        return 0
+    for entry in results:
+        print(f"{entry['agent']} -> {entry['shadow_model']} (prompt {entry['prompt_version']}): "
+              f"{entry['runs']} runs, {entry['errors']} errors")
+        print(f"  score |Δ| mean {entry['mean_abs_delta']} / max {entry['max_abs_delta']} (out of 10), "
+              f"within 1 point {_pct(entry['within_1_point'])}, "
+              f"pass/fail agreement at {workflow.PASS_LINE} {_pct(entry['decision_agreement'])}")
+        for key, delta in entry["criteria_mean_abs_delta"].items():
+            print(f"    {key:<40} |Δ| {delta}")
+        print(f"  latency p50 {entry['primary_latency_ms']['p50']} -> {entry['shadow_latency_ms']['p50']} ms, "
+              f"p95 {entry['primary_latency_ms']['p95']} -> {entry['shadow_latency_ms']['p95']} ms "
+              f"(saving {_pct(entry['latency_saving'])})")
+        print(f"  cost per evaluation ${entry['primary_cost_usd']} -> ${entry['shadow_cost_usd']} "
+              f"(saving {_pct(entry['cost_saving'])})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,585 @@
+"""
+SQLite-backed store of rubrics and structured evaluation results, keyed by requisition and candidate.
+
+Evaluations recorded here are what incremental re-scoring, exports and rankings work from, so a
+rubric change doesn't require replaying chat transcripts.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from . import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rubrics (
+    requisition_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    markdown TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (requisition_id, version)
+);
+CREATE TABLE IF NOT EXISTS job_descriptions (
+    requisition_id TEXT NOT NULL,
+    rubric_version INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    signature_json TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (requisition_id, rubric_version)
+);
+CREATE TABLE IF NOT EXISTS requisition_status (
+    requisition_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS evaluations (
+    requisition_id TEXT NOT NULL,
+    candidate_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    candidate_name TEXT,
+    rubric_version INTEGER,
+    input_text TEXT,
+    markdown TEXT,
+    total REAL,
+    max_total REAL,
+    criteria_json TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (requisition_id, candidate_id, stage)
+);
+CREATE TABLE IF NOT EXISTS validations (
+    requisition_id TEXT NOT NULL,
+    candidate_id TEXT NOT NULL,
+    username TEXT,
+    status TEXT,
+    public_repos INTEGER,
+    account_age_years REAL,
+    profile_completeness TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (requisition_id, candidate_id)
+);
+CREATE TABLE IF NOT EXISTS verdicts (
+    requisition_id TEXT NOT NULL,
+    candidate_id TEXT NOT NULL,
+    verdict TEXT,
+    confidence TEXT,
+    composite_score REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (requisition_id, candidate_id)
+);
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    name TEXT PRIMARY KEY,
+    backend TEXT NOT NULL,
+    requisition_id TEXT NOT NULL,
+    rubric_version INTEGER,
+    state TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    imported INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    input_path TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS token_usage (
+    requisition_id TEXT NOT NULL,
+    candidate_id TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    cost_usd REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (requisition_id, candidate_id, agent)
+);
+CREATE TABLE IF NOT EXISTS budgets (
+    requisition_id TEXT PRIMARY KEY,
+    soft_tokens INTEGER,
+    hard_tokens INTEGER,
+    soft_usd REAL,
+    hard_usd REAL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS evaluation_samples (
+    requisition_id TEXT NOT NULL,
+    candidate_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    samples INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (requisition_id, candidate_id, stage)
+);
+CREATE TABLE IF NOT EXISTS shadow_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent TEXT NOT NULL,
+    requisition_id TEXT,
+    candidate_id TEXT,
+    primary_model TEXT,
+    shadow_model TEXT,
+    prompt_version TEXT,
+    primary_total REAL,
+    shadow_total REAL,
+    primary_criteria_json TEXT,
+    shadow_criteria_json TEXT,
+    primary_latency_ms REAL,
+    shadow_latency_ms REAL,
+    primary_prompt_tokens INTEGER,
+    primary_completion_tokens INTEGER,
+    shadow_prompt_tokens INTEGER,
+    shadow_completion_tokens INTEGER,
+    error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ats_cursors (
+    source TEXT PRIMARY KEY,
+    cursor TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ats_applications (
+    source TEXT NOT NULL,
+    application_id TEXT NOT NULL,
+    candidate_id TEXT NOT NULL,
+    requisition_id TEXT NOT NULL,
+    resume TEXT NOT NULL,
+    github_username TEXT,
+    content_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    job_id TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (source, application_id)
+);
+CREATE INDEX IF NOT EXISTS ats_applications_hash ON ats_applications (requisition_id, content_hash);
+CREATE INDEX IF NOT EXISTS ats_applications_candidate ON ats_applications (requisition_id, candidate_id);
+CREATE INDEX IF NOT EXISTS ats_applications_status ON ats_applications (source, status, updated_at);
+CREATE TABLE IF NOT EXISTS step_profiles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT,
+    step TEXT NOT NULL,
+    path TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    wall_ms REAL NOT NULL,
+    samples INTEGER NOT NULL,
+    blocked_samples INTEGER NOT NULL,
+    interval_ms REAL NOT NULL,
+    stacks_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS step_profiles_run ON step_profiles (run_id, started_at);
+CREATE TABLE IF NOT EXISTS export_watermarks (
+    target TEXT PRIMARY KEY,
+    watermark REAL NOT NULL
+);
+"""
+
+
+class ResultStore:
+    """Thread-safe wrapper around one SQLite database file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def execute(self, sql: str, params=()):
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params).fetchall()
+
+    # --- rubrics -----------------------------------------------------------
+
+    def add_rubric(self, requisition_id: str, markdown: str) -> int:
+        """Stores a new rubric version for the requisition and returns its version number."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT COALESCE(MAX(version), 0) FROM rubrics WHERE requisition_id = ?", (requisition_id,)
+            ).fetchone()
+            version = row[0] + 1
+            self._conn.execute(
+                "INSERT INTO rubrics VALUES (?, ?, ?, ?)", (requisition_id, version, markdown, time.time())
+            )
+            return version
+
+    def rubric(self, requisition_id: str, version: int = None):
+        """Returns (version, markdown) for the given or latest version, or None."""
+        if version is None:
+            rows = self.execute(
+                "SELECT version, markdown FROM rubrics WHERE requisition_id = ? ORDER BY version DESC LIMIT 1",
+                (requisition_id,),
+            )
+        else:
+            rows = self.execute(
+                "SELECT version, markdown FROM rubrics WHERE requisition_id = ? AND version = ?",
+                (requisition_id, version),
+            )
+        return (rows[0]["version"], rows[0]["markdown"]) if rows else None
+
+    def add_job_description(self, requisition_id: str, rubric_version: int, text: str, signature: list):
+        """Stores the JD a rubric version was built for, with its MinHash signature (see jd_index)."""
+        self.execute(
+            "INSERT OR REPLACE INTO job_descriptions VALUES (?, ?, ?, ?, ?)",
+            (requisition_id, rubric_version, text, json.dumps(signature), time.time()),
+        )
+
+    def job_description(self, requisition_id: str):
+        """The JD behind the requisition's latest indexed rubric version, or None."""
+        rows = self.execute(
+            "SELECT text FROM job_descriptions WHERE requisition_id = ? ORDER BY rubric_version DESC LIMIT 1",
+            (requisition_id,),
+        )
+        return rows[0]["text"] if rows else None
+
+    def job_descriptions(self) -> list:
+        rows = self.execute("SELECT * FROM job_descriptions ORDER BY created_at")
+        return [{**dict(row), "signature": json.loads(row["signature_json"])} for row in rows]
+
+    def open_rubrics(self) -> dict:
+        """requisition_id -> latest rubric Markdown, for every requisition not marked closed."""
+        rows = self.execute(
+            """
+            SELECT r.requisition_id, r.markdown FROM rubrics r
+            JOIN (SELECT requisition_id, MAX(version) AS version FROM rubrics GROUP BY requisition_id) latest
+                USING (requisition_id, version)
+            LEFT JOIN requisition_status s USING (requisition_id)
+            WHERE COALESCE(s.status, 'open') != 'closed'
+            ORDER BY r.requisition_id
+            """
+        )
+        return {row["requisition_id"]: row["markdown"] for row in rows}
+
+    def set_requisition_status(self, requisition_id: str, status: str):
+        """Marks a requisition "open" or "closed" (closed ones are skipped by matching)."""
+        self.execute(
+            "INSERT OR REPLACE INTO requisition_status VALUES (?, ?, ?)", (requisition_id, status, time.time())
+        )
+
+    # --- evaluations -------------------------------------------------------
+
+    def put_evaluation(self, requisition_id, candidate_id, stage, *, criteria, total, max_total,
+                       rubric_version=None, candidate_name=None, input_text=None, markdown=None):
+        self.execute(
+            """
+            INSERT INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (requisition_id, candidate_id, stage) DO UPDATE SET
+                candidate_name = COALESCE(excluded.candidate_name, candidate_name),
+                rubric_version = excluded.rubric_version,
+                input_text = COALESCE(excluded.input_text, input_text),
+                markdown = COALESCE(excluded.markdown, markdown),
+                total = excluded.total,
+                max_total = excluded.max_total,
+                criteria_json = excluded.criteria_json,
+                updated_at = excluded.updated_at
+            """,
+            (
+                requisition_id, candidate_id, stage, candidate_name, rubric_version, input_text,
+                markdown, total, max_total, json.dumps(criteria), time.time(),
+            ),
+        )
+
+    def evaluations(self, requisition_id: str, stage: str = None) -> list:
+        """All evaluations for a requisition (optionally one stage) as dicts with parsed criteria."""
+        sql = "SELECT * FROM evaluations WHERE requisition_id = ?"
+        params = [requisition_id]
+        if stage:
+            sql += " AND stage = ?"
+            params.append(stage)
+        rows = self.execute(sql + " ORDER BY candidate_id, stage", params)
+        return [{**dict(row), "criteria": json.loads(row["criteria_json"])} for row in rows]
+
+    def rankings(self, requisition_id: str) -> list:
+        """Candidates ordered by resume score, then GitHub score (both normalised to /10)."""
+        candidates = {}
+        for evaluation in self.evaluations(requisition_id):
+            entry = candidates.setdefault(evaluation["candidate_id"], {
+                "candidate_id": evaluation["candidate_id"],
+                "candidate_name": evaluation["candidate_name"],
+                "resume_score": None,
+                "github_score": None,
+            })
+            if evaluation["max_total"]:
+                score = round(10 * evaluation["total"] / evaluation["max_total"], 2)
+                entry[f"{evaluation['stage']}_score"] = score
+            entry["candidate_name"] = entry["candidate_name"] or evaluation["candidate_name"]
+        ranked = sorted(
+            candidates.values(),
+            key=lambda c: (c["resume_score"] or 0, c["github_score"] or 0),
+            reverse=True,
+        )
+        for rank, entry in enumerate(ranked, start=1):
+            entry["rank"] = rank
+        return ranked
+
+    def put_samples(self, requisition_id, candidate_id, stage, samples: int):
+        """How many model samples the latest evaluation of a candidate took (see self_consistency.py)."""
+        self.execute(
+            "INSERT OR REPLACE INTO evaluation_samples VALUES (?, ?, ?, ?, ?)",
+            (requisition_id, candidate_id, stage, samples, time.time()),
+        )
+
+    def samples(self, requisition_id: str = None, candidate_id: str = None) -> list:
+        sql, params = "SELECT * FROM evaluation_samples WHERE 1 = 1", []
+        for column, value in (("requisition_id", requisition_id), ("candidate_id", candidate_id)):
+            if value:
+                sql += f" AND {column} = ?"
+                params.append(value)
+        return [dict(row) for row in self.execute(sql + " ORDER BY requisition_id, candidate_id, stage", params)]
+
+    # --- GitHub validations and verdicts ----------------------------------
+
+    def put_validation(self, requisition_id, candidate_id, result: dict):
+        """Stores the analytics-relevant fields of a github_validator result."""
+        self.execute(
+            "INSERT OR REPLACE INTO validations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                requisition_id, candidate_id, result.get("username"), result.get("status"),
+                result.get("public_repos"), result.get("account_age_years"),
+                result.get("profile_completeness"), time.time(),
+            ),
+        )
+
+    def put_verdict(self, requisition_id, candidate_id, verdict, confidence=None, composite_score=None):
+        self.execute(
+            "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?)",
+            (requisition_id, candidate_id, verdict, confidence, composite_score, time.time()),
+        )
+
+    def verdicts(self, requisition_id: str) -> dict:
+        """candidate_id -> {verdict, confidence, composite_score} for a requisition."""
+        rows = self.execute(
+            "SELECT candidate_id, verdict, confidence, composite_score FROM verdicts WHERE requisition_id = ?",
+            (requisition_id,),
+        )
+        return {row["candidate_id"]: dict(row) for row in rows}
+
+    # --- offline batch jobs ------------------------------------------------
+
+    def add_batch_job(self, name, backend, requisition_id, rubric_version, requests: int, input_path=None):
+        now = time.time()
+        self.execute(
+            "INSERT INTO batch_jobs VALUES (?, ?, ?, ?, 'submitted', ?, 0, 0, ?, ?, ?)",
+            (name, backend, requisition_id, rubric_version, requests, input_path, now, now),
+        )
+
+    def batch_job(self, name: str):
+        rows = self.execute("SELECT * FROM batch_jobs WHERE name = ?", (name,))
+        return dict(rows[0]) if rows else None
+
+    def batch_jobs(self) -> list:
+        return [dict(row) for row in self.execute("SELECT * FROM batch_jobs ORDER BY created_at DESC")]
+
+    def update_batch_job(self, name: str, **fields):
+        """Updates state / imported / failed counters of a batch job."""
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        self.execute(
+            f"UPDATE batch_jobs SET {assignments}, updated_at = ? WHERE name = ?",
+            (*fields.values(), time.time(), name),
+        )
+
+    # --- token metering ----------------------------------------------------
+
+    def add_usage(self, requisition_id, candidate_id, agent, prompt_tokens: int, completion_tokens: int, cost_usd: float):
+        """Adds one model call to the running totals of (requisition, candidate, agent)."""
+        self.execute(
+            """
+            INSERT INTO token_usage VALUES (?, ?, ?, 1, ?, ?, ?, ?)
+            ON CONFLICT (requisition_id, candidate_id, agent) DO UPDATE SET
+                calls = calls + 1,
+                prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                completion_tokens = completion_tokens + excluded.completion_tokens,
+                cost_usd = cost_usd + excluded.cost_usd,
+                updated_at = excluded.updated_at
+            """,
+            (requisition_id, candidate_id, agent, prompt_tokens, completion_tokens, cost_usd, time.time()),
+        )
+
+    def usage(self, requisition_id: str = None) -> list:
+        """Usage rows (one per requisition, candidate and agent), optionally for one requisition."""
+        if requisition_id is None:
+            rows = self.execute("SELECT * FROM token_usage ORDER BY requisition_id, candidate_id, agent")
+        else:
+            rows = self.execute(
+                "SELECT * FROM token_usage WHERE requisition_id = ? ORDER BY candidate_id, agent", (requisition_id,)
+            )
+        return [dict(row) for row in rows]
+
+    def usage_totals(self, requisition_id: str) -> dict:
+        """{tokens, cost_usd} spent on a requisition so far."""
+        row = self.execute(
+            "SELECT COALESCE(SUM(prompt_tokens + completion_tokens), 0) AS tokens, COALESCE(SUM(cost_usd), 0) AS cost_usd "
+            "FROM token_usage WHERE requisition_id = ?",
+            (requisition_id,),
+        )[0]
+        return dict(row)
+
+    def set_budget(self, requisition_id, soft_tokens=None, hard_tokens=None, soft_usd=None, hard_usd=None):
+        """Per-requisition limits; None leaves that limit to the environment default."""
+        self.execute(
+            "INSERT OR REPLACE INTO budgets VALUES (?, ?, ?, ?, ?, ?)",
+            (requisition_id, soft_tokens, hard_tokens, soft_usd, hard_usd, time.time()),
+        )
+
+    def budget(self, requisition_id: str):
+        rows = self.execute("SELECT * FROM budgets WHERE requisition_id = ?", (requisition_id,))
+        return dict(rows[0]) if rows else None
+
+    # --- shadow evaluations -----------------------------------------------
+
+    def add_shadow_run(self, row: dict):
+        """Stores one primary-vs-shadow comparison (see shadow.py)."""
+        self.execute(
+            """
+            INSERT INTO shadow_runs (
+                agent, requisition_id, candidate_id, primary_model, shadow_model, prompt_version,
+                primary_total, shadow_total, primary_criteria_json, shadow_criteria_json,
+                primary_latency_ms, shadow_latency_ms, primary_prompt_tokens, primary_completion_tokens,
+                shadow_prompt_tokens, shadow_completion_tokens, error, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                row["agent"], row.get("requisition_id"), row.get("candidate_id"), row.get("primary_model"),
+                row.get("shadow_model"), row.get("prompt_version"), row.get("primary_total"), row.get("shadow_total"),
+                json.dumps(row.get("primary_criteria") or {}), json.dumps(row.get("shadow_criteria") or {}),
+                row.get("primary_latency_ms"), row.get("shadow_latency_ms"),
+                row.get("primary_prompt_tokens", 0), row.get("primary_completion_tokens", 0),
+                row.get("shadow_prompt_tokens", 0), row.get("shadow_completion_tokens", 0),
+                row.get("error"), time.time(),
+            ),
+        )
+
+    def shadow_runs(self, agent: str = None) -> list:
+        """Shadow comparisons, newest first, with parsed criteria."""
+        sql, params = "SELECT * FROM shadow_runs", ()
+        if agent:
+            sql, params = sql + " WHERE agent = ?", (agent,)
+        rows = self.execute(sql + " ORDER BY id DESC", params)
+        return [
+            {
+                **{key: row[key] for key in row.keys() if not key.endswith("_json")},
+                "primary_criteria": json.loads(row["primary_criteria_json"] or "{}"),
+                "shadow_criteria": json.loads(row["shadow_criteria_json"] or "{}"),
+            }
+            for row in rows
+        ]
+
+    # --- ATS sync ---------------------------------------------------------
+
+    def ats_cursor(self, source: str):
+        rows = self.execute("SELECT cursor FROM ats_cursors WHERE source = ?", (source,))
+        return rows[0]["cursor"] if rows else None
+
+    def set_ats_cursor(self, source: str, cursor: str):
+        self.execute("INSERT OR REPLACE INTO ats_cursors VALUES (?, ?, ?)", (source, cursor, time.time()))
+
+    def ats_application(self, source: str, application_id: str):
+        rows = self.execute(
+            "SELECT * FROM ats_applications WHERE source = ? AND application_id = ?", (source, application_id)
+        )
+        return dict(rows[0]) if rows else None
+
+    def ats_seen(self, source: str, application: dict) -> bool:
+        """True if another application to the same requisition came from this candidate or had exactly this content."""
+        rows = self.execute(
+            """
+            SELECT 1 FROM ats_applications
+            WHERE requisition_id = ? AND (candidate_id = ? OR content_hash = ?)
+                AND NOT (source = ? AND application_id = ?)
+            LIMIT 1
+            """,
+            (
+                application["requisition_id"], application["candidate_id"], application["content_hash"],
+                source, application["application_id"],
+            ),
+        )
+        return bool(rows)
+
+    def put_ats_application(self, source: str, application: dict, status: str):
+        self.execute(
+            """
+            INSERT OR REPLACE INTO ats_applications
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, NULL, ?)
+            """,
+            (
+                source, application["application_id"], application["candidate_id"], application["requisition_id"],
+                application["resume"], application.get("github_username"), application["content_hash"], status,
+                time.time(),
+            ),
+        )
+
+    def ats_applications(self, source: str, status: str) -> list:
+        rows = self.execute(
+            "SELECT * FROM ats_applications WHERE source = ? AND status = ? ORDER BY updated_at", (source, status)
+        )
+        return [dict(row) for row in rows]
+
+    def set_ats_status(self, source, application_id, status, content_hash, job_id=None, error=None):
+        """Updates an application's status unless it has changed (another content hash) since."""
+        self.execute(
+            """
+            UPDATE ats_applications SET status = ?, job_id = ?, error = ?, updated_at = ?
+            WHERE source = ? AND application_id = ? AND content_hash = ?
+            """,
+            (status, job_id, error, time.time(), source, application_id, content_hash),
+        )
+
+    def reset_ats_status(self, source: str, old: str, new: str) -> int:
+        count = self.execute(
+            "SELECT COUNT(*) AS n FROM ats_applications WHERE source = ? AND status = ?", (source, old)
+        )[0]["n"]
+        self.execute("UPDATE ats_applications SET status = ? WHERE source = ? AND status = ?", (new, source, old))
+        return count
+
+    def ats_status(self) -> dict:
+        """source -> {"cursor", status -> count}"""
+        sources = {row["source"]: {"cursor": row["cursor"]} for row in self.execute("SELECT * FROM ats_cursors")}
+        for row in self.execute("SELECT source, status, COUNT(*) AS n FROM ats_applications GROUP BY source, status"):
+            sources.setdefault(row["source"], {"cursor": None})[row["status"]] = row["n"]
+        return sources
+
+    # --- step profiles ----------------------------------------------------
+
+    def add_step_profile(self, row: dict):
+        """Stores one profiled step with its folded stacks (see profiling.py)."""
+        self.execute(
+            "INSERT INTO step_profiles VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                row.get("run_id"), row["step"], row["path"], row["started_at"], row["wall_ms"], row["samples"],
+                row["blocked_samples"], row["interval_ms"], json.dumps(row["stacks"]),
+            ),
+        )
+
+    def step_profiles(self, run_id: str = None, since: float = None) -> list:
+        """Profiled steps in start order, with parsed stacks; optionally one run's or those started after `since`."""
+        sql, clauses, params = "SELECT * FROM step_profiles", [], []
+        if run_id:
+            clauses.append("run_id = ?")
+            params.append(run_id)
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(since)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        rows = self.execute(sql + " ORDER BY started_at, id", params)
+        return [
+            {**{key: row[key] for key in row.keys() if key != "stacks_json"}, "stacks": json.loads(row["stacks_json"])}
+            for row in rows
+        ]
+
+    # --- export bookkeeping -----------------------------------------------
+
+    def watermark(self, target: str) -> float:
+        rows = self.execute("SELECT watermark FROM export_watermarks WHERE target = ?", (target,))
+        return rows[0]["watermark"] if rows else 0.0
+
+    def set_watermark(self, target: str, watermark: float):
+        self.execute("INSERT OR REPLACE INTO export_watermarks VALUES (?, ?)", (target, watermark))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> ResultStore:
+    """Process-wide store at RESULTS_DB_PATH (default: hiring_results.db in the working directory)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResultStore(config.getenv("RESULTS_DB_PATH", "hiring_results.db"))
+        return _store
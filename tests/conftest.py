@@ -0,0 +1,11 @@
+import pytest
+
+from .. import store
+
+
+@pytest.fixture
+def result_store(tmp_path, monkeypatch):
+    """A fresh result store in a temporary directory, returned by get_store() for the test."""
+    fresh = store.ResultStore(str(tmp_path / "results.db"))
+    monkeypatch.setattr(store, "_store", fresh)
+    return fresh
@@ -0,0 +1,91 @@
+import time
+
+from ..backpressure import AIMDLimiter, CircuitBreaker
+
+
+def test_limiter_caps_in_flight_calls():
+    limiter = AIMDLimiter(initial_limit=2)
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert not limiter.acquire(timeout=0)
+    assert limiter.snapshot()["rejections"] == 1
+
+
+def test_limiter_grows_additively_on_success():
+    limiter = AIMDLimiter(initial_limit=4, max_limit=5)
+    for _ in range(4):
+        limiter.try_acquire()
+        limiter.release(0.1, True)
+    assert 4.9 < limiter.limit < 5  # about one slot per window of `limit` successes
+    for _ in range(10):
+        limiter.try_acquire()
+        limiter.release(0.1, True)
+    assert limiter.limit == 5
+
+
+def test_limiter_halves_on_failure_and_latency_spike():
+    limiter = AIMDLimiter(initial_limit=16, min_limit=2)
+    limiter.try_acquire()
+    limiter.release(0.1, True)
+    limit = limiter.limit
+    limiter.try_acquire()
+    limiter.release(0.1, False)
+    assert limiter.limit == limit / 2
+    limit = limiter.limit
+    limiter.try_acquire()
+    limiter.release(1.0, True)  # 10x the baseline
+    assert limiter.limit == limit / 2
+    for _ in range(5):
+        limiter.try_acquire()
+        limiter.release(0.1, False)
+    assert limiter.limit == 2
+
+
+def test_limiter_release_without_outcome_keeps_limit():
+    limiter = AIMDLimiter(initial_limit=4)
+    limiter.try_acquire()
+    limiter.release(0.1, None)
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+    assert limiter.successes == limiter.failures == 0
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    breaker.record_success()
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert 0 < breaker.retry_after() <= 60
+
+
+def test_breaker_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure()  # a failed probe reopens the circuit
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.snapshot()["times_opened"] == 2
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_cancelled_probe_frees_the_slot():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.cancel_probe()
+    assert breaker.allow()
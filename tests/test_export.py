@@ -0,0 +1,60 @@
+import datetime
+import time
+
+import pytest
+
+from .. import export
+
+pa = pytest.importorskip("pyarrow")
+
+CRITERIA = {
+    "l1.skills": {"title": "Skills", "score": 4, "max_points": 5},
+    "l1.experience": {"title": "Experience", "score": 3, "max_points": 5},
+}
+
+
+def _at(seconds):
+    return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc)
+
+
+def test_latest_keeps_the_newest_version_of_each_row():
+    table = pa.table({
+        "requisition_id": ["req-1"] * 4,
+        "candidate_id": ["c1", "c1", "c1", "c2"],
+        "stage": ["resume"] * 4,
+        "criterion": ["l1.skills"] * 4,
+        "verdict": [None, "HIRE", "NO_HIRE", None],
+        "updated_at": pa.array([_at(1), _at(2), _at(2), _at(1)], pa.timestamp("us", tz="UTC")),
+        "exported_at": pa.array([_at(10), _at(11), _at(12), _at(10)], pa.timestamp("us", tz="UTC")),
+    })
+    result = export.latest(table)
+    assert sorted(zip(result["candidate_id"].to_pylist(), result["verdict"].to_pylist()),
+                  key=lambda row: row[0]) == [("c1", "NO_HIRE"), ("c2", None)]
+    assert export.latest(table.slice(0, 0)).num_rows == 0
+
+
+@pytest.mark.parametrize("fmt", sorted(export.FORMATS))
+def test_export_is_incremental_and_reads_back_deduplicated(result_store, tmp_path, fmt):
+    root = str(tmp_path / "dataset")
+    for candidate_id in ("c1", "c2"):
+        result_store.put_evaluation("req-1", candidate_id, "resume", criteria=CRITERIA, total=7, max_total=10)
+    assert export.export(root, fmt)["rows"] == 4
+    assert export.export(root, fmt)["rows"] == 0
+
+    time.sleep(0.01)
+    result_store.put_verdict("req-1", "c1", "HIRE", "High", 8)
+    assert export.export(root, fmt)["rows"] == 2  # the candidate's criterion rows, re-exported
+    assert export.export(root, fmt, full=True)["rows"] == 4
+
+    table = export.read_latest(root, fmt)
+    assert table.num_rows == 4
+    verdicts = {(row["candidate_id"], row["criterion"]): row["verdict"] for row in table.to_pylist()}
+    assert verdicts == {
+        ("c1", "l1.skills"): "HIRE", ("c1", "l1.experience"): "HIRE",
+        ("c2", "l1.skills"): None, ("c2", "l1.experience"): None,
+    }
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        export.write_rows([], str(tmp_path), "csv")
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+from .. import importbench
+
+
+def test_import_within_budget():
+    assert importbench.measure_import()["cumulative_ms"] < importbench.DEFAULT_BUDGET_MS
+
+
+def test_import_builds_no_agents():
+    # A fresh interpreter, since this one has already imported the package for the tests
+    code = (
+        "import importlib, sys\n"
+        f"importlib.import_module({importbench.PACKAGE!r})\n"
+        "print(any(name.startswith('google.adk') for name in sys.modules))\n"
+        f"tools_agents = importlib.import_module({importbench.PACKAGE!r} + '.tools_agents')\n"
+        "print(len(tools_agents._agents))\n"
+    )
+    parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    proc = subprocess.run([sys.executable, "-c", code], cwd=parent_dir, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    adk_imported, agents_built = proc.stdout.split()
+    assert adk_imported == "False"
+    assert agents_built == "0"
@@ -0,0 +1,69 @@
+import pytest
+
+from .. import jd_index
+from ..jd_index import JDIndex, signature, similarity
+
+JD = (
+    "Senior Backend Engineer. We are looking for an engineer to design and run the services behind our "
+    "payments platform. You will own APIs end to end, from design reviews to on-call, and mentor two "
+    "junior engineers. Requirements: 5+ years of Python, experience with PostgreSQL and Kubernetes, "
+    "and a track record of shipping reliable distributed systems. Nice to have: Kafka, Terraform."
+)
+RELOCATED = JD.replace("Senior Backend Engineer.", "Senior Backend Engineer (Berlin office).")
+OTHER_SKILL = JD.replace("PostgreSQL", "MongoDB")
+UNRELATED = (
+    "Product Designer. Shape the look and feel of our mobile apps, run user research sessions and "
+    "turn insights into prototypes in Figma. You have a portfolio of shipped consumer products."
+)
+
+
+@pytest.fixture
+def index(result_store, monkeypatch):
+    monkeypatch.setattr(jd_index, "_index", None)
+    return jd_index.get_index()
+
+
+def test_signature_is_deterministic_and_estimates_jaccard():
+    assert signature(JD) == signature(JD)
+    assert len(signature(JD)) == jd_index.NUM_PERM
+    assert similarity(signature(JD), signature(JD)) == 1.0
+    assert similarity(signature(JD), signature(RELOCATED)) > 0.8
+    assert similarity(signature(JD), signature(UNRELATED)) < 0.1
+
+
+def test_matches_finds_near_duplicates_most_similar_first():
+    index = JDIndex()
+    index.add("req-unrelated", 1, signature(UNRELATED), UNRELATED)
+    index.add("req-other", 1, signature(OTHER_SKILL), OTHER_SKILL)
+    index.add("req-jd", 1, signature(JD), JD)
+    found = index.matches(signature(RELOCATED))
+    assert [match[0] for match in found][:2] == ["req-jd", "req-other"]
+    assert "req-unrelated" not in [match[0] for match in found]
+    assert index.nearest(signature(RELOCATED), exclude_requisition="req-jd")[0] == "req-other"
+    assert JDIndex().nearest(signature(JD)) is None
+
+
+def test_matches_caps_the_entries_compared():
+    index = JDIndex()
+    for i in range(jd_index.BUCKET_SCAN * 2):
+        index.add(f"req-{i}", 1, signature(JD), JD)
+    found = index.matches(signature(JD))
+    assert len(found) == jd_index.MAX_CANDIDATES
+    # The newest first among equally similar entries
+    assert found[0][0] == f"req-{jd_index.BUCKET_SCAN * 2 - 1}"
+
+
+def test_find_reusable_skips_a_match_with_other_skills(index, result_store):
+    version = result_store.add_rubric("req-other", "# Rubric for MongoDB")
+    jd_index.index_jd("req-other", version, OTHER_SKILL)
+    assert jd_index.find_reusable(RELOCATED) is None
+
+    version = result_store.add_rubric("req-jd", "# Rubric")
+    jd_index.index_jd("req-jd", version, JD)
+    assert len(index) == 2
+    match = jd_index.find_reusable(RELOCATED)
+    assert match["requisition_id"] == "req-jd"
+    assert match["rubric"] == "# Rubric"
+    assert "berlin" in match["added_terms"]
+    assert jd_index.find_reusable(RELOCATED, exclude_requisition="req-jd") is None
+    assert jd_index.find_reusable(UNRELATED) is None
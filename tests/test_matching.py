@@ -0,0 +1,38 @@
+from ..matching import AhoCorasick, SkillExtractor
+
+
+def _find(patterns, text):
+    return sorted(AhoCorasick(patterns).find(text))
+
+
+def test_finds_overlapping_and_nested_patterns():
+    patterns = {"he": "he", "she": "she", "his": "his", "hers": "hers"}
+    # Only whole words count, so "he" inside "she" / "hers" is not reported
+    assert _find(patterns, "she said hers, not his; he agreed") == [
+        (0, 3, "she"), (9, 13, "hers"), (19, 22, "his"), (24, 26, "he"),
+    ]
+    assert _find({"machine learning": "ml", "learning": "learning"}, "Machine Learning") == [
+        (0, 16, "ml"), (8, 16, "learning"),
+    ]
+
+
+def test_matches_on_word_boundaries_case_insensitively():
+    patterns = {"java": "java", "javascript": "javascript", "go lang": "go"}
+    assert _find(patterns, "JavaScript, Java and Go Lang") == [
+        (0, 10, "javascript"), (12, 16, "java"), (21, 28, "go"),
+    ]
+    assert _find(patterns, "javas golang") == []
+
+
+def test_patterns_with_punctuation():
+    patterns = {"c++": "c++", ".net": ".net", "node.js": "node.js"}
+    assert [value for _, _, value in _find(patterns, "C++/.NET and Node.js")] == ["c++", ".net", "node.js"]
+    # The boundary is only checked where the pattern itself starts or ends with a word character
+    assert [value for _, _, value in _find(patterns, "ASP.NET")] == [".net"]
+
+
+def test_extractor_maps_aliases_to_canonical_skills():
+    extractor = SkillExtractor({"postgresql": ["postgresql", "postgres"], "go": ["golang"], "rust": []})
+    assert extractor.extract("Postgres, Golang and Rust; we go fast") == {"postgresql", "go", "rust"}
+    assert extractor.extract("") == set()
+    assert extractor.extract(None) == set()
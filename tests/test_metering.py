@@ -0,0 +1,34 @@
+import pytest
+
+from .. import metering
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(metering, "_states", {})
+
+
+def test_budget_levels_follow_recorded_usage(result_store):
+    metering.set_budget("req-1", soft_tokens=1000, hard_tokens=2000)
+    assert metering.level("req-1") == metering.OK
+    metering.record("req-1", "c1", "ResumeReviewer", 800, 300)
+    assert metering.level("req-1") == metering.SOFT
+    metering.record("req-1", "c1", "ResumeReviewer", 800, 300)
+    assert metering.level("req-1") == metering.HARD
+    with pytest.raises(metering.BudgetExceeded) as raised:
+        metering.check("req-1")
+    assert raised.value.usage["total_tokens"] == 2200
+
+    metering.set_budget("req-1", hard_tokens=5000)  # a raised budget applies to the next check
+    assert metering.level("req-1") == metering.OK
+    assert metering.level(None) == metering.level(metering.UNATTRIBUTED) == metering.OK
+
+
+def test_budgets_set_elsewhere_are_picked_up_on_refresh(result_store, monkeypatch):
+    metering.set_budget("req-2", hard_tokens=100)
+    metering.record("req-2", None, "RubricBuilder", 100, 0)
+    assert metering.level("req-2") == metering.HARD
+    result_store.set_budget("req-2", hard_tokens=1000)  # e.g. `set-budget` in another process
+    assert metering.level("req-2") == metering.HARD
+    monkeypatch.setenv("BUDGET_REFRESH_SECONDS", "0")
+    assert metering.level("req-2") == metering.OK
@@ -0,0 +1,70 @@
+from .. import prompts, workflow
+from ..prompts import assemble, split_sections
+
+TEXT = """You are the orchestrator.
+
+## TOOLS
+- For **ResumeReviewer**: pass the resume.
+- For **GitHubReviewer**: pass the profile.
+
+Always pass the rubric along with the input.
+
+## RULES
+1. **Be brief**: keep answers short.
+2. **Be proactive**: move on when you can.
+### STEP 1
+Collect the JD.
+### STEP 2
+Build the rubric.
+## FINAL NOTES
+"""
+
+
+def test_split_sections_round_trips():
+    blocks = split_sections(TEXT)
+    assert "".join(block for _, _, block in blocks) == TEXT
+    assert [(first_line, level) for first_line, level, _ in blocks] == [
+        ("You are the orchestrator.", 1),
+        ("## TOOLS", 2),
+        ("- For **ResumeReviewer**: pass the resume.", 4),
+        ("- For **GitHubReviewer**: pass the profile.", 4),
+        ("Always pass the rubric along with the input.", 4),
+        ("## RULES", 2),
+        ("1. **Be brief**: keep answers short.", 4),
+        ("2. **Be proactive**: move on when you can.", 4),
+        ("### STEP 1", 3),
+        ("### STEP 2", 3),
+        ("## FINAL NOTES", 2),
+    ]
+
+
+def test_assemble_keeps_the_paragraph_after_a_dropped_item():
+    text = assemble(split_sections(TEXT), lambda first_line: not first_line.startswith("- For **GitHubReviewer**"))
+    assert "GitHubReviewer" not in text
+    assert "Always pass the rubric along with the input." in text
+    assert "- For **ResumeReviewer**" in text
+
+
+def test_assemble_drops_nested_blocks_and_empty_headings():
+    text = assemble(split_sections(TEXT), lambda first_line: not first_line.startswith(("## RULES", "### STEP 2")))
+    # STEP 1 is nested under RULES; FINAL NOTES has no body and nothing nested to keep
+    assert "Collect the JD" not in text and "Build the rubric" not in text
+    assert "Be brief" not in text
+    assert "## FINAL NOTES" in text
+    assert assemble(split_sections(TEXT), lambda first_line: True) == TEXT
+    only_tools = assemble(split_sections("## TOOLS\n- For **X**: x\n"), lambda first_line: first_line == "## TOOLS")
+    assert only_tools == ""
+
+
+def test_orchestrator_phases_only_send_their_steps():
+    full = prompts.orchestrator_instruction_for(prompts.NEW_SESSION)
+    assert "### STEP 1" in full and "### STEP 7" not in full
+    verdict = prompts.orchestrator_instruction_for(workflow.PHASES[-1])
+    assert "### STEP 7" in verdict and "### STEP 1" not in verdict
+    assert "## STATE TRACKING" not in verdict
+    assert "## STATE TRACKING" in prompts.orchestrator_instruction_for(workflow.PHASES[-1], True)
+
+
+def test_github_reviewer_drops_fallback_criteria_with_a_rubric():
+    assert "## SCORING CRITERIA" in prompts.github_reviewer_instruction_for(False)
+    assert "## SCORING CRITERIA" not in prompts.github_reviewer_instruction_for(True)
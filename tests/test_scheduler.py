@@ -0,0 +1,85 @@
+import asyncio
+
+from ..scheduler import BATCH, INTERACTIVE, Scheduler
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _grant_order(scheduler: Scheduler, cls: str, teams: list) -> list:
+    """Queues one call per entry of `teams` behind a held slot, then frees slots one at a time."""
+    order = []
+
+    async def call(team):
+        await scheduler.acquire_async(cls, team)
+        order.append(team)
+
+    await scheduler.acquire_async(cls, teams[0])
+    tasks = [asyncio.create_task(call(team)) for team in teams]
+    await _settle()
+    assert order == []
+    for _ in teams:
+        scheduler.release(cls)
+        await _settle()
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_fair_queuing_interleaves_teams():
+    scheduler = Scheduler("test", total=1)
+    order = asyncio.run(_grant_order(scheduler, INTERACTIVE, ["a", "a", "a", "b", "b", "b"]))
+    assert order == ["b", "a", "b", "a", "b", "a"]
+
+
+def test_fair_queuing_follows_team_weights():
+    scheduler = Scheduler("test", total=1, weights={"a": 2})
+    order = asyncio.run(_grant_order(scheduler, INTERACTIVE, ["a"] * 6 + ["b"] * 3))
+    assert order[:6].count("a") == 4
+    assert sorted(order) == ["a"] * 6 + ["b"] * 3
+
+
+def test_batch_is_capped_and_interactive_goes_first():
+    async def run():
+        scheduler = Scheduler("test", total=2, batch_share=0.5)
+        order = []
+
+        async def call(cls):
+            await scheduler.acquire_async(cls)
+            order.append(cls)
+
+        await scheduler.acquire_async(BATCH)
+        batch = asyncio.create_task(call(BATCH))
+        await _settle()
+        assert order == []  # a free slot, but over the batch share
+        await scheduler.acquire_async(INTERACTIVE)
+        interactive = asyncio.create_task(call(INTERACTIVE))
+        await _settle()
+        scheduler.release(BATCH)
+        await _settle()
+        assert order == [INTERACTIVE]
+        scheduler.release(INTERACTIVE)
+        await _settle()
+        assert order == [INTERACTIVE, BATCH]
+        await asyncio.gather(batch, interactive)
+        snapshot = scheduler.snapshot()
+        assert snapshot["classes"][BATCH]["cap"] == 1
+        assert snapshot["classes"][INTERACTIVE]["granted"] == 2
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def run():
+        scheduler = Scheduler("test", total=1)
+        await scheduler.acquire_async()
+        waiter = asyncio.create_task(scheduler.acquire_async())
+        await _settle()
+        waiter.cancel()
+        await _settle()
+        scheduler.release(INTERACTIVE)
+        assert scheduler.snapshot()["classes"][INTERACTIVE]["in_flight"] == 0
+        assert scheduler.snapshot()["classes"][INTERACTIVE]["waiting"] == 0
+
+    asyncio.run(run())
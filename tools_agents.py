@@ -2,19 +2,41 @@
 Simplified sub-agents for conversational workflow (without template variables).
 """
 
-from google.adk.agents import LlmAgent
+import threading
+
+from . import (
+    backpressure, cassette, config, github_api, jd_index, metering, prefetch, profiling, prompts, recording,
+    repo_sampler, scheduler, self_consistency, shadow,
+)
+
+
+def model_callbacks(before=(), after=(), before_agent=(), admitted=()):
+    """
+    Model callbacks shared by every agent: a priority/fair-share scheduler in front of an adaptive
+    concurrency limit + circuit breaker around each Gemini call, with any agent-specific `before`
+    callbacks run first (they may rewrite the request), `admitted` ones once the call has its slot,
+    and `after` callbacks run last. The cassette
+    sees the final request and the raw response, and in replay answers before the call is scheduled. Requisitions over their
+    hard token budget are refused before anything else runs; token usage is metered last, once the
+    recording callbacks have assigned the candidate id. Each agent run is also a profiling step
+    (see profiling.py), opened before any agent-specific `before_agent` callbacks.
+    """
+    return dict(
+        before_agent_callback=[profiling.before_agent_callback, *before_agent],
+        after_agent_callback=[profiling.after_agent_callback],
+        before_model_callback=[
+            metering.before_model_callback, *before, cassette.before_model_callback, scheduler.before_model_callback,
+            *admitted,
+        ],
+        after_model_callback=[
+            cassette.after_model_callback, scheduler.after_model_callback, *after, metering.after_model_callback,
+        ],
+        on_model_error_callback=[cassette.on_model_error_callback, scheduler.on_model_error_callback],
+    )
 
-import os
-from dotenv import load_dotenv
-load_dotenv()
-GEMINI_MODEL = os.getenv("MODEL_NAME")
 
 # Rubric Builder - takes job description directly from conversation
-rubric_builder = LlmAgent(
-    name="RubricBuilder",
-    model=GEMINI_MODEL,
-    description="Generates customized evaluation rubric from job description.",
-    instruction="""
+RUBRIC_BUILDER_INSTRUCTION = """
 You are an expert HR assessment designer with deep experience in creating objective, measurable 
 evaluation criteria for technical roles.
 
@@ -98,15 +120,23 @@ evaluation rubric that will be used to assess candidates.
 - Include the specific required skills/technologies from the JD in the criteria descriptions
 
 Return ONLY the rubric, no preamble text.
-""",
-)
+"""
+
+
+def build_rubric_builder():
+    from google.adk.agents import LlmAgent
+
+    return LlmAgent(
+        name="RubricBuilder",
+        model=config.model_name(),
+        # Near-duplicate JDs reuse an existing rubric without a model call
+        **model_callbacks(after=[recording.record_rubric], before_agent=[jd_index.reuse_rubric_callback]),
+        description="Generates customized evaluation rubric from job description.",
+        instruction=RUBRIC_BUILDER_INSTRUCTION,
+    )
 
 # Resume Reviewer - takes resume and rubric from conversation
-resume_reviewer = LlmAgent(
-    name="ResumeReviewer",
-    model=GEMINI_MODEL,
-    description="Evaluates candidate resume against the rubric.",
-    instruction="""
+RESUME_REVIEWER_INSTRUCTION = """
 You are a senior technical recruiter with 10+ years of experience evaluating engineering candidates.
 
 ## YOUR TASK:
@@ -185,8 +215,56 @@ Be decisive - if score is ≥7/10 typically recommend YES, <7 recommend NO unles
 7. **Note ambiguities** - if dates are unclear or skills lack depth, mention this in gaps
 
 Return the complete evaluation following the format above.
-""",
-)
+"""
+
+
+def build_resume_reviewer():
+    from google.adk.agents import LlmAgent
+
+    return LlmAgent(
+        name="ResumeReviewer",
+        model=config.model_name(),
+        # Borderline scores are re-sampled and replaced by the median evaluation before it is recorded
+        **model_callbacks(
+            before=[self_consistency.before_model_callback],
+            admitted=[shadow.before_model_callback],
+            after=[
+                shadow.measure_model_callback, self_consistency.after_model_callback, recording.record_evaluation,
+                self_consistency.record_samples, shadow.after_model_callback,
+            ],
+        ),
+        description="Evaluates candidate resume against the rubric.",
+        instruction=RESUME_REVIEWER_INSTRUCTION,
+    )
+
+# Batch Resume Reviewer - scores several resumes against one shared rubric in a single call
+BATCH_RESUME_REVIEWER_INSTRUCTION = RESUME_REVIEWER_INSTRUCTION + """
+## BATCH MODE:
+
+The message contains the rubric once, followed by one or more resumes, each introduced by a line
+`=== RESUME candidate_id ===`. Evaluate every resume independently against the rubric - never
+compare candidates or let one resume influence another's scores.
+
+Return one complete evaluation per resume, in the order given, each wrapped exactly like this:
+
+<<<EVALUATION candidate_id>>>
+[the full evaluation in the output format above]
+<<<END candidate_id>>>
+
+Use each candidate_id exactly as given. Output nothing outside these blocks.
+"""
+
+
+def build_batch_resume_reviewer():
+    from google.adk.agents import LlmAgent
+
+    return LlmAgent(
+        name="BatchResumeReviewer",
+        model=config.model_name(),
+        **model_callbacks(),
+        description="Evaluates several resumes against a shared rubric in one response.",
+        instruction=BATCH_RESUME_REVIEWER_INSTRUCTION,
+    )
 
 # GitHub Validator - validates account exists using REST API
 def github_validator(username: str) -> dict:
@@ -199,28 +277,23 @@ def github_validator(username: str) -> dict:
     Returns:
         dict with validation results including status, user data, and recommendations
     """
-    import re
+    with profiling.step("github_validator"):
+        # Usually already fetched in the background when the resume was pasted
+        warmed = prefetch.take(username)
+        if warmed is not None:
+            return warmed
+        return validate_github_user(username)
+
+
+def validate_github_user(username: str) -> dict:
+    """The uncached github_validator lookup (one GitHub API call)."""
     import requests
     from datetime import datetime
-    print(username)
     # Extract username from various formats
-    username = username.strip()
-    
-    # Handle github.com/username URLs
-    if "github.com/" in username:
-        match = re.search(r'github\.com/([a-zA-Z0-9-]+)', username)
-        if match:
-            username = match.group(1)
-    
-    # Handle @username format
-    if username.startswith('@'):
-        username = username[1:]
-    
-    # Remove trailing slashes or query params
-    username = username.split('?')[0].rstrip('/')
+    username = github_api.normalize_username(username)
     
     # Validate username format
-    format_valid = bool(re.match(r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,37}[a-zA-Z0-9])?$', username))
+    format_valid = github_api.is_valid_username(username)
     
     if not format_valid:
         return {
@@ -234,18 +307,8 @@ def github_validator(username: str) -> dict:
     
     # Call GitHub REST API
     try:
-        api_url = f"https://api.github.com/users/{username}"
-        headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "GitHub-Profile-Validator"
-        }
-        
-        # Add token if available (for higher rate limits)
-        github_token = os.getenv("GITHUB_TOKEN")
-        if github_token:
-            headers["Authorization"] = f"token {github_token}"
-        
-        response = requests.get(api_url, headers=headers, timeout=10)
+        # Pooled, ETag-cached and back-pressured; GITHUB_API_URL can point at a local fake server
+        response = github_api.get(f"/users/{username}", timeout=10)
         
         if response.status_code == 200:
             user_data = response.json()
@@ -350,6 +413,17 @@ def github_validator(username: str) -> dict:
                 "assessment": f"Received unexpected response from GitHub API (status {response.status_code}). Manual verification recommended."
             }
     
+    except backpressure.BackendUnavailable as e:
+        return {
+            "status": "WARNING",
+            "username": username,
+            "format_valid": True,
+            "exists": None,
+            "error": f"GitHub API temporarily unavailable ({e.reason})",
+            "recommendation": "⚠️ Retry verification later - GitHub API is failing or overloaded",
+            "assessment": f"Skipped the GitHub API call because recent requests have been failing. Retry in about {max(1, round(e.retry_after))} seconds or verify manually."
+        }
+
     except requests.exceptions.Timeout:
         return {
             "status": "WARNING",
@@ -375,11 +449,7 @@ def github_validator(username: str) -> dict:
 
 # GitHub Validator Agent - validates using GitHub REST API
 # Note: This agent will use Gemini's built-in code execution to call the REST API
-github_validator_agent = LlmAgent(
-    name="GitHubValidatorAgent",
-    model=GEMINI_MODEL,
-    description="Validates GitHub account existence by calling GitHub REST API.",
-    instruction="""
+GITHUB_VALIDATOR_AGENT_INSTRUCTION = """
 You are a GitHub account validator that uses the GitHub REST API to verify accounts IN REAL-TIME.
 
 ## YOUR TASK:
@@ -486,15 +556,26 @@ Present the results in this format:
 3. Extract username carefully from conversation
 4. Present actual API results
 5. Make recommendations based on real data
-""",
-)
+"""
+
+
+def build_github_validator_agent():
+    from google.adk.agents import LlmAgent
+
+    return LlmAgent(
+        name="GitHubValidatorAgent",
+        model=config.model_name(),
+        **model_callbacks(),
+        description="Validates GitHub account existence by calling GitHub REST API.",
+        instruction=GITHUB_VALIDATOR_AGENT_INSTRUCTION,
+    )
+
+# Tells GitHubReviewer to fetch evidence itself; left out of tool-less (batch API) requests
+SAMPLE_REPOSITORIES_STEP = """If it does not, call the `sample_repositories` tool once with the GitHub
+username. """
 
 # GitHub Reviewer - analyzes GitHub profile
-github_reviewer = LlmAgent(
-    name="GitHubReviewer",
-    model=GEMINI_MODEL,
-    description="Analyzes candidate's GitHub profile.",
-    instruction="""
+GITHUB_REVIEWER_INSTRUCTION = """
 You are a senior software engineer and technical lead with extensive experience evaluating code quality 
 and developer portfolios.
 
@@ -504,7 +585,11 @@ requirements from the conversation history.
 
 ## EVALUATION APPROACH:
 
-Since you cannot actually access GitHub repositories, provide a **realistic simulated analysis** based on:
+**Repository evidence first.** If the input contains a "REPOSITORY EVIDENCE" section, it is a fact
+sheet sampled from the candidate's top original repositories (dependency manifests, Dockerfiles, CI
+configs, README heads). """ + SAMPLE_REPOSITORIES_STEP + """Base Technology Stack Alignment and Documentation & Testing on that evidence and cite it.
+
+For anything the evidence does not cover (or if sampling fails), provide a **realistic simulated analysis** based on:
 1. The candidate's experience level (from resume)
 2. The technologies they claim to know
 3. The validation report (repos count, account age estimates)
@@ -651,7 +736,7 @@ and actual repository review is recommended before final decision. Typically PAS
 
 ⚠️ **IMPORTANT DISCLAIMER:**
 
-This analysis is **simulated** based on:
+This analysis is based on sampled repository evidence where available and is otherwise **simulated** from:
 - Resume claims and experience level
 - Validation report (account existence, repo count)
 - Industry expectations for similar profiles
@@ -665,15 +750,26 @@ This analysis is **simulated** based on:
 ---
 
 Return the complete analysis following the format above.
-""",
-)
+"""
+
+
+def build_github_reviewer():
+    from google.adk.agents import LlmAgent
+
+    return LlmAgent(
+        name="GitHubReviewer",
+        model=config.model_name(),
+        **model_callbacks(
+            admitted=[shadow.before_model_callback],
+            after=[shadow.measure_model_callback, recording.record_evaluation, shadow.after_model_callback],
+        ),
+        description="Analyzes candidate's GitHub profile.",
+        instruction=prompts.github_reviewer_instruction,
+        tools=[repo_sampler.sample_repositories],
+    )
 
 # Verdict Synthesizer - combines all evaluations
-verdict_synthesizer = LlmAgent(
-    name="VerdictSynthesizer",
-    model=GEMINI_MODEL,
-    description="Provides final hiring verdict based on all evaluations.",
-    instruction="""
+VERDICT_SYNTHESIZER_INSTRUCTION = """
 You are a senior technical hiring manager with 15+ years of experience making high-stakes hiring 
 decisions. You combine analytical rigor with practical judgment.
 
@@ -872,5 +968,86 @@ Before presenting this decision to stakeholders:
 - [ ] Confidence level accurately reflects data quality
 
 Return the complete verdict following the format above. Be thorough, decisive, and practical.
-""",
-)
+"""
+
+
+def build_verdict_synthesizer():
+    from google.adk.agents import LlmAgent
+
+    return LlmAgent(
+        name="VerdictSynthesizer",
+        model=config.model_name(),
+        **model_callbacks(after=[recording.record_verdict]),
+        description="Provides final hiring verdict based on all evaluations.",
+        instruction=VERDICT_SYNTHESIZER_INSTRUCTION,
+    )
+
+
+# Criterion Rescorer - re-scores only the rubric criteria that changed after a JD/rubric update
+CRITERION_RESCORER_INSTRUCTION = """
+You are a senior technical recruiter re-scoring a candidate after the evaluation rubric was updated.
+
+## YOUR TASK:
+The message contains ONLY the rubric criteria that changed, followed by the candidate material
+(resume, or resume + GitHub validation data) that was originally evaluated. Score each listed
+criterion strictly against its updated scoring guide. Do not score any other criteria.
+
+## OUTPUT FORMAT:
+
+For every listed criterion, in the order given, using its number, exact name and maximum points:
+
+**N. Criterion Name: X/Y points**
+- Evidence: [specific citations from the candidate material]
+- Justification: [explain the score based on the updated scoring guide]
+
+## CRITICAL RULES:
+
+1. **Keep the heading format exactly** - it is parsed automatically
+2. **Only use the candidate material provided** - no assumptions
+3. **No preamble, totals or recommendations** - only the criterion blocks
+"""
+
+
+def build_criterion_rescorer():
+    from google.adk.agents import LlmAgent
+
+    return LlmAgent(
+        name="CriterionRescorer",
+        model=config.model_name(),
+        **model_callbacks(),
+        description="Re-scores selected rubric criteria for an already evaluated candidate.",
+        instruction=CRITERION_RESCORER_INSTRUCTION,
+    )
+
+# Agent registry - agents are built on first use so importing this package stays cheap, and agents
+# nobody asks for (e.g. the legacy GitHubValidatorAgent) are never constructed at all
+AGENT_FACTORIES = {
+    "rubric_builder": build_rubric_builder,
+    "resume_reviewer": build_resume_reviewer,
+    "batch_resume_reviewer": build_batch_resume_reviewer,
+    "github_reviewer": build_github_reviewer,
+    "verdict_synthesizer": build_verdict_synthesizer,
+    "criterion_rescorer": build_criterion_rescorer,
+    "github_validator_agent": build_github_validator_agent,
+}
+
+_agents = {}
+_agents_lock = threading.Lock()
+
+
+def get_agent(name: str):
+    """Returns the shared agent instance registered under `name`, building it on first use."""
+    with _agents_lock:
+        agent = _agents.get(name)
+        if agent is None:
+            if name not in AGENT_FACTORIES:
+                raise KeyError(f"Unknown agent '{name}'. Available: {', '.join(AGENT_FACTORIES)}")
+            agent = _agents[name] = AGENT_FACTORIES[name]()
+        return agent
+
+
+def __getattr__(name):
+    # Keeps `from .tools_agents import rubric_builder` working without eager construction
+    if name in AGENT_FACTORIES:
+        return get_agent(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
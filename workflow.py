@@ -0,0 +1,278 @@
+"""
+Deterministic workflow for the hiring conversation.
+
+The orchestrator's instruction describes a fixed state machine:
+    JD → RubricBuilder → resume → ResumeReviewer → github_validator → GitHubReviewer → summary → verdict
+This module holds that state machine in code: the phase recorded in session state, a cheap
+classifier for incoming messages, and `plan_step`, which decides whether a message triggers an
+obvious transition. workflow_agent.HiringWorkflowAgent executes the planned steps; anything
+`plan_step` can't place (questions, ambiguous input, JD changes) goes to the LLM orchestrator.
+"""
+
+import json
+import re
+
+from . import github_api, rubrics
+
+# Session state keys
+PHASE = "workflow_phase"
+JOB_DESCRIPTION = "job_description"
+RUBRIC = "rubric"
+RESUME = "resume"
+RESUME_EVALUATION = "resume_evaluation"
+GITHUB_USERNAME = "github_username"
+GITHUB_VALIDATION = "github_validation"
+GITHUB_EVALUATION = "github_evaluation"
+REPOSITORY_EVIDENCE = "repository_evidence"
+VERDICT = "verdict"
+
+# Per-candidate keys, cleared when the next resume arrives
+CANDIDATE_KEYS = (
+    RESUME, RESUME_EVALUATION, GITHUB_USERNAME, GITHUB_VALIDATION, REPOSITORY_EVIDENCE, GITHUB_EVALUATION, VERDICT,
+    "candidate_id",
+)
+
+# A stage score (normalised to /10) at or above this counts as a pass
+PASS_LINE = 7.0
+
+# Phases
+AWAITING_JD = "awaiting_jd"
+AWAITING_RESUME = "awaiting_resume"
+AWAITING_GITHUB = "awaiting_github"
+AWAITING_VERDICT = "awaiting_verdict_confirmation"
+PHASES = (AWAITING_JD, AWAITING_RESUME, AWAITING_GITHUB, AWAITING_VERDICT)
+
+OPENING_MESSAGE = """Hello! 👋 I'm your AI Technical Hiring Assistant.
+
+I orchestrate a team of specialized AI agents to help you evaluate candidates thoroughly and objectively:
+
+🔧 **My Specialists:**
+- **RubricBuilder** - Creates custom evaluation criteria
+- **ResumeReviewer** - Analyzes resumes with detailed scoring
+- **github_validator** - Verifies GitHub accounts (using REST API)
+- **GitHubReviewer** - Assesses code portfolios
+- **VerdictSynthesizer** - Provides final hiring recommendations
+
+**How this works:**
+1. You provide the job description → I automatically generate a rubric
+2. You provide candidate's resume → I automatically evaluate it
+3. If GitHub found → I automatically validate and analyze it
+4. You can request a final verdict when ready
+
+**It's fast and automatic** - just paste your documents and I'll handle the rest!
+
+📋 **Ready to start?** Please provide the job description for the position you're hiring for."""
+
+_JD_MARKERS = (
+    "job description", "responsibilities", "requirements", "qualifications", "we are looking",
+    "we're looking", "about the role", "what you'll do", "what you will do", "nice to have",
+    "must have", "you will", "the ideal candidate", "we offer", "benefits", "about us", "apply",
+)
+_RESUME_MARKERS = (
+    "education", "work experience", "professional experience", "employment", "certifications",
+    "projects", "linkedin", "curriculum vitae", "resume", "summary", "b.s.", "b.tech", "bachelor",
+    "master", "university", "present",
+)
+_DATE_RANGE_RE = re.compile(r"\b(19|20)\d{2}\s*[-–—to]+\s*((19|20)\d{2}|present|current|now)\b", re.I)
+_CONTACT_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+|\+?\d[\d\s().-]{8,}\d")
+_GREETING_RE = re.compile(r"^\s*(hi|hello|hey|start|get started|begin|good (morning|afternoon|evening))\b[\s!.,]*$", re.I)
+_YES_RE = re.compile(r"^\s*(y|yes|yeah|yep|sure|ok|okay|please|please do|go ahead|do it|generate( it| the verdict)?)\b[\s!.,]*(please)?[\s!.]*$", re.I)
+_NO_RE = re.compile(r"^\s*(n|no|nope|not now|not yet|later)\b[\s!.,]*(thanks|thank you)?[\s!.]*$", re.I)
+_SKIP_RE = re.compile(r"^\s*(skip|no github|none|n/?a|proceed without( github)?)\b[\s!.]*$", re.I)
+
+
+def classify_document(text: str):
+    """
+    Decides whether a pasted document is a job description or a resume.
+
+    Returns:
+        "jd", "resume", or None when the text is short or the signals are ambiguous
+    """
+    if len(text) < 200:
+        return None
+    lower = text.lower()
+    jd_score = sum(marker in lower for marker in _JD_MARKERS)
+    resume_score = sum(marker in lower for marker in _RESUME_MARKERS)
+    resume_score += min(3, len(_DATE_RANGE_RE.findall(text)))
+    resume_score += 2 if _CONTACT_RE.search(text[:500]) else 0
+    if jd_score >= resume_score + 2:
+        return "jd"
+    if resume_score >= jd_score + 2:
+        return "resume"
+    return None
+
+
+def _github_reply(text: str):
+    """A username from a short reply like "github.com/jdoe", "@jdoe" or "jdoe"."""
+    username = github_api.find_username(text)
+    if username:
+        return username
+    words = text.strip().split()
+    if len(words) == 1:
+        candidate = github_api.normalize_username(words[0])
+        if github_api.is_valid_username(candidate):
+            return candidate
+    return None
+
+
+def plan_step(phase: str, text: str, has_rubric: bool):
+    """
+    Picks the deterministic step for a user message, if there is an obvious one.
+
+    Returns:
+        (action, argument) - action is one of "greet", "build_rubric", "evaluate_resume", "github",
+        "skip_github", "verdict", "decline_verdict" - or None to hand the message to the orchestrator
+    """
+    text = text or ""
+    kind = classify_document(text)
+
+    if phase == AWAITING_JD and not has_rubric:
+        if kind == "jd":
+            return "build_rubric", text
+        if _GREETING_RE.match(text):
+            return "greet", None
+        return None
+
+    if kind == "resume" and has_rubric:
+        return "evaluate_resume", text
+    if kind is not None:
+        # e.g. an updated JD mid-evaluation - the orchestrator handles re-scoring
+        return None
+
+    if phase == AWAITING_GITHUB:
+        if _SKIP_RE.match(text) or _NO_RE.match(text):
+            return "skip_github", None
+        username = _github_reply(text) if len(text) < 200 else None
+        if username:
+            return "github", username
+    elif phase == AWAITING_VERDICT:
+        if _YES_RE.match(text):
+            return "verdict", None
+        if _NO_RE.match(text):
+            return "decline_verdict", None
+    return None
+
+
+def format_validation(result: dict) -> str:
+    """Short Markdown report of a github_validator result."""
+    if result.get("status") == "PASSED":
+        return (
+            f"✅ GitHub account validated! **{result['username']}** exists with "
+            f"{result.get('public_repos', 0)} public repositories "
+            f"(account age {result.get('account_age_years', 0)} years, "
+            f"profile {str(result.get('profile_completeness', 'unknown')).lower()}).\n\n"
+            f"{result.get('assessment', '')}"
+        )
+    lines = [f"**GitHub validation: {result.get('status')}** for `{result.get('username')}`"]
+    for key in ("error", "assessment", "recommendation"):
+        if result.get(key):
+            lines.append(f"- {result[key]}")
+    return "\n".join(lines)
+
+
+def _bullets(markdown: str, heading: str, limit: int = 3) -> list:
+    """First `limit` bullet points under a bold section label such as **KEY STRENGTHS:**."""
+    match = re.search(rf"\*\*{heading}[^*]*:?\*\*\s*\n((?:\s*[-*\d].*\n?)+)", markdown or "", re.I)
+    if not match:
+        return []
+    items = [re.sub(r"^\s*(?:[-*]|\d+\.)\s*", "", line).strip() for line in match.group(1).splitlines()]
+    return [item for item in items if item][:limit]
+
+
+def format_summary(resume_evaluation: str, github_evaluation: str = None) -> str:
+    """The Step 6 evaluation summary, built from the structured scores of both evaluations."""
+    resume = rubrics.parse_evaluation(resume_evaluation, "resume")
+    lines = ["Here's a summary of our evaluation so far:", ""]
+    lines.append(f"📊 **Resume Evaluation:** {resume['total']:g}/{resume['max_total']:g}")
+    strengths = _bullets(resume_evaluation, "KEY STRENGTHS")
+    concerns = _bullets(resume_evaluation, "CRITICAL GAPS")
+    if github_evaluation:
+        github = rubrics.parse_evaluation(github_evaluation, "github")
+        lines.append(f"📊 **GitHub Analysis:** {github['total']:g}/{github['max_total']:g}")
+        strengths += _bullets(github_evaluation, "KEY STRENGTHS", 1)
+        concerns += _bullets(github_evaluation, "AREAS FOR IMPROVEMENT", 1)
+    else:
+        lines.append("📊 **GitHub Analysis:** Not performed")
+    if strengths:
+        lines.append("✅ **Key Strengths:** " + "; ".join(strengths))
+    if concerns:
+        lines.append("⚠️ **Main Concerns:** " + "; ".join(concerns))
+    return "\n".join(lines)
+
+
+def rule_based_verdict(resume_evaluation: str, github_evaluation: str = None, reason: str = "") -> str:
+    """
+    A verdict computed from the evaluation scores alone, in VerdictSynthesizer's format, for when the
+    model call is not affordable. Follows the verdict instruction's combined assessment: HIRE when no
+    score is below 5 and both are at least 7 or one is at least 8; confidence is always Low.
+    """
+    resume = rubrics.parse_evaluation(resume_evaluation, "resume")
+    scores = [10 * resume["total"] / resume["max_total"] if resume["max_total"] else 0.0]
+    github = rubrics.parse_evaluation(github_evaluation, "github") if github_evaluation else None
+    if github and github["max_total"]:
+        scores.append(10 * github["total"] / github["max_total"])
+    composite = sum(scores) / len(scores)
+    hire = min(scores) >= 5 and (min(scores) >= 7 or max(scores) >= 8)
+    github_line = f"{scores[1]:.1f}/10" if len(scores) > 1 else "Not performed"
+    return "\n".join([
+        "# 🎯 FINAL HIRING VERDICT",
+        "",
+        f"**CANDIDATE:** {resume['candidate_name'] or 'Unknown'}",
+        "",
+        "## DECISION",
+        "",
+        "### 🟢 HIRE" if hire else "### 🔴 NO HIRE",
+        "",
+        "**CONFIDENCE LEVEL:** Low",
+        "",
+        f"**COMPOSITE SCORE:** {composite:.1f}/10",
+        "",
+        "## EVALUATION SUMMARY",
+        "",
+        f"**📊 Level 1 - Resume Screening:** {scores[0]:.1f}/10",
+        f"**📊 Level 2 - GitHub Analysis:** {github_line}",
+        "",
+        f"⚠️ **Rule-based verdict:** {reason or 'computed from the scores alone'} - no VerdictSynthesizer "
+        "review was run. Read the evaluations before acting on it.",
+    ])
+
+
+def reviewer_message(state: dict, stage: str) -> str:
+    """Structured input for ResumeReviewer ("resume"), GitHubReviewer ("github") or the verdict ("verdict")."""
+    sections = [("EVALUATION RUBRIC", state.get(RUBRIC)), ("CANDIDATE RESUME", state.get(RESUME))]
+    if stage in ("github", "verdict"):
+        sections.append(("GITHUB VALIDATION REPORT", state.get(GITHUB_VALIDATION)))
+    if stage == "github":
+        sections.append(("REPOSITORY EVIDENCE", state.get(REPOSITORY_EVIDENCE)))
+    if stage == "verdict":
+        sections = [("JOB DESCRIPTION", state.get(JOB_DESCRIPTION))] + sections + [
+            ("LEVEL 1 - RESUME EVALUATION", state.get(RESUME_EVALUATION)),
+            ("LEVEL 2 - GITHUB EVALUATION", state.get(GITHUB_EVALUATION) or "Not performed"),
+        ]
+    return "\n\n".join(f"## {title}\n\n{body}" for title, body in sections if body)
+
+
+# Orchestrator tool -> state updates, so steps the LLM runs itself are recorded too
+def track_tool_step(tool, args, tool_context, tool_response):
+    """after_tool_callback for the orchestrator: keeps the workflow phase in sync with its tool calls."""
+    state = tool_context.state
+    request = args.get("request", "") if isinstance(args, dict) else ""
+    response = tool_response if isinstance(tool_response, str) else None
+    if tool.name == "RubricBuilder" and response:
+        state[JOB_DESCRIPTION] = request
+        state[RUBRIC] = response
+        state[PHASE] = AWAITING_RESUME
+    elif tool.name == "ResumeReviewer" and response:
+        state[RESUME] = request
+        state[RESUME_EVALUATION] = response
+        state[PHASE] = AWAITING_GITHUB
+    elif tool.name == "github_validator" and isinstance(tool_response, dict):
+        state[GITHUB_USERNAME] = tool_response.get("username")
+        state[GITHUB_VALIDATION] = json.dumps(tool_response)
+    elif tool.name == "GitHubReviewer" and response:
+        state[GITHUB_EVALUATION] = response
+        state[PHASE] = AWAITING_VERDICT
+    elif tool.name == "VerdictSynthesizer" and response:
+        state[VERDICT] = response
+        state[PHASE] = AWAITING_RESUME
+    return None
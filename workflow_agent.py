@@ -0,0 +1,188 @@
+"""
+Root agent that runs the hiring workflow's obvious transitions in code.
+
+Each user message is matched against the recorded workflow phase (workflow.plan_step). Obvious
+steps - a pasted JD or resume, a GitHub handle, "skip", "yes" to the verdict - call the sub-agents
+directly with structured inputs and reply with deterministic text, so they cost no orchestrator
+model turns. Everything else is delegated to the LLM orchestrator, which sees the same history.
+"""
+
+import asyncio
+import json
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from . import github_api, metering, repo_sampler, workflow
+from .recording import store_validation, store_verdict
+from .runtime import run_agent_session_async
+from .tools_agents import github_validator
+
+# Ids the sub-agents' recording callbacks read from and write back to session state
+_SHARED_KEYS = ("requisition_id", "rubric_version", "candidate_id")
+
+# Steps that call a sub-agent model; refused while the requisition is over its hard budget
+_MODEL_STEPS = ("build_rubric", "evaluate_resume", "github", "verdict")
+
+NEXT_RESUME_PROMPT = (
+    "Paste the next candidate's resume whenever you're ready, or ask me anything about this evaluation."
+)
+
+
+class HiringWorkflowAgent(BaseAgent):
+    """Advances the JD → rubric → resume → GitHub → verdict workflow; its one sub-agent is the LLM orchestrator."""
+
+    async def _run_async_impl(self, ctx):
+        state = dict(ctx.session.state)
+        content = ctx.user_content
+        text = "".join(part.text for part in content.parts if part.text) if content and content.parts else ""
+
+        step = workflow.plan_step(state.get(workflow.PHASE, workflow.AWAITING_JD), text, bool(state.get(workflow.RUBRIC)))
+        if step is None:
+            async for event in self.sub_agents[0].run_async(ctx):
+                yield event
+            return
+
+        action, argument = step
+        if action in _MODEL_STEPS and metering.level(state.get("requisition_id")) == metering.HARD:
+            yield self._say(
+                ctx, state,
+                f"⚠️ This requisition has used up its token budget, so I can't run the {action.replace('_', ' ')} step. "
+                f"Raise its budget to continue ({metering.set_budget_command(state['requisition_id'])}).",
+            )
+            return
+        async for event in getattr(self, f"_{action}")(ctx, state, argument):
+            yield event
+
+    # Helpers
+
+    def _say(self, ctx, state: dict, text: str, **delta) -> Event:
+        """A model reply from this agent, carrying `delta` as a session state update."""
+        state.update(delta)
+        return Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part.from_text(text=text)]),
+            actions=EventActions(state_delta=delta),
+        )
+
+    async def _run(self, agent_name: str, message: str, state: dict):
+        """Runs a sub-agent; returns its text and the shared ids its callbacks changed."""
+        shared = {key: state[key] for key in _SHARED_KEYS if state.get(key) is not None}
+        text, final_state = await run_agent_session_async(agent_name, message, state=shared)
+        changed = {key: final_state[key] for key in _SHARED_KEYS if final_state.get(key) != state.get(key)}
+        return text, changed
+
+    # Steps
+
+    async def _greet(self, ctx, state, _):
+        yield self._say(ctx, state, workflow.OPENING_MESSAGE, **{workflow.PHASE: workflow.AWAITING_JD})
+
+    async def _build_rubric(self, ctx, state, job_description):
+        yield self._say(ctx, state, "Thank you! I've received the job description. Let me generate a customized evaluation rubric...")
+        rubric, ids = await self._run("rubric_builder", job_description, state)
+        yield self._say(
+            ctx, state,
+            f"Here's the evaluation rubric we'll use to assess candidates:\n\n{rubric}\n\n"
+            "Now please provide the candidate's resume. You can paste the full text here.",
+            **ids,
+            **{workflow.JOB_DESCRIPTION: job_description, workflow.RUBRIC: rubric, workflow.PHASE: workflow.AWAITING_RESUME},
+        )
+
+    async def _evaluate_resume(self, ctx, state, resume):
+        # A new resume starts a new candidate
+        reset = {**{key: None for key in workflow.CANDIDATE_KEYS}, workflow.RESUME: resume}
+        yield self._say(ctx, state, "Thank you! I've received the resume. Evaluating it now...", **reset)
+        evaluation, ids = await self._run("resume_reviewer", workflow.reviewer_message(state, "resume"), state)
+        yield self._say(
+            ctx, state, f"Here's the Level 1 Resume Evaluation:\n\n{evaluation}",
+            **ids, **{workflow.RESUME_EVALUATION: evaluation, workflow.PHASE: workflow.AWAITING_GITHUB},
+        )
+
+        username = github_api.find_username(resume)
+        if username:
+            async for event in self._github(ctx, state, username, "I found a GitHub profile: github.com/{}. Let me validate it..."):
+                yield event
+        else:
+            yield self._say(
+                ctx, state,
+                "I don't see a GitHub profile in the resume. If you have the candidate's GitHub username or URL, "
+                "please provide it, or type 'skip' to proceed to the final verdict.",
+            )
+
+    async def _github(self, ctx, state, username, announcement="Perfect! Let me validate github.com/{}..."):
+        yield self._say(ctx, state, announcement.format(username))
+        result = await asyncio.to_thread(github_validator, username)
+        store_validation(state, result)
+        validation = {
+            workflow.GITHUB_USERNAME: result.get("username", username),
+            workflow.GITHUB_VALIDATION: json.dumps(result),
+            "requisition_id": state["requisition_id"],
+        }
+        if result.get("status") != "PASSED":
+            yield self._say(
+                ctx, state,
+                workflow.format_validation(result) + "\n\nWould you like to provide a different GitHub account, "
+                "or skip GitHub analysis? (Provide new URL / skip)",
+                **validation,
+            )
+            return
+
+        if metering.level(state["requisition_id"]) != metering.OK:
+            yield self._say(
+                ctx, state,
+                workflow.format_validation(result) + "\n\n⚠️ This requisition is over its token budget, "
+                "so I'm skipping the GitHub review.",
+                **validation,
+            )
+            yield self._summary(ctx, state)
+            return
+
+        yield self._say(ctx, state, workflow.format_validation(result) + "\n\nNow analyzing the GitHub profile...", **validation)
+        evidence = await asyncio.to_thread(repo_sampler.sample_repositories, validation[workflow.GITHUB_USERNAME])
+        state[workflow.REPOSITORY_EVIDENCE] = evidence.get("fact_sheet")
+        evaluation, ids = await self._run("github_reviewer", workflow.reviewer_message(state, "github"), state)
+        yield self._say(
+            ctx, state, f"Here's the GitHub evaluation:\n\n{evaluation}",
+            **ids, **{workflow.GITHUB_EVALUATION: evaluation, workflow.REPOSITORY_EVIDENCE: state[workflow.REPOSITORY_EVIDENCE]},
+        )
+        yield self._summary(ctx, state)
+
+    async def _skip_github(self, ctx, state, _):
+        yield self._say(ctx, state, "Understood. We'll proceed without GitHub analysis.")
+        yield self._summary(ctx, state)
+
+    def _summary(self, ctx, state) -> Event:
+        summary = workflow.format_summary(state.get(workflow.RESUME_EVALUATION), state.get(workflow.GITHUB_EVALUATION))
+        return self._say(
+            ctx, state,
+            summary + "\n\nWould you like me to generate a final hiring verdict with a HIRE/NO HIRE recommendation? (Yes/No)",
+            **{workflow.PHASE: workflow.AWAITING_VERDICT},
+        )
+
+    async def _verdict(self, ctx, state, _):
+        if metering.level(state.get("requisition_id")) == metering.SOFT:
+            verdict = workflow.rule_based_verdict(
+                state.get(workflow.RESUME_EVALUATION), state.get(workflow.GITHUB_EVALUATION),
+                "this requisition is over its soft token budget",
+            )
+            store_verdict(state, verdict)
+            yield self._say(
+                ctx, state, f"Here's the final hiring decision:\n\n{verdict}\n\nThis concludes the evaluation. {NEXT_RESUME_PROMPT}",
+                **{workflow.VERDICT: verdict, workflow.PHASE: workflow.AWAITING_RESUME},
+            )
+            return
+        yield self._say(
+            ctx, state,
+            "Understood. I'm calling my VerdictSynthesizer specialist to review all data and provide a final hiring decision...",
+        )
+        verdict, ids = await self._run("verdict_synthesizer", workflow.reviewer_message(state, "verdict"), state)
+        yield self._say(
+            ctx, state, f"Here's the final hiring decision:\n\n{verdict}\n\nThis concludes the evaluation. {NEXT_RESUME_PROMPT}",
+            **ids, **{workflow.VERDICT: verdict, workflow.PHASE: workflow.AWAITING_RESUME},
+        )
+
+    async def _decline_verdict(self, ctx, state, _):
+        yield self._say(ctx, state, f"No problem. {NEXT_RESUME_PROMPT}", **{workflow.PHASE: workflow.AWAITING_RESUME})